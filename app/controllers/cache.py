@@ -0,0 +1,123 @@
+"""In-process caches of the controllers."""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, NamedTuple, TypeVar
+
+from pydantic import BaseModel
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheStats(BaseModel):
+    """Statistics of a cache."""
+
+    size: int
+    """Number of entries currently cached."""
+
+    weight: int
+    """Total weight of the entries currently cached."""
+
+    hits: int
+    """Total number of lookups served from the cache."""
+
+    misses: int
+    """Total number of lookups not found or expired in the cache."""
+
+    evictions: int
+    """Total number of entries evicted to make room for new ones."""
+
+
+class _Entry(NamedTuple, Generic[V]):
+    """A cached value, the time it expires at and its weight."""
+
+    value: V
+    expires_at: float
+    weight: int
+
+
+class LRUCache(Generic[K, V]):
+    """A size-bounded cache evicting the least recently used entries.
+
+    The size is the number of entries, or the sum of their weights when a
+    ``weigher`` is given; a value heavier than ``max_size`` is not cached.
+    Entries expire after ``ttl`` seconds, which can be overridden per
+    entry. A cache with a ``max_size`` of 0 stores nothing. The cache is
+    not thread-safe, it is meant to be used from the event loop.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float | None = None,
+        weigher: Callable[[V], int] | None = None,
+    ) -> None:
+        """Initialize an empty cache."""
+        self._max_size = max_size
+        self._ttl = ttl
+        self._weigher = weigher
+        self._entries: OrderedDict[K, _Entry[V]] = OrderedDict()
+        self._weight = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        """Return the number of entries, including the expired ones."""
+        return len(self._entries)
+
+    def __getitem__(self, key: K) -> V:
+        """Look up a value and mark it as the most recently used.
+
+        :raises KeyError: If the key is not cached or has expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self.discard(key)
+            self._misses += 1
+            raise KeyError(key)
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry.value
+
+    def put(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Cache a value, evicting the least recently used ones if full."""
+        weight = 1 if self._weigher is None else self._weigher(value)
+        if weight > self._max_size:
+            return
+        ttl = self._ttl if ttl is None else ttl
+        expires_at = (
+            time.monotonic() + ttl if ttl is not None else float("inf")
+        )
+        self.discard(key)
+        self._entries[key] = _Entry(value, expires_at, weight)
+        self._weight += weight
+        while self._weight > self._max_size:
+            _, evicted = self._entries.popitem(last=False)
+            self._weight -= evicted.weight
+            self._evictions += 1
+
+    def discard(self, key: K) -> None:
+        """Remove a key from the cache if it is cached."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._weight -= entry.weight
+
+    def clear(self) -> None:
+        """Remove all the entries."""
+        self._entries.clear()
+        self._weight = 0
+
+    def stats(self) -> CacheStats:
+        """Return a snapshot of the cache statistics."""
+        return CacheStats(
+            size=len(self._entries),
+            weight=self._weight,
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+        )
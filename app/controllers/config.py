@@ -0,0 +1,26 @@
+"""Configuration for the controllers."""
+
+from pydantic import BaseModel
+
+
+class CacheConfig(BaseModel):
+    """Configuration for the in-process caches.
+
+    The caches are local to every process and see the writes made through
+    it, the TTLs bound how long the writes of other processes go unseen.
+    """
+
+    task_cache_size: int = 1024
+    """Maximum number of tasks cached by ID, 0 disables the cache."""
+
+    task_cache_ttl: float | None = 30.0
+    """Seconds a task stays cached, None keeps it until it is evicted."""
+
+    task_cache_negative_ttl: float = 1.0
+    """Seconds an ID which was not found stays cached as missing."""
+
+    query_cache_size: int = 10000
+    """Maximum number of tasks in the cached pages, 0 disables the cache."""
+
+    query_cache_ttl: float | None = 30.0
+    """Seconds a page stays cached, None keeps it until it is evicted."""
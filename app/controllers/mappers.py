@@ -1,5 +1,7 @@
 """Mapper functions for task-related data."""
 
+from collections.abc import Sequence
+
 from app.persistence.schemas import (
     CreateTaskRequest as PersistenceCreateTaskRequest,
 )
@@ -41,9 +43,20 @@ class PersistenceToTaskMapper:
     """Mapper functions for converting persistence models to API models."""
 
     @staticmethod
-    def convert(persistence_task: PersistenceTask) -> Task:
-        """Convert a PersistenceTask to a Task."""
-        return Task(
+    def convert(
+        persistence_task: PersistenceTask,
+        fields: Sequence[str] | None = None,
+    ) -> Task:
+        """Convert a PersistenceTask to a Task.
+
+        The persistence task is already valid, so it is not validated
+        again. With ``fields`` the task only holds these fields.
+        """
+        if fields is not None:
+            return Task.model_construct(
+                **{field: getattr(persistence_task, field) for field in fields}
+            )
+        return Task.model_construct(
             id=persistence_task.id,
             title=persistence_task.title,
             priority=persistence_task.priority,
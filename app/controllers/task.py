@@ -1,91 +1,458 @@
 """Task controller module."""
 
+from collections.abc import AsyncIterator, Sequence
+from datetime import UTC, datetime
+from typing import Any, NamedTuple
+
+from app.controllers.cache import LRUCache
+from app.controllers.config import CacheConfig
 from app.controllers.exception import NotFoundError
 from app.controllers.mappers import (
     CreateRequestToPersistenceMapper,
     PersistenceToTaskMapper,
     UpdateRequestToPersistenceMapper,
 )
+from app.persistence.async_task_repository import AsyncTaskRepository
 from app.persistence.schemas import (
     QueryParams,
+    SortKey,
 )
-from app.persistence.task_repository import TaskRepository
+from app.persistence.schemas import Task as PersistenceTask
 from app.schemas import (
     CreateTaskRequest,
+    Priority,
+    PriorityCounts,
     Task,
+    TaskFilterParams,
     TaskQueryParams,
+    TaskStats,
     UpdateTaskRequest,
 )
 
 
+TaskPage = tuple[list[Task], int]
+"""The tasks of a page and the total number of tasks."""
+
+
+TaskColumns = dict[str, list[Any]]
+"""The fields of tasks column by column, in their compact encodings."""
+
+
+class JsonTaskPage(NamedTuple):
+    """The tasks of a page as a JSON array, their number and the total."""
+
+    tasks: str
+    size: int
+    total: int
+
+
+class VersionedTask(NamedTuple):
+    """A task and the version of its row."""
+
+    task: Task
+    version: int
+
+
 class TaskController:
-    """Controller for managing tasks."""
+    """Controller for managing tasks.
+
+    The tasks read by ID are kept in an LRU cache, which is refreshed by
+    the writes to a single task and invalidated by the bulk writes. IDs
+    which were not found are cached as missing for a shorter time.
+
+    The pages of tasks are cached by their query parameters and the write
+    generation, which every write increments, so a write makes all the
+    cached pages unreachable at once and they are evicted as they age. The
+    pages assembled as JSON by the database have a cache of their own, and
+    the data version is cached by write generation as well, for as long as
+    the pages.
+    """
+
+    def __init__(
+        self,
+        task_repository: AsyncTaskRepository,
+        cache_config: CacheConfig | None = None,
+    ) -> None:
+        """Initialize the TaskController with a task repository.
 
-    def __init__(self, task_repository: TaskRepository) -> None:
-        """Initialize the TaskController with a task repository."""
+        Without a cache config nothing is cached.
+        """
         self.task_repository = task_repository
+        self.cache_config = cache_config or CacheConfig(
+            task_cache_size=0, query_cache_size=0
+        )
+        self.task_cache: LRUCache[int, VersionedTask | None] = LRUCache(
+            self.cache_config.task_cache_size,
+            ttl=self.cache_config.task_cache_ttl,
+        )
+        self.query_cache: LRUCache[tuple[int, str], TaskPage] = LRUCache(
+            self.cache_config.query_cache_size,
+            ttl=self.cache_config.query_cache_ttl,
+            weigher=lambda page: len(page[0]) + 1,
+        )
+        self.json_page_cache: LRUCache[tuple[int, str], JsonTaskPage] = (
+            LRUCache(
+                self.cache_config.query_cache_size,
+                ttl=self.cache_config.query_cache_ttl,
+                weigher=lambda page: page.size + 1,
+            )
+        )
+        self.data_version_cache: LRUCache[int, str] = LRUCache(
+            min(self.cache_config.query_cache_size, 1),
+            ttl=self.cache_config.query_cache_ttl,
+        )
+        self._generation = 0
+
+    def _written(self) -> None:
+        """Record a write, so the reads started before it are not cached."""
+        self._generation += 1
+
+    def _cache_task(self, id: int, task: VersionedTask | None) -> None:
+        """Cache a task by ID, or that no task has the ID."""
+        if task is None:
+            self.task_cache.put(
+                id, None, ttl=self.cache_config.task_cache_negative_ttl
+            )
+        else:
+            self.task_cache.put(id, task)
+
+    @staticmethod
+    def _versioned(
+        saved_task: PersistenceTask | None,
+        fields: Sequence[str] | None = None,
+    ) -> VersionedTask | None:
+        """Convert a persisted task along with its version."""
+        if saved_task is None:
+            return None
+        return VersionedTask(
+            PersistenceToTaskMapper.convert(saved_task, fields),
+            saved_task.version,
+        )
+
+    @staticmethod
+    def _to_query_params(task_filter_params: TaskFilterParams) -> QueryParams:
+        """Convert the filters of a request to persistence query params."""
+        return QueryParams(
+            priority=task_filter_params.priority,
+            completed=task_filter_params.completed,
+            title=task_filter_params.title,
+            description=task_filter_params.description,
+            due_after=task_filter_params.due_after,
+            due_before=task_filter_params.due_before,
+        )
 
-    def create(self, create_task_request: CreateTaskRequest) -> Task:
+    async def create(self, create_task_request: CreateTaskRequest) -> Task:
         """Create a new task."""
-        saved_task = self.task_repository.add(
+        saved_task = await self.task_repository.add(
             CreateRequestToPersistenceMapper.convert(create_task_request)
         )
-        return PersistenceToTaskMapper.convert(saved_task)
+        task = PersistenceToTaskMapper.convert(saved_task)
+        self._written()
+        self._cache_task(task.id, VersionedTask(task, saved_task.version))
+        return task
 
-    def get(
+    async def create_many(
+        self, create_task_requests: list[CreateTaskRequest]
+    ) -> list[int]:
+        """Create several tasks at once.
+
+        :returns: The IDs of the tasks, in the order they were given.
+        """
+        ids = await self.task_repository.add_many(
+            [
+                CreateRequestToPersistenceMapper.convert(create_task_request)
+                for create_task_request in create_task_requests
+            ]
+        )
+        self._written()
+        for id in ids:
+            self.task_cache.discard(id)
+        return ids
+
+    async def get(self, task_query_params: TaskQueryParams) -> TaskPage:
+        """Retrieve tasks based on query parameters, cached between writes.
+
+        :returns: The tasks of the page and the total number of tasks.
+        """
+        key = self._page_key(task_query_params)
+        try:
+            return self.query_cache[key]
+        except KeyError:
+            pass
+        fields = task_query_params.field_names()
+        saved_tasks, total_tasks = await self.task_repository.query_page(
+            **self._page_query(task_query_params)
+        )
+        page = (
+            [
+                PersistenceToTaskMapper.convert(task, fields)
+                for task in saved_tasks
+            ],
+            total_tasks,
+        )
+        self.query_cache.put(key, page)
+        return page
+
+    async def get_json(
         self, task_query_params: TaskQueryParams
-    ) -> tuple[list[Task], int]:
-        """Retrieve tasks based on query parameters."""
-        saved_tasks = self.task_repository.query(
-            query_params=QueryParams(
-                priority=task_query_params.priority,
-                completed=task_query_params.completed,
-                title=task_query_params.title,
-                description=task_query_params.description,
-            ),
-            limit=task_query_params.page_size,
-            offset=task_query_params.page_size
+    ) -> JsonTaskPage:
+        """Retrieve a page of tasks as JSON, cached between writes.
+
+        The JSON array of the tasks is assembled by the database, in the
+        same format as the serialised tasks.
+        """
+        key = self._page_key(task_query_params)
+        try:
+            return self.json_page_cache[key]
+        except KeyError:
+            pass
+        query = self._page_query(task_query_params)
+        tasks, total = await self.task_repository.query_page_json(**query)
+        page = JsonTaskPage(
+            tasks,
+            max(min(total - query["offset"], query["limit"]), 0),
+            total,
+        )
+        self.json_page_cache.put(key, page)
+        return page
+
+    def _page_key(self, task_query_params: TaskQueryParams) -> tuple[int, str]:
+        """Build the cache key of a page of tasks."""
+        # The generation the read starts at is part of the key, so a page
+        # read while a write happens is never served.
+        return (
+            self._generation,
+            task_query_params.model_dump_json(exclude={"cursor"}),
+        )
+
+    @classmethod
+    def _page_query(cls, task_query_params: TaskQueryParams) -> dict[str, Any]:
+        """Build the arguments of the query of a page of tasks."""
+        return {
+            "query_params": cls._to_query_params(task_query_params),
+            "limit": task_query_params.page_size,
+            "offset": task_query_params.page_size
             * (task_query_params.page_number - 1),
+            "order_by_relevance": task_query_params.order_by_relevance,
+            "sort": [
+                SortKey(field=field, descending=descending)
+                for field, descending in task_query_params.sort_keys()
+            ],
+            "fields": task_query_params.field_names(),
+        }
+
+    async def get_after(
+        self, task_query_params: TaskQueryParams, after_id: int | None
+    ) -> tuple[list[Task], bool]:
+        """Retrieve the page of tasks following a task ID.
+
+        :returns: The tasks and whether more tasks follow them.
+        """
+        fields = task_query_params.field_names()
+        saved_tasks = await self.task_repository.query_after(
+            query_params=self._to_query_params(task_query_params),
+            limit=task_query_params.page_size + 1,
+            after_id=after_id,
+            fields=fields,
         )
-        total_tasks = len(
-            self.task_repository.query(
-                query_params=QueryParams(
-                    priority=task_query_params.priority,
-                    completed=task_query_params.completed,
-                    title=task_query_params.title,
-                    description=task_query_params.description,
-                )
+        has_more = len(saved_tasks) > task_query_params.page_size
+        return [
+            PersistenceToTaskMapper.convert(task, fields)
+            for task in saved_tasks[: task_query_params.page_size]
+        ], has_more
+
+    async def get_columns(
+        self, task_query_params: TaskQueryParams
+    ) -> tuple[TaskColumns, int]:
+        """Retrieve a page of tasks column by column, not cached.
+
+        :returns: The columns of the page and the total number of tasks.
+        """
+        return await self.task_repository.query_page_columns(
+            **self._page_query(task_query_params)
+        )
+
+    async def get_columns_after(
+        self, task_query_params: TaskQueryParams, after_id: int | None
+    ) -> tuple[TaskColumns, bool]:
+        """Retrieve the page of tasks following a task ID column by column.
+
+        :returns: The columns and whether more tasks follow them.
+        """
+        columns = await self.task_repository.query_after_columns(
+            query_params=self._to_query_params(task_query_params),
+            limit=task_query_params.page_size + 1,
+            after_id=after_id,
+            fields=task_query_params.field_names(),
+        )
+        has_more = len(columns["id"]) > task_query_params.page_size
+        return {
+            field: column[: task_query_params.page_size]
+            for field, column in columns.items()
+        }, has_more
+
+    async def export(
+        self, task_filter_params: TaskFilterParams, batch_size: int
+    ) -> AsyncIterator[list[Task]]:
+        """Stream all the tasks matching the filters in batches."""
+        async for saved_tasks in self.task_repository.iterate(
+            self._to_query_params(task_filter_params), batch_size
+        ):
+            yield [
+                PersistenceToTaskMapper.convert(task) for task in saved_tasks
+            ]
+
+    async def stats(self) -> TaskStats:
+        """Count the tasks overall and per priority.
+
+        Every priority is listed, with zero counts when it has no task.
+        """
+        groups = await self.task_repository.stats(datetime.now(UTC))
+        priorities = [
+            PriorityCounts(
+                priority=priority,
+                total=sum(
+                    group.count
+                    for group in groups
+                    if group.priority == priority
+                ),
+                completed=sum(
+                    group.count
+                    for group in groups
+                    if group.priority == priority and group.completed
+                ),
+                overdue=sum(
+                    group.overdue
+                    for group in groups
+                    if group.priority == priority
+                ),
             )
+            for priority in Priority
+        ]
+        return TaskStats(
+            total=sum(counts.total for counts in priorities),
+            completed=sum(counts.completed for counts in priorities),
+            overdue=sum(counts.overdue for counts in priorities),
+            priorities=priorities,
         )
-        return [
-            PersistenceToTaskMapper.convert(task) for task in saved_tasks
-        ], total_tasks
 
-    def get_by_id(self, id: int) -> Task:
-        """Retrieve a task by its ID."""
-        saved_task = self.task_repository.query(QueryParams(id=id))
-        if not saved_task:
-            raise NotFoundError(id)
-        return PersistenceToTaskMapper.convert(saved_task[0])
+    async def get_by_id(self, id: int) -> Task:
+        """Retrieve a task by its ID, from the cache when possible."""
+        return (await self.get_versioned_by_id(id)).task
 
-    def update(self, id: int, update_task_request: UpdateTaskRequest) -> Task:
-        """Update an existing task."""
-        saved_task = self.task_repository.query(QueryParams(id=id))
-        if not saved_task:
+    async def get_versioned_by_id(
+        self, id: int, fields: Sequence[str] | None = None
+    ) -> VersionedTask:
+        """Retrieve a task and its version by ID, cached when possible.
+
+        With ``fields`` a task which is not cached is read partially, only
+        with these fields, and the partial task is not cached.
+        """
+        try:
+            task = self.task_cache[id]
+        except KeyError:
+            generation = self._generation
+            saved_tasks = await self.task_repository.query(
+                QueryParams(id=id),
+                fields=None if fields is None else (*fields, "version"),
+            )
+            task = self._versioned(
+                saved_tasks[0] if saved_tasks else None, fields
+            )
+            if (fields is None or task is None) and (
+                generation == self._generation
+            ):
+                self._cache_task(id, task)
+        if task is None:
             raise NotFoundError(id)
+        return task
+
+    async def get_version(self, id: int) -> int | None:
+        """Return the version of a task without reading the task.
+
+        :returns: The version, or None when the task does not exist.
+        """
+        try:
+            task = self.task_cache[id]
+        except KeyError:
+            return await self.task_repository.task_version(id)
+        return task.version if task is not None else None
+
+    async def get_data_version(self) -> str:
+        """Return a token which changes with every write to the tasks.
 
+        The token is cached until the next write through this controller,
+        writes of other processes are seen once it expires.
+        """
+        generation = self._generation
+        try:
+            return self.data_version_cache[generation]
+        except KeyError:
+            pass
+        data_version = await self.task_repository.data_version()
+        if generation == self._generation:
+            self.data_version_cache.put(generation, data_version)
+        return data_version
+
+    async def update(
+        self, id: int, update_task_request: UpdateTaskRequest
+    ) -> Task:
+        """Update an existing task."""
         persistence_request = UpdateRequestToPersistenceMapper.convert(
             update_task_request
         )
-        self.task_repository.update(
+        updated_task = await self.task_repository.update(
             id=id, update_task_request=persistence_request
         )
-        updated_task = self.task_repository.query(QueryParams(id=id))[0]
-        return PersistenceToTaskMapper.convert(updated_task)
+        self._written()
+        task = self._versioned(updated_task)
+        self._cache_task(id, task)
+        if task is None:
+            raise NotFoundError(id)
+        return task.task
 
-    def delete(self, id: int) -> None:
+    async def delete(self, id: int) -> None:
         """Delete a task by its ID."""
-        saved_task = self.task_repository.query(QueryParams(id=id))
-        if not saved_task:
+        deleted_task = await self.task_repository.delete(id=id)
+        self._written()
+        self._cache_task(id, None)
+        if deleted_task is None:
             raise NotFoundError(id)
-        self.task_repository.delete(id=id)
+
+    async def update_where(
+        self,
+        task_filter_params: TaskFilterParams,
+        update_task_request: UpdateTaskRequest,
+        dry_run: bool = False,
+    ) -> int:
+        """Update all the tasks matching the filters.
+
+        :returns: The number of tasks updated, or that would be updated
+            with ``dry_run``.
+        """
+        query_params = self._to_query_params(task_filter_params)
+        if dry_run:
+            return await self.task_repository.count(query_params)
+        count = await self.task_repository.update_where(
+            query_params,
+            UpdateRequestToPersistenceMapper.convert(update_task_request),
+        )
+        self._written()
+        self.task_cache.clear()
+        return count
+
+    async def delete_where(
+        self, task_filter_params: TaskFilterParams, dry_run: bool = False
+    ) -> int:
+        """Delete all the tasks matching the filters.
+
+        :returns: The number of tasks deleted, or that would be deleted
+            with ``dry_run``.
+        """
+        query_params = self._to_query_params(task_filter_params)
+        if dry_run:
+            return await self.task_repository.count(query_params)
+        count = await self.task_repository.delete_where(query_params)
+        self._written()
+        self.task_cache.clear()
+        return count
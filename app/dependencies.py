@@ -1,8 +1,11 @@
 """Dependency injection for urls."""
 
+from fastapi import Request
+
 from app.controllers.task import TaskController
 from app.persistence.task_repository import TaskRepository
-from app.web.config import WebConfig
+from app.web.config import CompressionConfig, TasksConfig, WebConfig
+from app.web.resources.cursor import CursorCodec
 
 
 def get_web_config() -> WebConfig:
@@ -10,12 +13,26 @@ def get_web_config() -> WebConfig:
     return WebConfig.load()
 
 
-def get_task_repository() -> TaskRepository:
-    """Dependency to get the task repository."""
-    web_config = get_web_config()
-    return TaskRepository(db_name=web_config.database.db_name)
+def get_task_repository(request: Request) -> TaskRepository:
+    """Dependency to get the task repository shared by the application."""
+    return request.app.state.task_repository
+
+
+def get_task_controller(request: Request) -> TaskController:
+    """Dependency to get the task controller shared by the application."""
+    return request.app.state.task_controller
+
+
+def get_cursor_codec(request: Request) -> CursorCodec:
+    """Dependency to get the pagination cursor codec."""
+    return request.app.state.cursor_codec
+
+
+def get_tasks_config(request: Request) -> TasksConfig:
+    """Dependency to get the configuration of the tasks API."""
+    return request.app.state.config.tasks
 
 
-def get_task_controller() -> TaskController:
-    """Dependency to get the task controller."""
-    return TaskController(get_task_repository())
+def get_compression_config(request: Request) -> CompressionConfig:
+    """Dependency to get the configuration of the response compression."""
+    return request.app.state.config.compression
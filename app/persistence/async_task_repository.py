@@ -0,0 +1,248 @@
+"""Asynchronous task repository."""
+
+import asyncio
+from collections.abc import AsyncGenerator, Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Any, ParamSpec, TypeVar
+
+from app.persistence.schemas import (
+    CreateTaskRequest,
+    QueryParams,
+    SortKey,
+    Task,
+    TaskGroupStats,
+    UpdateTaskRequest,
+)
+from app.persistence.task_repository import TaskRepository
+
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+class AsyncTaskRepository:
+    """Awaitable facade over the TaskRepository.
+
+    The reads run on a dedicated, bounded thread pool so the event loop is
+    never blocked by SQLite. ``DatabaseConfig`` guarantees that the
+    connection pool holds a connection for every executor thread. The
+    writes are awaited on the futures of the single database writer and
+    occupy no executor thread.
+    """
+
+    def __init__(
+        self, task_repository: TaskRepository, max_workers: int
+    ) -> None:
+        """Initialize with the repository and the number of threads."""
+        self._task_repository = task_repository
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="db"
+        )
+
+    async def _run(
+        self, func: Callable[P, R], *args: P.args, **kwargs: P.kwargs
+    ) -> R:
+        """Run a repository call on the database executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+    async def add(self, data_model: CreateTaskRequest) -> Task:
+        """Add a new task to the database."""
+        return await asyncio.wrap_future(
+            self._task_repository.submit_add(data_model)
+        )
+
+    async def add_many(
+        self, data_models: list[CreateTaskRequest]
+    ) -> list[int]:
+        """Add several tasks in a single transaction, returns their ids."""
+        return await asyncio.wrap_future(
+            self._task_repository.submit_add_many(data_models)
+        )
+
+    async def query(
+        self,
+        query_params: QueryParams,
+        limit: int | None = None,
+        offset: int | None = None,
+        order_by_relevance: bool = False,
+        fields: Sequence[str] | None = None,
+    ) -> list[Task]:
+        """Retrieve tasks matching the query parameters."""
+        return await self._run(
+            self._task_repository.query,
+            query_params=query_params,
+            limit=limit,
+            offset=offset,
+            order_by_relevance=order_by_relevance,
+            fields=fields,
+        )
+
+    async def count(self, query_params: QueryParams) -> int:
+        """Count the tasks matching the query parameters."""
+        return await self._run(
+            self._task_repository.count, query_params=query_params
+        )
+
+    async def task_version(self, id: int) -> int | None:
+        """Return the version of a task, None when it does not exist."""
+        return await self._run(self._task_repository.task_version, id=id)
+
+    async def data_version(self) -> str:
+        """Return a token which changes with every write to the tasks."""
+        return await self._run(self._task_repository.data_version)
+
+    async def stats(self, now: datetime) -> list[TaskGroupStats]:
+        """Count the tasks per priority and completion state."""
+        return await self._run(self._task_repository.stats, now=now)
+
+    async def query_page(
+        self,
+        query_params: QueryParams,
+        limit: int,
+        offset: int = 0,
+        order_by_relevance: bool = False,
+        sort: Sequence[SortKey] = (),
+        fields: Sequence[str] | None = None,
+    ) -> tuple[list[Task], int]:
+        """Retrieve a page of tasks and the total number of matches."""
+        return await self._run(
+            self._task_repository.query_page,
+            query_params=query_params,
+            limit=limit,
+            offset=offset,
+            order_by_relevance=order_by_relevance,
+            sort=sort,
+            fields=fields,
+        )
+
+    async def query_page_json(
+        self,
+        query_params: QueryParams,
+        limit: int,
+        offset: int = 0,
+        order_by_relevance: bool = False,
+        sort: Sequence[SortKey] = (),
+        fields: Sequence[str] | None = None,
+    ) -> tuple[str, int]:
+        """Retrieve a page of tasks as a JSON array and the total matches."""
+        return await self._run(
+            self._task_repository.query_page_json,
+            query_params=query_params,
+            limit=limit,
+            offset=offset,
+            order_by_relevance=order_by_relevance,
+            sort=sort,
+            fields=fields,
+        )
+
+    async def query_page_columns(
+        self,
+        query_params: QueryParams,
+        limit: int,
+        offset: int = 0,
+        order_by_relevance: bool = False,
+        sort: Sequence[SortKey] = (),
+        fields: Sequence[str] | None = None,
+    ) -> tuple[dict[str, list[Any]], int]:
+        """Retrieve a page of tasks column by column and the total matches."""
+        return await self._run(
+            self._task_repository.query_page_columns,
+            query_params=query_params,
+            limit=limit,
+            offset=offset,
+            order_by_relevance=order_by_relevance,
+            sort=sort,
+            fields=fields,
+        )
+
+    async def query_after_columns(
+        self,
+        query_params: QueryParams,
+        limit: int,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> dict[str, list[Any]]:
+        """Retrieve the tasks following ``after_id`` column by column."""
+        return await self._run(
+            self._task_repository.query_after_columns,
+            query_params=query_params,
+            limit=limit,
+            after_id=after_id,
+            fields=fields,
+        )
+
+    async def query_after(
+        self,
+        query_params: QueryParams,
+        limit: int,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> list[Task]:
+        """Retrieve the tasks following ``after_id`` in id order."""
+        return await self._run(
+            self._task_repository.query_after,
+            query_params=query_params,
+            limit=limit,
+            after_id=after_id,
+            fields=fields,
+        )
+
+    async def iterate(
+        self, query_params: QueryParams, batch_size: int
+    ) -> AsyncGenerator[list[Task], None]:
+        """Stream the tasks matching the query parameters in batches.
+
+        Every batch is fetched on the database executor. The underlying
+        iterator is closed on the executor as well once the batch being
+        fetched is done, also when the consumer stops early.
+        """
+        batches = self._task_repository.iterate(query_params, batch_size)
+        future = self._executor.submit(next, batches, None)
+        try:
+            while (batch := await asyncio.wrap_future(future)) is not None:
+                future = self._executor.submit(next, batches, None)
+                yield batch
+        finally:
+            future.add_done_callback(
+                lambda _: self._executor.submit(batches.close)
+            )
+
+    async def update(
+        self, id: int, update_task_request: UpdateTaskRequest
+    ) -> Task | None:
+        """Update an existing task, returns None when it does not exist."""
+        return await asyncio.wrap_future(
+            self._task_repository.submit_update(id, update_task_request)
+        )
+
+    async def delete(self, id: int) -> Task | None:
+        """Delete a task by id, returns None when it does not exist."""
+        return await asyncio.wrap_future(
+            self._task_repository.submit_delete(id)
+        )
+
+    async def update_where(
+        self, query_params: QueryParams, update_task_request: UpdateTaskRequest
+    ) -> int:
+        """Update the tasks matching the query parameters at once."""
+        return await asyncio.wrap_future(
+            self._task_repository.submit_update_where(
+                query_params, update_task_request
+            )
+        )
+
+    async def delete_where(self, query_params: QueryParams) -> int:
+        """Delete the tasks matching the query parameters at once."""
+        return await asyncio.wrap_future(
+            self._task_repository.submit_delete_where(query_params)
+        )
+
+    def close(self) -> None:
+        """Wait for the pending work and close the repository."""
+        self._executor.shutdown(wait=True)
+        self._task_repository.close()
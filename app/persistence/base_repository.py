@@ -2,8 +2,20 @@
 
 import sqlite3
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
 from typing import Generic, TypeVar
 
+from app.persistence.config import DatabaseConfig
+from app.persistence.pool import ConnectionPool, PoolStats, connect
+from app.persistence.writer import (
+    BatchWriter,
+    R,
+    WriteOperation,
+    WriterStats,
+)
+
 
 T = TypeVar("T")
 
@@ -14,18 +26,69 @@ class BaseRepository(ABC, Generic[T]):
     for all repositories.
     """
 
-    def __init__(self, db_name: str) -> None:
-        """Initialize the repository with a database connection."""
-        self._db_name = db_name
-        self._create_tables()
+    def __init__(self, config: DatabaseConfig) -> None:
+        """Initialize the repository with a connection pool and a writer.
+
+        The pool only holds read-only connections, all the mutations go
+        through the writer and its own connection.
+        """
+        self._config = config
+        self._db_name = config.db_name
+        self._migrate()
+        self._pool = ConnectionPool(config, read_only=True)
+        self._writer = BatchWriter(config)
+
+    @contextmanager
+    def _get_connection(self) -> Iterator[sqlite3.Connection]:
+        """Get a pooled read-only database connection.
+
+        The block runs in a transaction which is committed on success and
+        rolled back on error, the connection is returned to the pool after.
+        """
+        with self._pool.connection() as conn, conn:
+            yield conn
+
+    @contextmanager
+    def _write_connection(self) -> Iterator[sqlite3.Connection]:
+        """Open a dedicated read-write connection for maintenance work.
+
+        Used for the migrations, which run before the writer starts. The
+        block runs in a transaction and the connection is closed after.
+        """
+        conn = connect(self._config)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _read_transaction(self) -> Iterator[sqlite3.Connection]:
+        """Get a pooled connection reading from a single snapshot."""
+        with self._get_connection() as conn:
+            conn.execute("BEGIN")
+            yield conn
+
+    def _submit_write(self, operation: WriteOperation[R]) -> Future[R]:
+        """Queue a mutation on the single writer of the database."""
+        return self._writer.submit(operation)
+
+    def pool_stats(self) -> PoolStats:
+        """Return the statistics of the connection pool."""
+        return self._pool.stats()
+
+    def writer_stats(self) -> WriterStats:
+        """Return the statistics of the database writer."""
+        return self._writer.stats()
 
-    def _get_connection(self) -> sqlite3.Connection:
-        """Get the database connection."""
-        return sqlite3.connect(self._db_name)
+    def close(self) -> None:
+        """Commit the pending writes and close the database connections."""
+        self._writer.close()
+        self._pool.close()
 
     @abstractmethod
-    def _create_tables(self) -> None:
-        """Create necessary tables in the database."""
+    def _migrate(self) -> None:
+        """Bring the database schema up to date."""
 
     @abstractmethod
     def add(self, data_model: T) -> T:
@@ -41,9 +104,9 @@ class BaseRepository(ABC, Generic[T]):
         """Retrieve entities from the database based on the query."""
 
     @abstractmethod
-    def update(self, id: int, data_model: T) -> None:
+    def update(self, id: int, data_model: T) -> T | None:
         """Update an existing entity in the database."""
 
     @abstractmethod
-    def delete(self, id: int) -> None:
+    def delete(self, id: int) -> T | None:
         """Delete an entity by id from the database."""
@@ -0,0 +1,79 @@
+"""Configuration for the persistence layer."""
+
+from typing import Literal, Self
+
+from pydantic import BaseModel, model_validator
+
+
+class DatabaseConfig(BaseModel):
+    """Configuration for database."""
+
+    db_name: str = "tasks.db"
+    """Path of the SQLite database file."""
+
+    pool_size: int = 5
+    """Maximum number of pooled connections."""
+
+    executor_threads: int = 4
+    """Number of threads running database work for the async API."""
+
+    pool_timeout: float = 30.0
+    """Seconds to wait for a free connection before giving up."""
+
+    pool_idle_timeout: float = 300.0
+    """Seconds after which an idle pooled connection is closed."""
+
+    write_batch_size: int = 256
+    """Maximum number of writes committed in a single transaction."""
+
+    write_batch_window: float = 0.001
+    """Seconds the writer waits for more writes to join a batch."""
+
+    write_retries: int = 5
+    """Number of times a batch is retried when the database is locked."""
+
+    write_retry_delay: float = 0.01
+    """Initial backoff in seconds between retries, doubled every retry."""
+
+    validate_rows: bool = False
+    """Validate the rows read back from the database, for debugging."""
+
+    journal_mode: Literal[
+        "delete", "truncate", "persist", "memory", "wal", "off"
+    ] = "wal"
+    """Value of the ``journal_mode`` pragma."""
+
+    synchronous: Literal["off", "normal", "full", "extra"] = "normal"
+    """Value of the ``synchronous`` pragma."""
+
+    cache_size: int = -16000
+    """Value of the ``cache_size`` pragma, negative values are in KiB."""
+
+    mmap_size: int = 67108864
+    """Value of the ``mmap_size`` pragma in bytes."""
+
+    temp_store: Literal["default", "file", "memory"] = "memory"
+    """Value of the ``temp_store`` pragma."""
+
+    busy_timeout: int = 5000
+    """Value of the ``busy_timeout`` pragma in milliseconds."""
+
+    @model_validator(mode="after")
+    def validate_pool_size(self) -> Self:
+        """Ensure every executor thread can hold a pooled connection."""
+        if self.pool_size < self.executor_threads:
+            raise ValueError(
+                "pool_size must not be smaller than executor_threads."
+            )
+        return self
+
+    def pragmas(self) -> list[str]:
+        """Return the PRAGMA statements applied to every new connection."""
+        return [
+            f"PRAGMA journal_mode = {self.journal_mode}",
+            f"PRAGMA synchronous = {self.synchronous}",
+            f"PRAGMA cache_size = {self.cache_size}",
+            f"PRAGMA mmap_size = {self.mmap_size}",
+            f"PRAGMA temp_store = {self.temp_store}",
+            f"PRAGMA busy_timeout = {self.busy_timeout}",
+        ]
@@ -0,0 +1,28 @@
+"""Custom exceptions for the persistence layer."""
+
+
+class PoolTimeoutError(Exception):
+    """Exception raised when no pooled connection is available in time."""
+
+    def __init__(self, timeout: float) -> None:
+        """Initialize with the timeout that was exceeded."""
+        self.timeout = timeout
+        super().__init__(
+            f"No database connection available after {timeout} seconds."
+        )
+
+
+class PoolClosedError(Exception):
+    """Exception raised when using a connection pool that is closed."""
+
+    def __init__(self) -> None:
+        """Initialize the exception."""
+        super().__init__("The connection pool is closed.")
+
+
+class WriterClosedError(Exception):
+    """Exception raised when submitting to a writer that is closed."""
+
+    def __init__(self) -> None:
+        """Initialize the exception."""
+        super().__init__("The database writer is closed.")
@@ -0,0 +1,60 @@
+"""Versioned schema migrations for SQLite databases."""
+
+import sqlite3
+from collections.abc import Sequence
+
+from pydantic import BaseModel
+
+
+class Migration(BaseModel):
+    """A versioned change to the database schema."""
+
+    version: int
+    """Schema version reached once the migration is applied."""
+
+    description: str
+    """Short description of the change."""
+
+    statements: tuple[str, ...]
+    """SQL statements applied in order."""
+
+
+class MigrationRunner:
+    """Apply the pending migrations tracked by ``PRAGMA user_version``."""
+
+    def __init__(self, migrations: Sequence[Migration]) -> None:
+        """Initialize with the migrations ordered by version."""
+        versions = [migration.version for migration in migrations]
+        if versions != sorted(set(versions)) or 0 in versions:
+            raise ValueError(
+                "Migration versions must be positive, unique and ordered."
+            )
+        self._migrations = migrations
+
+    @staticmethod
+    def current_version(conn: sqlite3.Connection) -> int:
+        """Return the schema version of the database."""
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def run(self, conn: sqlite3.Connection) -> int:
+        """Apply the pending migrations, each in its own transaction.
+
+        The version is re-read once the write lock is held, so concurrent
+        processes starting on the same database apply every migration once.
+
+        :returns: The schema version of the database.
+        """
+        for migration in self._migrations:
+            if migration.version <= self.current_version(conn):
+                continue
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if migration.version > self.current_version(conn):
+                    for statement in migration.statements:
+                        conn.execute(statement)
+                    conn.execute(f"PRAGMA user_version = {migration.version}")
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        return self.current_version(conn)
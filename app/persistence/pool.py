@@ -0,0 +1,219 @@
+"""Connection pool for SQLite databases."""
+
+import sqlite3
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from app.persistence.config import DatabaseConfig
+from app.persistence.exception import PoolClosedError, PoolTimeoutError
+
+
+def connect(
+    config: DatabaseConfig, read_only: bool = False
+) -> sqlite3.Connection:
+    """Open a new connection with the configured pragmas.
+
+    A read-only connection opens the database file with ``mode=ro`` and
+    refuses any write with the ``query_only`` pragma. The database must
+    exist already.
+    """
+    database = config.db_name
+    if read_only:
+        database = f"{Path(database).absolute().as_uri()}?mode=ro"
+    conn = sqlite3.connect(
+        database,
+        timeout=config.busy_timeout / 1000,
+        check_same_thread=False,
+        uri=read_only,
+    )
+    for pragma in config.pragmas():
+        conn.execute(pragma)
+    if read_only:
+        conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+class PoolStats(BaseModel):
+    """Statistics of a connection pool."""
+
+    size: int
+    """Maximum number of connections."""
+
+    open: int
+    """Number of connections currently open."""
+
+    in_use: int
+    """Number of connections currently checked out."""
+
+    idle: int
+    """Number of open connections waiting to be checked out."""
+
+    created: int
+    """Total number of connections opened."""
+
+    reaped: int
+    """Total number of idle connections closed by the reaper."""
+
+    checkouts: int
+    """Total number of successful checkouts."""
+
+    waits: int
+    """Total number of checkouts that had to wait for a connection."""
+
+    timeouts: int
+    """Total number of checkouts that timed out."""
+
+
+class ConnectionPool:
+    """A thread-safe pool of long-lived SQLite connections.
+
+    Connections are opened lazily up to ``pool_size``, configured with the
+    PRAGMA profile from the config and handed out last-in-first-out so the
+    hottest connections keep their page cache warm. Connections that stay
+    idle for longer than ``pool_idle_timeout`` are closed when connections
+    are returned to the pool. With ``read_only`` the pool hands out
+    read-only connections, which in WAL mode read concurrently with the
+    writer.
+    """
+
+    def __init__(
+        self, config: DatabaseConfig, read_only: bool = False
+    ) -> None:
+        """Initialize the pool with the database config."""
+        self._config = config
+        self._read_only = read_only
+        self._condition = threading.Condition()
+        self._idle: deque[tuple[sqlite3.Connection, float]] = deque()
+        self._open = 0
+        self._closed = False
+        self._created = 0
+        self._reaped = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a new connection for the pool."""
+        return connect(self._config, self._read_only)
+
+    def checkout(self, timeout: float | None = None) -> sqlite3.Connection:
+        """Take a connection out of the pool.
+
+        Waits up to ``timeout`` seconds, defaulting to ``pool_timeout``,
+        when all the connections are in use.
+        """
+        timeout = self._config.pool_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited = False
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise PoolClosedError()
+                if self._idle:
+                    conn, _ = self._idle.pop()
+                    self._checkouts += 1
+                    return conn
+                if self._open < self._config.pool_size:
+                    self._open += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(timeout)
+                if not waited:
+                    self._waits += 1
+                    waited = True
+                self._condition.wait(remaining)
+
+        try:
+            conn = self._connect()
+        except BaseException:
+            with self._condition:
+                self._open -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._created += 1
+            self._checkouts += 1
+        return conn
+
+    def checkin(self, conn: sqlite3.Connection) -> None:
+        """Return a connection to the pool."""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._condition:
+            if self._closed:
+                self._open -= 1
+                expired = [conn]
+            else:
+                self._idle.append((conn, time.monotonic()))
+                expired = self._pop_expired()
+            self._condition.notify()
+        for expired_conn in expired:
+            expired_conn.close()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Check out a connection for the duration of the block."""
+        conn = self.checkout()
+        try:
+            yield conn
+        finally:
+            self.checkin(conn)
+
+    def _pop_expired(self) -> list[sqlite3.Connection]:
+        """Remove the connections idle for too long, must hold the lock."""
+        expired = []
+        threshold = time.monotonic() - self._config.pool_idle_timeout
+        # The least recently used connections sit at the left of the deque.
+        while self._idle and self._idle[0][1] < threshold:
+            expired.append(self._idle.popleft()[0])
+        self._open -= len(expired)
+        self._reaped += len(expired)
+        return expired
+
+    def reap_idle(self) -> int:
+        """Close the connections idle for too long.
+
+        :returns: The number of connections closed.
+        """
+        with self._condition:
+            expired = self._pop_expired()
+        for conn in expired:
+            conn.close()
+        return len(expired)
+
+    def stats(self) -> PoolStats:
+        """Return a snapshot of the pool statistics."""
+        with self._condition:
+            return PoolStats(
+                size=self._config.pool_size,
+                open=self._open,
+                in_use=self._open - len(self._idle),
+                idle=len(self._idle),
+                created=self._created,
+                reaped=self._reaped,
+                checkouts=self._checkouts,
+                waits=self._waits,
+                timeouts=self._timeouts,
+            )
+
+    def close(self) -> None:
+        """Close the idle connections and refuse further checkouts.
+
+        Connections still checked out are closed when they are returned.
+        """
+        with self._condition:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._open -= len(idle)
+            self._condition.notify_all()
+        for conn in idle:
+            conn.close()
@@ -4,7 +4,7 @@ from datetime import datetime
 
 from pydantic import BaseModel
 
-from app.schemas import Priority
+from app.schemas import Priority, SortField
 
 
 class CreateTaskRequest(BaseModel):
@@ -26,6 +26,17 @@ class Task(BaseModel):
     due_date: datetime
     description: str | None
     completed: bool
+    version: int = 1
+    """Version of the row, incremented by every update."""
+
+
+class TaskGroupStats(BaseModel):
+    """Number of tasks sharing a priority and a completion state."""
+
+    priority: Priority
+    completed: bool
+    count: int
+    overdue: int
 
 
 class QueryParams(BaseModel):
@@ -36,6 +47,15 @@ class QueryParams(BaseModel):
     id: int | None = None
     title: str | None = None
     description: str | None = None
+    due_after: datetime | None = None
+    due_before: datetime | None = None
+
+
+class SortKey(BaseModel):
+    """A field to sort the tasks by and its direction."""
+
+    field: SortField
+    descending: bool = False
 
 
 class UpdateTaskRequest(BaseModel):
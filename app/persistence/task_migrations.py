@@ -0,0 +1,197 @@
+"""Schema migrations of the tasks table."""
+
+from app.persistence.migrations import Migration
+
+
+TASK_MIGRATIONS = (
+    Migration(
+        version=1,
+        description="Create the tasks table.",
+        statements=(
+            """
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                due_date TEXT NOT NULL,
+                description TEXT,
+                completed BOOLEAN NOT NULL DEFAULT 0
+            )
+            """,
+        ),
+    ),
+    Migration(
+        version=2,
+        description=(
+            "Index the priority and completed filters, every index ends "
+            "with the implicit id so filtered rows come out in id order."
+        ),
+        statements=(
+            "CREATE INDEX IF NOT EXISTS ix_tasks_priority ON tasks (priority)",
+            "CREATE INDEX IF NOT EXISTS ix_tasks_completed "
+            "ON tasks (completed)",
+            "CREATE INDEX IF NOT EXISTS ix_tasks_priority_completed "
+            "ON tasks (priority, completed)",
+        ),
+    ),
+    Migration(
+        version=3,
+        description=(
+            "Index the title and description with a trigram FTS5 table "
+            "kept in sync by triggers, and backfill it."
+        ),
+        statements=(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+                title,
+                description,
+                content='tasks',
+                content_rowid='id',
+                tokenize='trigram'
+            )
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_insert
+            AFTER INSERT ON tasks BEGIN
+                INSERT INTO tasks_fts (rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_delete
+            AFTER DELETE ON tasks BEGIN
+                INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS tasks_fts_update
+            AFTER UPDATE OF title, description ON tasks BEGIN
+                INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+                VALUES ('delete', old.id, old.title, old.description);
+                INSERT INTO tasks_fts (rowid, title, description)
+                VALUES (new.id, new.title, new.description);
+            END
+            """,
+            "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')",
+        ),
+    ),
+    Migration(
+        version=4,
+        description=(
+            "Count the tasks per priority and completion state in a table "
+            "kept exact by triggers, backfill it, and index the due date "
+            "of the open tasks for the overdue counts."
+        ),
+        statements=(
+            """
+            CREATE TABLE IF NOT EXISTS task_stats (
+                priority INTEGER NOT NULL,
+                completed BOOLEAN NOT NULL,
+                count INTEGER NOT NULL,
+                PRIMARY KEY (priority, completed)
+            ) WITHOUT ROWID
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS task_stats_insert
+            AFTER INSERT ON tasks BEGIN
+                INSERT INTO task_stats (priority, completed, count)
+                VALUES (new.priority, new.completed, 1)
+                ON CONFLICT (priority, completed)
+                DO UPDATE SET count = count + 1;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS task_stats_delete
+            AFTER DELETE ON tasks BEGIN
+                UPDATE task_stats SET count = count - 1
+                WHERE priority = old.priority AND completed = old.completed;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS task_stats_update
+            AFTER UPDATE OF priority, completed ON tasks
+            WHEN old.priority IS NOT new.priority
+                OR old.completed IS NOT new.completed
+            BEGIN
+                UPDATE task_stats SET count = count - 1
+                WHERE priority = old.priority AND completed = old.completed;
+                INSERT INTO task_stats (priority, completed, count)
+                VALUES (new.priority, new.completed, 1)
+                ON CONFLICT (priority, completed)
+                DO UPDATE SET count = count + 1;
+            END
+            """,
+            """
+            INSERT INTO task_stats (priority, completed, count)
+            SELECT priority, completed, COUNT(*) FROM tasks
+            GROUP BY priority, completed
+            """,
+            "CREATE INDEX IF NOT EXISTS ix_tasks_completed_due_date "
+            "ON tasks (completed, julianday(due_date))",
+        ),
+    ),
+    Migration(
+        version=5,
+        description=(
+            "Version every task, bumped by each update, and count the "
+            "changes to the tasks in a single row kept by triggers, along "
+            "with a random epoch telling databases apart."
+        ),
+        statements=(
+            "ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 1",
+            """
+            CREATE TABLE IF NOT EXISTS task_changes (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                epoch TEXT NOT NULL,
+                counter INTEGER NOT NULL
+            )
+            """,
+            """
+            INSERT INTO task_changes (id, epoch, counter)
+            VALUES (1, lower(hex(randomblob(8))), 0)
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS task_changes_insert
+            AFTER INSERT ON tasks BEGIN
+                UPDATE task_changes SET counter = counter + 1 WHERE id = 1;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS task_changes_update
+            AFTER UPDATE ON tasks BEGIN
+                UPDATE task_changes SET counter = counter + 1 WHERE id = 1;
+            END
+            """,
+            """
+            CREATE TRIGGER IF NOT EXISTS task_changes_delete
+            AFTER DELETE ON tasks BEGIN
+                UPDATE task_changes SET counter = counter + 1 WHERE id = 1;
+            END
+            """,
+        ),
+    ),
+    Migration(
+        version=6,
+        description=(
+            "Index the due date for the sorting and range filters, the "
+            "implicit id breaks the ties."
+        ),
+        statements=(
+            "CREATE INDEX IF NOT EXISTS ix_tasks_due_date "
+            "ON tasks (julianday(due_date))",
+        ),
+    ),
+    Migration(
+        version=7,
+        description=(
+            "Index the title and the priority then due date sorts, the "
+            "implicit id breaks the ties."
+        ),
+        statements=(
+            "CREATE INDEX IF NOT EXISTS ix_tasks_title ON tasks (title)",
+            "CREATE INDEX IF NOT EXISTS ix_tasks_priority_due_date "
+            "ON tasks (priority, julianday(due_date))",
+        ),
+    ),
+)
@@ -1,120 +1,454 @@
 """Task repository for managing task data."""
 
+import sqlite3
+from collections.abc import Callable, Collection, Generator, Sequence
+from concurrent.futures import Future
+from datetime import datetime
+from functools import partial
+from typing import Any
+
 from app.persistence.base_repository import BaseRepository
+from app.persistence.config import DatabaseConfig
+from app.persistence.migrations import MigrationRunner
 from app.persistence.schemas import (
     CreateTaskRequest,
     QueryParams,
+    SortKey,
     Task,
+    TaskGroupStats,
     UpdateTaskRequest,
 )
+from app.persistence.task_migrations import TASK_MIGRATIONS
+from app.schemas import Priority, SortField
+
+
+MIN_MATCH_LENGTH = 3
+"""Shortest text filter the trigram index can serve."""
+
+TASK_FIELDS = (
+    "id",
+    "title",
+    "priority",
+    "due_date",
+    "description",
+    "completed",
+    "version",
+)
+"""Columns selected to hydrate a task, in row order."""
+
+SORT_COLUMNS = {
+    SortField.ID: "tasks.id",
+    SortField.TITLE: "tasks.title",
+    SortField.PRIORITY: "tasks.priority",
+    SortField.DUE_DATE: "julianday(tasks.due_date)",
+    SortField.COMPLETED: "tasks.completed",
+}
+"""Expressions the tasks can be sorted by, matching the indexes."""
+
+DUE_DATE_BOUNDS = {
+    "due_after": "julianday(tasks.due_date) >= julianday(?)",
+    "due_before": "julianday(tasks.due_date) < julianday(?)",
+}
+"""Conditions of the due date range filters."""
+
+
+def _construct_task(cursor: sqlite3.Cursor, row: tuple) -> Task:
+    """Build a task from a row without validation.
+
+    The rows were validated on their way in, so they are trusted and only
+    converted back to their Python types.
+    """
+    return Task.model_construct(
+        id=row[0],
+        title=row[1],
+        priority=Priority(row[2]),
+        due_date=datetime.fromisoformat(row[3]),
+        description=row[4],
+        completed=bool(row[5]),
+        version=row[6],
+    )
+
+
+def _validate_task(cursor: sqlite3.Cursor, row: tuple) -> Task:
+    """Build a task from a row with full validation."""
+    return Task.model_validate(dict(zip(TASK_FIELDS, row)))
+
+
+FIELD_CONVERTERS: dict[str, Callable[[Any], Any]] = {
+    "priority": Priority,
+    "due_date": datetime.fromisoformat,
+    "completed": bool,
+}
+"""Conversions of the columns not stored as their Python type."""
+
+
+def _construct_partial_task(
+    fields: Sequence[str], cursor: sqlite3.Cursor, row: tuple
+) -> Task:
+    """Build a task holding only some fields from a row.
+
+    A partial task cannot be validated, so it is always constructed and
+    the fields it lacks are left unset.
+    """
+    return Task.model_construct(
+        **{
+            field: FIELD_CONVERTERS[field](value)
+            if field in FIELD_CONVERTERS
+            else value
+            for field, value in zip(fields, row)
+        }
+    )
+
+
+JSON_FIELDS = {
+    "id": "page.id",
+    "title": "page.title",
+    "priority": "page.priority",
+    "due_date": "CASE WHEN page.due_date LIKE '%+00:00' "
+    "THEN substr(page.due_date, 1, length(page.due_date) - 6) || 'Z' "
+    "ELSE page.due_date END",
+    "description": "page.description",
+    "completed": "json(CASE WHEN page.completed THEN 'true' ELSE 'false' END)",
+}
+"""Expressions encoding the columns as the API serialises the fields.
+
+The due dates are stored in ISO format, where UTC is ``+00:00`` while the
+API writes ``Z``, and the completion flags are stored as integers.
+"""
+
+
+COLUMN_ENCODINGS = {
+    "id": "tasks.id",
+    "title": "tasks.title",
+    "priority": "tasks.priority",
+    "due_date": "CAST(round((julianday(tasks.due_date) - 2440587.5) "
+    "* 86400000) AS INTEGER)",
+    "description": "tasks.description",
+    "completed": "tasks.completed",
+}
+"""Compact encodings of the columns returned column by column.
+
+The due dates are milliseconds since the Unix epoch, in UTC like the due
+date filters, and the completion flags are 0 or 1.
+"""
+
+
+def _check_fields(fields: Sequence[str], known: Collection[str]) -> None:
+    """Refuse the fields which are not known columns."""
+    unknown = set(fields).difference(known)
+    if unknown:
+        raise ValueError(f"Unknown task fields: {sorted(unknown)}")
 
 
 class TaskRepository(BaseRepository):
     """Repository for managing task data."""
 
-    def _create_tables(self) -> None:
-        """Create the tasks table in the database."""
-        with self._get_connection() as conn:
-            conn.execute(
-                """
-                CREATE TABLE IF NOT EXISTS tasks (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT NOT NULL,
-                    priority INTEGER NOT NULL,
-                    due_date TEXT NOT NULL,
-                    description TEXT,
-                    completed BOOLEAN NOT NULL DEFAULT 0
-                )
-                """
-            )
+    def __init__(self, config: DatabaseConfig) -> None:
+        """Initialize the repository and pick how rows are hydrated."""
+        super().__init__(config)
+        self._row_factory = (
+            _validate_task if config.validate_rows else _construct_task
+        )
 
-    def add(self, data_model: CreateTaskRequest) -> Task:
-        """Add a new task to the database."""
-        with self._get_connection() as conn:
-            fields = "title, priority, due_date, description, completed"
-            cursor = conn.execute(
-                f"INSERT INTO tasks ({fields}) VALUES (?, ?, ?, ?, ?)",  # noqa: S608
+    def _migrate(self) -> None:
+        """Apply the pending migrations of the tasks table."""
+        with self._write_connection() as conn:
+            MigrationRunner(TASK_MIGRATIONS).run(conn)
+
+    def _insert(
+        self, conn: sqlite3.Connection, data_model: CreateTaskRequest
+    ) -> Task:
+        """Insert a task on the writer connection."""
+        fields = "title, priority, due_date, description, completed"
+        cursor = conn.execute(
+            f"INSERT INTO tasks ({fields}) VALUES (?, ?, ?, ?, ?)",  # noqa: S608
+            (
+                data_model.title,
+                data_model.priority.value,
+                data_model.due_date.isoformat(),
+                data_model.description,
+                data_model.completed,
+            ),
+        )
+        return Task(
+            id=cursor.lastrowid,
+            title=data_model.title,
+            priority=data_model.priority,
+            due_date=data_model.due_date,
+            description=data_model.description,
+            completed=data_model.completed,
+        )
+
+    def _insert_many(
+        self,
+        conn: sqlite3.Connection,
+        data_models: list[CreateTaskRequest],
+    ) -> list[int]:
+        """Insert tasks on the writer connection with one statement.
+
+        The writer holds the write lock for the whole transaction, so the
+        rows receive consecutive ids ending with the last inserted one.
+        """
+        if not data_models:
+            return []
+        fields = "title, priority, due_date, description, completed"
+        conn.executemany(
+            f"INSERT INTO tasks ({fields}) VALUES (?, ?, ?, ?, ?)",  # noqa: S608
+            [
                 (
                     data_model.title,
                     data_model.priority.value,
                     data_model.due_date.isoformat(),
                     data_model.description,
                     data_model.completed,
-                ),
+                )
+                for data_model in data_models
+            ],
+        )
+        (last_id,) = conn.execute("SELECT last_insert_rowid()").fetchone()
+        return list(range(last_id - len(data_models) + 1, last_id + 1))
+
+    def submit_add(self, data_model: CreateTaskRequest) -> Future[Task]:
+        """Queue a new task on the writer."""
+        return self._submit_write(partial(self._insert, data_model=data_model))
+
+    def add(self, data_model: CreateTaskRequest) -> Task:
+        """Add a new task to the database."""
+        return self.submit_add(data_model).result()
+
+    def submit_add_many(
+        self, data_models: list[CreateTaskRequest]
+    ) -> Future[list[int]]:
+        """Queue the insertion of several tasks on the writer."""
+        return self._submit_write(
+            partial(self._insert_many, data_models=data_models)
+        )
+
+    def add_many(self, data_models: list[CreateTaskRequest]) -> list[int]:
+        """Add several tasks in a single transaction.
+
+        :returns: The ids of the tasks, in the order they were given.
+        """
+        return self.submit_add_many(data_models).result()
+
+    @staticmethod
+    def _match_phrase(column: str, value: str) -> str:
+        """Build an FTS5 column filter matching the value as a substring."""
+        escaped = value.replace('"', '""')
+        return f'{column} : "{escaped}"'
+
+    @staticmethod
+    def _order(sort: Sequence[SortKey]) -> str:
+        """Build the ordering terms sorting by the keys.
+
+        The id breaks the ties, in the direction of the last key, so the
+        order is total and an index ending with the id serves it whole.
+        """
+        terms = []
+        descending = False
+        for key in sort:
+            descending = key.descending
+            terms.append(
+                SORT_COLUMNS[key.field] + (" DESC" if descending else "")
             )
-            return Task(
-                id=cursor.lastrowid,
-                title=data_model.title,
-                priority=data_model.priority,
-                due_date=data_model.due_date,
-                description=data_model.description,
-                completed=data_model.completed,
+            if key.field is SortField.ID:
+                return ", ".join(terms)
+        terms.append("tasks.id DESC" if descending else "tasks.id")
+        return ", ".join(terms)
+
+    @staticmethod
+    def _condition(key: str, value: Any) -> tuple[str, Any]:  # noqa: ANN401
+        """Build a filter condition not served by the FTS5 index."""
+        if key in ("title", "description"):
+            return f"tasks.{key} LIKE ?", f"%{value}%"
+        if key in DUE_DATE_BOUNDS:
+            return DUE_DATE_BOUNDS[key], value
+        return f"tasks.{key} = ?", value
+
+    def _filter(
+        self,
+        query: dict,
+        order_by_relevance: bool = False,
+        after_id: int | None = None,
+        sort: Sequence[SortKey] = (),
+    ) -> tuple[str, list[Any], str]:
+        """Build the FROM and WHERE clauses and the ORDER BY of a query.
+
+        The tasks are ordered by relevance, by ``sort``, or else by id.
+
+        The title and description filters are served by the trigram FTS5
+        index, which preserves the substring semantics of ``LIKE``. Terms
+        shorter than a trigram cannot use the index and fall back to
+        ``LIKE``. The due dates are compared as Julian days, which orders
+        them across UTC offsets and uses the due date indexes. With
+        ``after_id`` only the tasks following that id are kept, which seeks
+        straight to a page of the id ordering.
+
+        :returns: The clauses, their values and the ordering terms.
+        """
+        sources = "tasks"
+        conditions = []
+        values: list[Any] = []
+        match_phrases = []
+        order = self._order(sort) if sort else "tasks.id"
+
+        for key, value in query.items():
+            if key in ("title", "description") and (
+                len(value) >= MIN_MATCH_LENGTH
+            ):
+                match_phrases.append(self._match_phrase(key, value))
+            else:
+                condition, condition_value = self._condition(key, value)
+                conditions.append(condition)
+                values.append(condition_value)
+        if after_id is not None:
+            conditions.append("tasks.id > ?")
+            values.append(after_id)
+
+        if match_phrases and order_by_relevance:
+            sources += " JOIN tasks_fts ON tasks_fts.rowid = tasks.id"
+            conditions.insert(0, "tasks_fts MATCH ?")
+            order = "tasks_fts.rank, tasks.id"
+        elif match_phrases:
+            conditions.insert(
+                0,
+                "tasks.id IN "
+                "(SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH ?)",
             )
+        if match_phrases:
+            values.insert(0, " AND ".join(match_phrases))
 
-    def _get(
+        clauses = f"FROM {sources}"
+        if conditions:
+            clauses += " WHERE " + " AND ".join(conditions)
+        return clauses, values, order
+
+    def _execute_select(
+        self,
+        conn: sqlite3.Connection,
+        query: dict,
+        limit: int | None = None,
+        offset: int | None = None,
+        order_by_relevance: bool = False,
+        after_id: int | None = None,
+        sort: Sequence[SortKey] = (),
+        fields: Sequence[str] | None = None,
+    ) -> sqlite3.Cursor:
+        """Execute the selection of the tasks matching the query.
+
+        The rows are hydrated straight into tasks by the row factory. With
+        ``fields`` only these columns are read, into partial tasks.
+        """
+        cursor = conn.cursor()
+        cursor.row_factory = self._row_factory
+        if fields is not None:
+            _check_fields(fields, TASK_FIELDS)
+            cursor.row_factory = partial(_construct_partial_task, fields)
+        sql_query, values = self._select_sql(
+            [f"tasks.{field}" for field in fields or TASK_FIELDS],
+            query,
+            limit,
+            offset,
+            order_by_relevance,
+            after_id,
+            sort,
+        )
+        return cursor.execute(sql_query, values)
+
+    def _select_sql(
+        self,
+        columns: Sequence[str],
+        query: dict,
+        limit: int | None = None,
+        offset: int | None = None,
+        order_by_relevance: bool = False,
+        after_id: int | None = None,
+        sort: Sequence[SortKey] = (),
+    ) -> tuple[str, list[Any]]:
+        """Build the selection of column expressions of the matching tasks.
+
+        :returns: The SELECT statement and its values.
+        """
+        clauses, values, order = self._filter(
+            query, order_by_relevance, after_id, sort
+        )
+        sql_query = (
+            "SELECT "  # noqa: S608
+            + ", ".join(columns)
+            + f" {clauses} ORDER BY {order}"
+        )
+
+        if limit is not None:
+            sql_query += " LIMIT ?"
+            values.append(str(limit))
+        if offset is not None:
+            sql_query += " OFFSET ?"
+            values.append(str(offset))
+
+        return sql_query, values
+
+    def _select(
         self,
+        conn: sqlite3.Connection,
         query: dict,
         limit: int | None = None,
         offset: int | None = None,
+        order_by_relevance: bool = False,
+        after_id: int | None = None,
+        sort: Sequence[SortKey] = (),
+        fields: Sequence[str] | None = None,
     ) -> list[Task]:
-        """Retrieve tasks based on the query."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
-            fields = [
-                "id",
-                "title",
-                "priority",
-                "due_date",
-                "description",
-                "completed",
-            ]
-            sql_query = "SELECT " + (", ".join(fields)) + " FROM tasks"  # noqa: S608
-            conditions = []
-            values = []
+        """Select the tasks matching the query on a connection."""
+        return self._execute_select(
+            conn,
+            query,
+            limit,
+            offset,
+            order_by_relevance,
+            after_id,
+            sort,
+            fields,
+        ).fetchall()
+
+    def _count(self, conn: sqlite3.Connection, query: dict) -> int:
+        """Count the tasks matching the query on a connection.
 
+        Queries filtering at most on the priority and completion state are
+        answered from the ``task_stats`` table without scanning the tasks.
+        """
+        if query.keys() <= {"priority", "completed"}:
+            sql_query = "SELECT COALESCE(SUM(count), 0) FROM task_stats"
             if query:
-                sql_query += " WHERE "
-                for key, value in query.items():
-                    if key == "title" or key == "description":
-                        conditions.append(f"{key} LIKE ?")
-                        values.append(f"%{value}%")
-                    else:
-                        conditions.append(f"{key} = ?")
-                        values.append(value)
-
-                sql_query += " AND ".join(conditions)
-
-            if limit is not None:
-                sql_query += " LIMIT ?"
-                values.append(str(limit))
-            if offset is not None:
-                sql_query += " OFFSET ?"
-                values.append(str(offset))
-
-            cursor.execute(sql_query, values)
-            rows = cursor.fetchall()
-
-            return [
-                Task.model_validate(
-                    {
-                        fields[0]: row[0],
-                        fields[1]: row[1],
-                        fields[2]: row[2],
-                        fields[3]: row[3],
-                        fields[4]: row[4],
-                        fields[5]: bool(row[5]),
-                    }
+                sql_query += " WHERE " + " AND ".join(
+                    f"{key} = ?" for key in query
                 )
-                for row in rows
-            ]
+            return conn.execute(sql_query, list(query.values())).fetchone()[0]
+        clauses, values, _ = self._filter(query)
+        sql_query = f"SELECT COUNT(*) {clauses}"  # noqa: S608
+        return conn.execute(sql_query, values).fetchone()[0]
 
-    def query(
+    def _get(
         self,
-        query_params: QueryParams,
+        query: dict,
         limit: int | None = None,
         offset: int | None = None,
+        order_by_relevance: bool = False,
+        fields: Sequence[str] | None = None,
     ) -> list[Task]:
-        """Retrieve tasks by priority."""
+        """Retrieve tasks based on the query."""
+        with self._get_connection() as conn:
+            return self._select(
+                conn,
+                query,
+                limit,
+                offset,
+                order_by_relevance,
+                fields=fields,
+            )
+
+    @staticmethod
+    def _to_query(query_params: QueryParams) -> dict:
+        """Convert the query parameters to the filters of a query."""
         query: dict = {}
         if query_params.priority is not None:
             query["priority"] = query_params.priority.value
@@ -126,35 +460,436 @@ class TaskRepository(BaseRepository):
             query["title"] = query_params.title
         if query_params.description is not None:
             query["description"] = query_params.description
-        return self._get(query=query, limit=limit, offset=offset)
+        if query_params.due_after is not None:
+            query["due_after"] = query_params.due_after.isoformat()
+        if query_params.due_before is not None:
+            query["due_before"] = query_params.due_before.isoformat()
+        return query
 
-    def update(self, id: int, update_task_request: UpdateTaskRequest) -> None:
-        """Update an existing task."""
-        update_task_request_dict = update_task_request.model_dump(
-            exclude_unset=True
+    def query(
+        self,
+        query_params: QueryParams,
+        limit: int | None = None,
+        offset: int | None = None,
+        order_by_relevance: bool = False,
+        fields: Sequence[str] | None = None,
+    ) -> list[Task]:
+        """Retrieve tasks matching the query parameters.
+
+        With ``order_by_relevance`` the tasks matching the title and
+        description filters are ranked by relevance instead of by id. With
+        ``fields`` the tasks only hold these fields.
+        """
+        return self._get(
+            query=self._to_query(query_params),
+            limit=limit,
+            offset=offset,
+            order_by_relevance=order_by_relevance,
+            fields=fields,
         )
-        if not update_task_request_dict:
-            return
 
+    def query_after(
+        self,
+        query_params: QueryParams,
+        limit: int,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> list[Task]:
+        """Retrieve the tasks following ``after_id`` in id order."""
+        with self._get_connection() as conn:
+            return self._select(
+                conn,
+                self._to_query(query_params),
+                limit,
+                after_id=after_id,
+                fields=fields,
+            )
+
+    def count(self, query_params: QueryParams) -> int:
+        """Count the tasks matching the query parameters."""
+        with self._get_connection() as conn:
+            return self._count(conn, self._to_query(query_params))
+
+    def task_version(self, id: int) -> int | None:
+        """Return the version of a task, None when it does not exist."""
+        with self._get_connection() as conn:
+            row = conn.execute(
+                "SELECT version FROM tasks WHERE id = ?", (id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def data_version(self) -> str:
+        """Return a token which changes with every write to the tasks.
+
+        It is made of the epoch of the database and the number of changes
+        counted by the triggers, so it never repeats across databases.
+        """
         with self._get_connection() as conn:
-            fields = []
-            values = []
+            epoch, counter = conn.execute(
+                "SELECT epoch, counter FROM task_changes"
+            ).fetchone()
+        return f"{epoch}.{counter}"
 
-            for key, value in update_task_request_dict.items():
-                fields.append(f"{key} = ?")
-                if key == "priority":
-                    values.append(value.value)
-                elif key == "due_date":
-                    values.append(value.isoformat())
-                else:
-                    values.append(value)
+    def stats(self, now: datetime) -> list[TaskGroupStats]:
+        """Count the tasks per priority and completion state.
 
-            sql_query = f"UPDATE tasks SET {', '.join(fields)} WHERE id = ?"  # noqa: S608
-            values.append(id)
+        The counts are read from the ``task_stats`` table kept exact by
+        triggers, and the open tasks due before ``now`` are counted on the
+        due date index, so no task is scanned besides the overdue ones.
+        """
+        with self._read_transaction() as conn:
+            counts = conn.execute(
+                "SELECT priority, completed, count FROM task_stats "
+                "WHERE count > 0 ORDER BY priority, completed"
+            ).fetchall()
+            overdue = dict(
+                conn.execute(
+                    "SELECT priority, COUNT(*) FROM tasks "
+                    "WHERE completed = 0 "
+                    "AND julianday(due_date) < julianday(?) "
+                    "GROUP BY priority",
+                    (now.isoformat(),),
+                ).fetchall()
+            )
+        return [
+            TaskGroupStats(
+                priority=Priority(priority),
+                completed=bool(completed),
+                count=count,
+                overdue=0 if completed else overdue.get(priority, 0),
+            )
+            for priority, completed, count in counts
+        ]
+
+    def query_page(
+        self,
+        query_params: QueryParams,
+        limit: int,
+        offset: int = 0,
+        order_by_relevance: bool = False,
+        sort: Sequence[SortKey] = (),
+        fields: Sequence[str] | None = None,
+    ) -> tuple[list[Task], int]:
+        """Retrieve a page of tasks and the total number of matches.
+
+        Both run in the same read transaction, so the total is consistent
+        with the page. The count is skipped when the page itself shows
+        that it is the last one. The tasks are ordered by ``sort``, by
+        relevance or else by id.
+        """
+        query = self._to_query(query_params)
+        with self._read_transaction() as conn:
+            tasks = self._select(
+                conn,
+                query,
+                limit,
+                offset,
+                order_by_relevance,
+                sort=sort,
+                fields=fields,
+            )
+            if len(tasks) < limit and (tasks or not offset):
+                return tasks, offset + len(tasks)
+            return tasks, self._count(conn, query)
+
+    def query_page_json(
+        self,
+        query_params: QueryParams,
+        limit: int,
+        offset: int = 0,
+        order_by_relevance: bool = False,
+        sort: Sequence[SortKey] = (),
+        fields: Sequence[str] | None = None,
+    ) -> tuple[str, int]:
+        """Retrieve a page of tasks as a JSON array and the total matches.
+
+        The array is assembled by SQLite, in the JSON the API returns for
+        the tasks, so the rows never become Python objects. Like
+        ``query_page`` the page and the total are read in the same
+        transaction.
+        """
+        fields = fields or tuple(JSON_FIELDS)
+        _check_fields(fields, JSON_FIELDS)
+        query = self._to_query(query_params)
+        select, values = self._select_sql(
+            [f"tasks.{field}" for field in fields],
+            query,
+            limit,
+            offset,
+            order_by_relevance,
+            sort=sort,
+        )
+        # SQLite aggregates the rows in the order the subquery yields them.
+        sql_query = (
+            "SELECT json_group_array(json_object("  # noqa: S608
+            + ", ".join(f"'{field}', {JSON_FIELDS[field]}" for field in fields)
+            + f")), COUNT(*) FROM ({select}) AS page"
+        )
+        with self._read_transaction() as conn:
+            tasks, count = conn.execute(sql_query, values).fetchone()
+            if count < limit and (count or not offset):
+                return tasks, offset + count
+            return tasks, self._count(conn, query)
 
-            conn.execute(sql_query, values)
+    def _select_columns(
+        self,
+        conn: sqlite3.Connection,
+        fields: Sequence[str] | None,
+        query: dict,
+        limit: int,
+        offset: int | None = None,
+        order_by_relevance: bool = False,
+        after_id: int | None = None,
+        sort: Sequence[SortKey] = (),
+    ) -> dict[str, list[Any]]:
+        """Select the matching tasks transposed into columns."""
+        fields = fields or tuple(COLUMN_ENCODINGS)
+        _check_fields(fields, COLUMN_ENCODINGS)
+        sql_query, values = self._select_sql(
+            [COLUMN_ENCODINGS[field] for field in fields],
+            query,
+            limit,
+            offset,
+            order_by_relevance,
+            after_id,
+            sort,
+        )
+        rows = conn.execute(sql_query, values).fetchall()
+        columns = zip(*rows) if rows else [()] * len(fields)
+        return {
+            field: list(column)
+            for field, column in zip(fields, columns, strict=True)
+        }
+
+    def query_page_columns(
+        self,
+        query_params: QueryParams,
+        limit: int,
+        offset: int = 0,
+        order_by_relevance: bool = False,
+        sort: Sequence[SortKey] = (),
+        fields: Sequence[str] | None = None,
+    ) -> tuple[dict[str, list[Any]], int]:
+        """Retrieve a page of tasks column by column and the total matches.
+
+        The rows are transposed as they come from the cursor, with the
+        compact encodings of ``COLUMN_ENCODINGS``, so no task is built.
+        Like ``query_page`` the page and the total are read in the same
+        transaction.
+        """
+        query = self._to_query(query_params)
+        with self._read_transaction() as conn:
+            columns = self._select_columns(
+                conn,
+                fields,
+                query,
+                limit,
+                offset,
+                order_by_relevance,
+                sort=sort,
+            )
+            count = len(columns["id"])
+            if count < limit and (count or not offset):
+                return columns, offset + count
+            return columns, self._count(conn, query)
 
-    def delete(self, id: int) -> None:
-        """Delete a task by id."""
+    def query_after_columns(
+        self,
+        query_params: QueryParams,
+        limit: int,
+        after_id: int | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> dict[str, list[Any]]:
+        """Retrieve the tasks following ``after_id`` column by column."""
         with self._get_connection() as conn:
-            conn.execute("DELETE FROM tasks WHERE id = ?", (id,))
+            return self._select_columns(
+                conn,
+                fields,
+                self._to_query(query_params),
+                limit,
+                after_id=after_id,
+            )
+
+    @staticmethod
+    def _assignments(
+        update_task_request: UpdateTaskRequest,
+    ) -> tuple[str, list[Any]]:
+        """Build the SET clause of an update and its values.
+
+        Every update that changes a field increments the version of the row.
+        """
+        update_task_request_dict = update_task_request.model_dump(
+            exclude_unset=True
+        )
+        fields = []
+        values = []
+
+        for key, value in update_task_request_dict.items():
+            fields.append(f"{key} = ?")
+            if key == "priority":
+                values.append(value.value)
+            elif key == "due_date":
+                values.append(value.isoformat())
+            else:
+                values.append(value)
+        if fields:
+            fields.append("version = version + 1")
+
+        return ", ".join(fields), values
+
+    def _returning(
+        self, conn: sqlite3.Connection, sql_query: str, values: list[Any]
+    ) -> Task | None:
+        """Run a statement returning the task it changed, if any."""
+        cursor = conn.cursor()
+        cursor.row_factory = self._row_factory
+        cursor.execute(
+            f"{sql_query} RETURNING {', '.join(TASK_FIELDS)}", values
+        )
+        # The statement only completes once all its rows are fetched.
+        tasks = cursor.fetchall()
+        return tasks[0] if tasks else None
+
+    def iterate(
+        self, query_params: QueryParams, batch_size: int
+    ) -> Generator[list[Task], None, None]:
+        """Stream the tasks matching the query parameters in batches.
+
+        Every batch is the keyset page following the last task of the
+        previous one, in id order, read with its own short checkout. A slow
+        consumer thus holds neither a pooled connection nor a snapshot
+        between batches, and only one batch is held in memory at a time.
+        The batches come from different snapshots, tasks written during the
+        export are included when their id was not passed yet.
+        """
+        query = self._to_query(query_params)
+        after_id = None
+        while True:
+            with self._get_connection() as conn:
+                batch = self._select(
+                    conn, query, batch_size, after_id=after_id
+                )
+            if batch:
+                yield batch
+            if len(batch) < batch_size:
+                return
+            after_id = batch[-1].id
+
+    def _update(
+        self,
+        conn: sqlite3.Connection,
+        id: int,
+        update_task_request: UpdateTaskRequest,
+    ) -> Task | None:
+        """Update a task on the writer connection.
+
+        :returns: The updated task, None when it does not exist.
+        """
+        if not update_task_request.model_fields_set:
+            tasks = self._select(conn, {"id": id})
+            return tasks[0] if tasks else None
+        assignments, values = self._assignments(update_task_request)
+        sql_query = f"UPDATE tasks SET {assignments} WHERE id = ?"  # noqa: S608
+        values.append(id)
+
+        return self._returning(conn, sql_query, values)
+
+    def _update_where(
+        self,
+        conn: sqlite3.Connection,
+        query: dict,
+        update_task_request: UpdateTaskRequest,
+    ) -> int:
+        """Update the tasks matching the query on the writer connection."""
+        assignments, values = self._assignments(update_task_request)
+        clauses, filter_values, _ = self._filter(query)
+        sql_query = (
+            f"UPDATE tasks SET {assignments} "  # noqa: S608
+            f"WHERE id IN (SELECT tasks.id {clauses})"
+        )
+        return conn.execute(sql_query, values + filter_values).rowcount
+
+    def submit_update(
+        self, id: int, update_task_request: UpdateTaskRequest
+    ) -> Future[Task | None]:
+        """Queue an update of a task on the writer."""
+        return self._submit_write(
+            partial(
+                self._update, id=id, update_task_request=update_task_request
+            )
+        )
+
+    def update(
+        self, id: int, update_task_request: UpdateTaskRequest
+    ) -> Task | None:
+        """Update an existing task.
+
+        The existence check, the update and the read back happen in a
+        single statement.
+
+        :returns: The updated task, None when it does not exist.
+        """
+        return self.submit_update(id, update_task_request).result()
+
+    def submit_update_where(
+        self, query_params: QueryParams, update_task_request: UpdateTaskRequest
+    ) -> Future[int]:
+        """Queue an update of the tasks matching the query parameters."""
+        if not update_task_request.model_fields_set:
+            future: Future[int] = Future()
+            future.set_result(0)
+            return future
+        return self._submit_write(
+            partial(
+                self._update_where,
+                query=self._to_query(query_params),
+                update_task_request=update_task_request,
+            )
+        )
+
+    def update_where(
+        self, query_params: QueryParams, update_task_request: UpdateTaskRequest
+    ) -> int:
+        """Update all the tasks matching the query parameters at once.
+
+        :returns: The number of rows updated.
+        """
+        return self.submit_update_where(
+            query_params, update_task_request
+        ).result()
+
+    def _delete(self, conn: sqlite3.Connection, id: int) -> Task | None:
+        """Delete a task on the writer connection."""
+        return self._returning(conn, "DELETE FROM tasks WHERE id = ?", [id])
+
+    def submit_delete(self, id: int) -> Future[Task | None]:
+        """Queue the deletion of a task on the writer."""
+        return self._submit_write(partial(self._delete, id=id))
+
+    def delete(self, id: int) -> Task | None:
+        """Delete a task by id.
+
+        :returns: The deleted task, None when it does not exist.
+        """
+        return self.submit_delete(id).result()
+
+    def _delete_where(self, conn: sqlite3.Connection, query: dict) -> int:
+        """Delete the tasks matching the query on the writer connection."""
+        clauses, values, _ = self._filter(query)
+        sql_query = (
+            f"DELETE FROM tasks WHERE id IN (SELECT tasks.id {clauses})"  # noqa: S608
+        )
+        return conn.execute(sql_query, values).rowcount
+
+    def submit_delete_where(self, query_params: QueryParams) -> Future[int]:
+        """Queue the deletion of the tasks matching the query parameters."""
+        return self._submit_write(
+            partial(self._delete_where, query=self._to_query(query_params))
+        )
+
+    def delete_where(self, query_params: QueryParams) -> int:
+        """Delete all the tasks matching the query parameters at once.
+
+        :returns: The number of rows deleted.
+        """
+        return self.submit_delete_where(query_params).result()
@@ -0,0 +1,221 @@
+"""Single database writer with group commit."""
+
+import queue
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any, NamedTuple, TypeVar
+
+from pydantic import BaseModel
+
+from app.persistence.config import DatabaseConfig
+from app.persistence.exception import WriterClosedError
+from app.persistence.pool import connect
+
+
+R = TypeVar("R")
+
+WriteOperation = Callable[[sqlite3.Connection], R]
+"""A mutation run by the writer on its connection."""
+
+
+class _WriteRequest(NamedTuple):
+    """A queued write operation and the future of its result."""
+
+    operation: WriteOperation[Any]
+    future: Future[Any]
+
+
+class WriterStats(BaseModel):
+    """Statistics of a batch writer."""
+
+    batches: int
+    """Number of transactions committed."""
+
+    operations: int
+    """Number of write operations committed."""
+
+    retries: int
+    """Number of batches retried because the database was locked."""
+
+
+def _is_locked(exc: Exception) -> bool:
+    """Check whether the error is caused by a locked database."""
+    message = str(exc)
+    return isinstance(exc, sqlite3.OperationalError) and (
+        "database is locked" in message or "database is busy" in message
+    )
+
+
+class BatchWriter:
+    """Funnel all the mutations to a single thread that group-commits them.
+
+    SQLite only allows one writer at a time, so instead of every caller
+    fighting for the lock and paying one fsync per write, the operations
+    are queued and the writer thread runs whatever is queued, bounded by
+    ``write_batch_size`` and ``write_batch_window``, in a single
+    transaction. Every operation runs in its own savepoint, so a failing
+    operation only fails its own future. Batches hitting a locked database
+    are retried with exponential backoff.
+    """
+
+    def __init__(self, config: DatabaseConfig) -> None:
+        """Initialize the writer and start its thread."""
+        self._config = config
+        self._queue: queue.SimpleQueue[_WriteRequest | None] = (
+            queue.SimpleQueue()
+        )
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stopping = False
+        self._batches = 0
+        self._operations = 0
+        self._retries = 0
+        self._conn = connect(config)
+        self._conn.isolation_level = None
+        self._thread = threading.Thread(
+            target=self._run, name="db-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, operation: WriteOperation[R]) -> Future[R]:
+        """Queue a write operation.
+
+        :returns: A future resolved with the result of the operation once
+            its transaction is committed.
+        """
+        future: Future[R] = Future()
+        with self._lock:
+            if self._closed:
+                raise WriterClosedError()
+            self._queue.put(_WriteRequest(operation, future))
+        return future
+
+    def stats(self) -> WriterStats:
+        """Return a snapshot of the writer statistics."""
+        return WriterStats(
+            batches=self._batches,
+            operations=self._operations,
+            retries=self._retries,
+        )
+
+    def close(self) -> None:
+        """Commit the queued operations and stop the writer thread."""
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Commit batches until the writer is closed.
+
+        Should the thread die on an unexpected error, the futures of its
+        batch and of the queued operations fail and the writer is closed,
+        so no caller waits forever for a write.
+        """
+        batch: list[_WriteRequest] = []
+        try:
+            while not self._stopping:
+                first = self._queue.get()
+                if first is None:
+                    break
+                batch = self._collect(first)
+                if batch:
+                    self._commit(batch)
+        except BaseException as exc:
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(exc)
+            raise
+        finally:
+            with self._lock:
+                self._closed = True
+            self._fail_queued()
+            self._conn.close()
+
+    def _fail_queued(self) -> None:
+        """Fail the operations left in the queue of a closed writer."""
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if request is not None and (
+                request.future.set_running_or_notify_cancel()
+            ):
+                request.future.set_exception(WriterClosedError())
+
+    def _collect(self, first: _WriteRequest) -> list[_WriteRequest]:
+        """Gather the queued operations joining the batch of ``first``."""
+        requests = [first]
+        deadline = time.monotonic() + self._config.write_batch_window
+        while len(requests) < self._config.write_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                request = (
+                    self._queue.get(timeout=remaining)
+                    if remaining > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+            if request is None:
+                self._stopping = True
+                break
+            requests.append(request)
+        return [
+            request
+            for request in requests
+            if request.future.set_running_or_notify_cancel()
+        ]
+
+    def _commit(self, batch: list[_WriteRequest]) -> None:
+        """Run the batch in one transaction and resolve the futures."""
+        delay = self._config.write_retry_delay
+        for attempt in range(self._config.write_retries + 1):
+            try:
+                outcomes = self._execute(batch)
+            except Exception as exc:
+                if self._conn.in_transaction:
+                    self._conn.rollback()
+                if (
+                    not _is_locked(exc)
+                    or attempt == self._config.write_retries
+                ):
+                    for request in batch:
+                        request.future.set_exception(exc)
+                    return
+                self._retries += 1
+                time.sleep(delay)
+                delay *= 2
+            else:
+                self._batches += 1
+                self._operations += len(batch)
+                for request, (result, error) in zip(batch, outcomes):
+                    if error is None:
+                        request.future.set_result(result)
+                    else:
+                        request.future.set_exception(error)
+                return
+
+    def _execute(
+        self, batch: list[_WriteRequest]
+    ) -> list[tuple[Any, Exception | None]]:
+        """Execute the operations of a batch in a single transaction."""
+        outcomes: list[tuple[Any, Exception | None]] = []
+        self._conn.execute("BEGIN IMMEDIATE")
+        for request in batch:
+            self._conn.execute("SAVEPOINT operation")
+            try:
+                outcomes.append((request.operation(self._conn), None))
+            except Exception as exc:
+                if _is_locked(exc):
+                    raise
+                self._conn.execute("ROLLBACK TO operation")
+                outcomes.append((None, exc))
+            self._conn.execute("RELEASE operation")
+        self._conn.execute("COMMIT")
+        return outcomes
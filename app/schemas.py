@@ -2,9 +2,9 @@
 
 from datetime import datetime
 from enum import Enum
-from typing import Any
+from typing import Any, Self
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, field_validator, model_validator
 
 
 class Priority(Enum):
@@ -35,15 +35,70 @@ class Task(BaseModel):
     completed: bool
 
 
-class TaskQueryParams(BaseModel):
-    """Query parameters for retrieving tasks."""
+class TaskFieldsParams(BaseModel):
+    """Query parameters selecting the fields of the tasks returned."""
+
+    fields: str | None = None
+    """Comma-separated fields to return, the id is always returned."""
+
+    @field_validator("fields")
+    @classmethod
+    def validate_fields(cls, v: str | None) -> str | None:
+        """Check the fields against the task schema and normalise them."""
+        if v is None or not v.strip():
+            return None
+        requested = {field.strip() for field in v.split(",")}
+        unknown = requested - Task.model_fields.keys()
+        if unknown:
+            raise ValueError(
+                f"Unknown task fields: {', '.join(sorted(unknown))}."
+            )
+        return ",".join(
+            field
+            for field in Task.model_fields
+            if field == "id" or field in requested
+        )
+
+    def field_names(self) -> tuple[str, ...] | None:
+        """Return the fields to return, None for all of them."""
+        if self.fields is None:
+            return None
+        return tuple(self.fields.split(","))
+
+
+class TaskCounts(BaseModel):
+    """Numbers of tasks."""
+
+    total: int
+    completed: int
+    overdue: int
+    """Number of open tasks past their due date."""
+
+
+class PriorityCounts(TaskCounts):
+    """Numbers of tasks of a priority."""
+
+    priority: Priority
+
+
+class TaskStats(TaskCounts):
+    """Numbers of tasks, overall and per priority."""
+
+    priorities: list[PriorityCounts]
+
+
+class TaskFilterParams(BaseModel):
+    """Query parameters selecting tasks."""
 
     priority: Priority | None = None
     completed: bool | None = None
     title: str | None = None
     description: str | None = None
-    page_size: int = 15
-    page_number: int = 1
+    due_after: datetime | None = None
+    """Only the tasks due at or after this time."""
+
+    due_before: datetime | None = None
+    """Only the tasks due before this time."""
 
     @field_validator("priority", mode="before")
     @classmethod
@@ -57,6 +112,91 @@ class TaskQueryParams(BaseModel):
             raise ValueError("Priority must be an integer.")
 
 
+class TaskChangeParams(TaskFilterParams):
+    """Query parameters for changing the tasks matching filters."""
+
+    dry_run: bool = False
+    """Only count the matching tasks, leaving them untouched."""
+
+
+class FileFormat(Enum):
+    """Formats the tasks can be exported to and imported from."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class TaskExportParams(TaskFilterParams):
+    """Query parameters for exporting tasks."""
+
+    format: FileFormat = FileFormat.NDJSON
+    """Format of the exported file."""
+
+
+class SortField(Enum):
+    """Fields the tasks can be sorted by."""
+
+    ID = "id"
+    TITLE = "title"
+    PRIORITY = "priority"
+    DUE_DATE = "due_date"
+    COMPLETED = "completed"
+
+
+class TaskQueryParams(TaskFieldsParams, TaskFilterParams):
+    """Query parameters for retrieving tasks."""
+
+    order_by_relevance: bool = False
+    sort: str | None = None
+    """Comma-separated fields to sort by, ``-`` prefixed for descending."""
+
+    page_size: int = 15
+    page_number: int = 1
+    cursor: str | None = None
+    """Switches to keyset pagination, empty for the first page."""
+
+    @field_validator("sort")
+    @classmethod
+    def validate_sort(cls, v: str | None) -> str | None:
+        """Check the sort fields and normalise their spelling."""
+        if v is None or not v.strip():
+            return None
+        terms = [term.strip() for term in v.split(",")]
+        fields = [term.removeprefix("-") for term in terms]
+        allowed = {field.value for field in SortField}
+        for field in fields:
+            if field not in allowed:
+                raise ValueError(
+                    f"Cannot sort by {field!r}, the tasks can be sorted by "
+                    f"{', '.join(sorted(allowed))}."
+                )
+        if len(set(fields)) != len(fields):
+            raise ValueError("Cannot sort by the same field twice.")
+        return ",".join(terms)
+
+    @model_validator(mode="after")
+    def validate_cursor(self) -> Self:
+        """Reject the orderings keyset pagination does not support."""
+        if self.cursor is not None and self.order_by_relevance:
+            raise ValueError(
+                "order_by_relevance is not supported with a cursor."
+            )
+        if self.cursor is not None and self.sort is not None:
+            raise ValueError("sort is not supported with a cursor.")
+        if self.order_by_relevance and self.sort is not None:
+            raise ValueError("order_by_relevance and sort cannot be combined.")
+        return self
+
+    def sort_keys(self) -> list[tuple[SortField, bool]]:
+        """Return the sort fields and whether each one is descending."""
+        if self.sort is None:
+            return []
+        return [
+            (SortField(term.removeprefix("-")), term.startswith("-"))
+            for term in self.sort.split(",")
+        ]
+
+
 class UpdateTaskRequest(BaseModel):
     """Request schema for updating a task."""
 
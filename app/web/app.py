@@ -1,13 +1,43 @@
 """Module with functions for initialising the web application."""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import TypedDict
 
 from fastapi import FastAPI
 
+from app.controllers.task import TaskController
+from app.persistence.async_task_repository import AsyncTaskRepository
+from app.persistence.task_repository import TaskRepository
+from app.web.compression import GZipMiddleware
 from app.web.config import WebConfig
+from app.web.resources.cursor import CursorCodec
 from app.web.urls import all_routers
 
 
+@asynccontextmanager
+async def lifespan(fastapp: FastAPI) -> AsyncIterator[None]:
+    """Manage the application-lifetime services.
+
+    Builds the repository and controller once on startup, shares them via
+    ``app.state`` and closes the database connections on shutdown.
+    """
+    config: WebConfig = fastapp.state.config
+    task_repository = TaskRepository(config.database)
+    async_task_repository = AsyncTaskRepository(
+        task_repository, max_workers=config.database.executor_threads
+    )
+    fastapp.state.task_repository = task_repository
+    fastapp.state.task_controller = TaskController(
+        async_task_repository, config.cache
+    )
+    fastapp.state.cursor_codec = CursorCodec(config.pagination.cursor_secret)
+    try:
+        yield
+    finally:
+        async_task_repository.close()
+
+
 def create_app(config: WebConfig) -> FastAPI:
     """Application factory.
 
@@ -27,8 +57,11 @@ def create_app(config: WebConfig) -> FastAPI:
 
     app_config: Arguments = {"title": "Task API Server", "version": "0.1.0"}
 
-    fastapp = FastAPI(**app_config)
+    fastapp = FastAPI(**app_config, lifespan=lifespan)
+    fastapp.state.config = config
     configure_apis(fastapp)
+    if config.compression.enabled:
+        fastapp.add_middleware(GZipMiddleware, config=config.compression)
 
     return fastapp
 
@@ -0,0 +1,136 @@
+"""Compression of the responses."""
+
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.web.config import CompressionConfig
+from app.web.negotiation import header_qualities
+from app.web.resources.etag import encoded_etag
+
+
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+"""Window bits making zlib write the gzip format."""
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """Check whether an ``Accept-Encoding`` header accepts gzip.
+
+    The codings are weighed by their quality, a quality of 0 refuses
+    gzip even when ``*`` accepts any coding.
+    """
+    if accept_encoding is None:
+        return False
+    qualities = header_qualities(accept_encoding)
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+class GZipMiddleware:
+    """Compress the responses with gzip for the clients accepting it.
+
+    The responses which are already encoded, of an excluded media type or
+    whose whole body is smaller than ``minimum_size`` are sent as they are.
+    The streamed responses are compressed chunk by chunk, each chunk being
+    flushed so it reaches the client without waiting for the next one.
+    """
+
+    def __init__(self, app: ASGIApp, config: CompressionConfig) -> None:
+        """Initialize the middleware with the compression config."""
+        self.app = app
+        self.config = config
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        """Handle a request, compressing the response when accepted."""
+        if scope["type"] != "http" or not accepts_gzip(
+            Headers(scope=scope).get("accept-encoding")
+        ):
+            await self.app(scope, receive, send)
+            return
+        await _GZipResponder(self.app, self.config, send)(scope, receive)
+
+
+class _GZipResponder:
+    """Compress the response to a single request."""
+
+    def __init__(
+        self, app: ASGIApp, config: CompressionConfig, send: Send
+    ) -> None:
+        """Initialize the responder with the channel to the client."""
+        self.app = app
+        self.config = config
+        self.send = send
+        self.start: Message | None = None
+        self.compressor: zlib._Compress | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive) -> None:
+        """Run the application, compressing what it sends."""
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        """Compress the body messages, holding the start of the response.
+
+        The headers depend on whether the body is compressed, so the start
+        is only sent along with the first part of the body.
+        """
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send_start()
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None and self._compressible(
+            self.start, body, more_body
+        ):
+            self.compressor = zlib.compressobj(
+                self.config.level, zlib.DEFLATED, GZIP_WBITS
+            )
+        if self.compressor is not None:
+            body = self.compressor.compress(body) + self.compressor.flush(
+                zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH
+            )
+            message = {**message, "body": body}
+        if self.start is not None:
+            if self.compressor is not None:
+                self._set_encoding(self.start, body, more_body)
+            await self._send_start()
+        await self.send(message)
+
+    def _compressible(
+        self, start: Message, body: bytes, more_body: bool
+    ) -> bool:
+        """Check whether the response is worth compressing."""
+        headers = Headers(raw=start["headers"])
+        if "content-encoding" in headers:
+            return False
+        if headers.get("content-type", "").startswith(
+            self.config.excluded_media_types
+        ):
+            return False
+        return more_body or len(body) >= self.config.minimum_size
+
+    @staticmethod
+    def _set_encoding(start: Message, body: bytes, more_body: bool) -> None:
+        """Declare the gzip encoding in the headers of the response."""
+        headers = MutableHeaders(raw=start["headers"])
+        headers["Content-Encoding"] = "gzip"
+        if "etag" in headers:
+            headers["ETag"] = encoded_etag(headers["etag"], "gzip")
+        if "accept-encoding" not in headers.get("vary", "").lower():
+            headers.add_vary_header("Accept-Encoding")
+        if more_body:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(body))
+
+    async def _send_start(self) -> None:
+        """Send the start of the response, if it is still held."""
+        if self.start is not None:
+            start, self.start = self.start, None
+            await self.send(start)
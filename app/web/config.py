@@ -1,9 +1,13 @@
 """Web application configuration utilities."""
 
-from pydantic import BaseModel
+import secrets
+
+from pydantic import BaseModel, Field
 from pydantic_settings import SettingsConfigDict
 
 from app.config import BaseConfig
+from app.controllers.config import CacheConfig
+from app.persistence.config import DatabaseConfig
 
 
 class BaseWebConfig(BaseConfig):
@@ -22,10 +26,60 @@ class ServerConfig(BaseModel):
     """Port to run the server on."""
 
 
-class DatabaseConfig(BaseModel):
-    """Configuration for database."""
+class PaginationConfig(BaseModel):
+    """Configuration for pagination."""
+
+    cursor_secret: str = Field(
+        default_factory=lambda: secrets.token_urlsafe(32), repr=False
+    )
+    """Secret signing the pagination cursors.
+
+    Defaults to a random value per process, set it when running several
+    workers so the cursors are accepted by all of them.
+    """
+
+
+class TasksConfig(BaseModel):
+    """Configuration for the tasks API."""
+
+    max_bulk_size: int = 1000
+    """Maximum number of tasks created by a single bulk request."""
+
+    export_batch_size: int = 500
+    """Number of tasks read from the database at once by an export."""
+
+    import_chunk_size: int = 1000
+    """Number of imported tasks inserted in a single transaction."""
+
+    import_max_errors: int = 100
+    """Maximum number of rejected lines reported by an import."""
+
+    sqlite_json: bool = False
+    """Let SQLite encode the numbered pages of tasks as JSON.
 
-    db_name: str = "tasks.db"
+    The JSON is the same, the rows are not turned into Python objects.
+    """
+
+
+class CompressionConfig(BaseModel):
+    """Configuration for the compression of the responses."""
+
+    enabled: bool = True
+    """Compress the responses with gzip for the clients accepting it."""
+
+    minimum_size: int = 1000
+    """Smallest body in bytes worth compressing, streams are compressed."""
+
+    level: int = Field(default=6, ge=0, le=9)
+    """The gzip compression level, from 0 (none) to 9 (smallest)."""
+
+    excluded_media_types: tuple[str, ...] = (
+        "text/event-stream",
+        "application/gzip",
+        "application/zip",
+        "image/",
+    )
+    """Prefixes of the media types sent uncompressed."""
 
 
 class WebConfig(BaseWebConfig):
@@ -36,3 +90,15 @@ class WebConfig(BaseWebConfig):
 
     database: DatabaseConfig = DatabaseConfig()
     """Configuration for database."""
+
+    pagination: PaginationConfig = PaginationConfig()
+    """Configuration for pagination."""
+
+    tasks: TasksConfig = TasksConfig()
+    """Configuration for the tasks API."""
+
+    cache: CacheConfig = CacheConfig()
+    """Configuration for the in-process caches."""
+
+    compression: CompressionConfig = CompressionConfig()
+    """Configuration for the compression of the responses."""
@@ -0,0 +1,22 @@
+"""Content negotiation from the request headers."""
+
+
+def header_qualities(header: str) -> dict[str, float]:
+    """Map the items of a header such as ``Accept`` to their quality.
+
+    The items are lower-cased and weighed by their ``q`` parameter, 1 when
+    it is absent and 0 when it is not a number.
+    """
+    qualities = {}
+    for item in header.split(","):
+        name, *parameters = item.split(";")
+        quality = 1.0
+        for parameter in parameters:
+            key, _, value = parameter.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name.strip().lower()] = quality
+    return qualities
@@ -0,0 +1,52 @@
+"""Opaque, signed cursors for keyset pagination."""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+from typing import Any
+
+
+class InvalidCursorError(Exception):
+    """Exception raised when a cursor is malformed or tampered with."""
+
+    def __init__(self) -> None:
+        """Initialize the exception."""
+        super().__init__("Invalid cursor.")
+
+
+class CursorCodec:
+    """Encode the last seen sort key into a signed, URL-safe token."""
+
+    _SIGNATURE_SIZE = 16
+
+    def __init__(self, secret: str) -> None:
+        """Initialize with the secret signing the cursors."""
+        self._secret = secret.encode()
+
+    def _sign(self, payload: bytes) -> bytes:
+        """Compute the signature of a payload."""
+        digest = hmac.new(self._secret, payload, hashlib.sha256).digest()
+        return digest[: self._SIGNATURE_SIZE]
+
+    def encode(self, key: list[Any]) -> str:
+        """Encode a sort key into a cursor."""
+        payload = json.dumps(key, separators=(",", ":")).encode()
+        token = base64.urlsafe_b64encode(payload + self._sign(payload))
+        return token.rstrip(b"=").decode()
+
+    def decode(self, cursor: str) -> list[Any]:
+        """Decode a cursor into the sort key it was encoded from."""
+        try:
+            token = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        except (binascii.Error, ValueError):
+            raise InvalidCursorError()
+        payload = token[: -self._SIGNATURE_SIZE]
+        signature = token[-self._SIGNATURE_SIZE :]
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            raise InvalidCursorError()
+        key = json.loads(payload)
+        if not isinstance(key, list):
+            raise InvalidCursorError()
+        return key
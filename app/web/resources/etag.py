@@ -0,0 +1,48 @@
+"""Entity tags for conditional requests."""
+
+import hashlib
+
+
+def make_etag(*parts: object, weak: bool = False) -> str:
+    """Build an entity tag from the parts identifying a representation."""
+    tag = '"' + ".".join(str(part) for part in parts) + '"'
+    return f"W/{tag}" if weak else tag
+
+
+def encoded_etag(etag: str, coding: str) -> str:
+    """Derive the entity tag of a representation sent with a content coding.
+
+    A strong tag must tell the encodings of a representation apart, so the
+    coding is appended to it. A weak tag already covers them and is kept.
+    """
+    if etag.startswith("W/"):
+        return etag
+    return f'{etag[:-1]}-{coding}"'
+
+
+def _opaque(etag: str) -> str:
+    """Strip an entity tag of its weakness and gzip coding."""
+    opaque = etag.strip().removeprefix("W/")
+    if opaque.endswith('-gzip"'):
+        return opaque.removesuffix('-gzip"') + '"'
+    return opaque
+
+
+def digest(value: str) -> str:
+    """Hash a value into a short, entity tag safe string."""
+    return hashlib.blake2b(value.encode(), digest_size=8).hexdigest()
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check whether an ``If-None-Match`` header lists the entity tag.
+
+    The tags are compared weakly, as ``If-None-Match`` requires, so the
+    ``W/`` prefix is ignored on both sides, as is the coding appended to
+    the tags of the gzip encoded responses.
+    """
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = _opaque(etag)
+    return any(_opaque(tag) == opaque for tag in if_none_match.split(","))
@@ -68,3 +68,30 @@ class PaginationBuilder:
             next_page_url=next_page_url,
             previous_page_url=previous_page_url,
         )
+
+    @staticmethod
+    def create_from_cursor(
+        page_size: int,
+        next_cursor: str | None,
+        url: str,
+    ) -> Pagination:
+        """Build keyset pagination metadata.
+
+        The totals are not computed in keyset pagination, counting the
+        matches would scan what the cursor lets the query skip.
+        """
+        next_page_url = None
+        if next_cursor:
+            next_page_url = PaginationBuilder.update_url_param(
+                url, "cursor", next_cursor
+            )
+            next_page_url = PaginationBuilder.update_url_param(
+                next_page_url, "page_size", page_size
+            )
+
+        return Pagination(
+            count=None,
+            total_pages=None,
+            next_page_url=next_page_url,
+            next_cursor=next_cursor,
+        )
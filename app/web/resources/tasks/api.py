@@ -1,81 +1,486 @@
 """The tasks API."""
 
-from typing import Annotated
+import csv
+from typing import Annotated, Any, TypeVar
 
-from fastapi import Depends, HTTPException, Request
+from fastapi import Body, Depends, Header, HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.params import Query
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
+from pydantic.main import IncEx
 
 from app.controllers.exception import NotFoundError
 from app.controllers.task import TaskController
-from app.dependencies import get_task_controller
+from app.dependencies import (
+    get_compression_config,
+    get_cursor_codec,
+    get_task_controller,
+    get_tasks_config,
+)
 from app.schemas import (
     CreateTaskRequest,
+    FileFormat,
     Task,
+    TaskChangeParams,
+    TaskExportParams,
+    TaskFieldsParams,
+    TaskFilterParams,
     TaskQueryParams,
+    TaskStats,
     UpdateTaskRequest,
 )
+from app.web.config import CompressionConfig, TasksConfig
+from app.web.resources.cursor import CursorCodec, InvalidCursorError
+from app.web.resources.etag import digest, etag_matches, make_etag
 from app.web.resources.pagination import PaginationBuilder
+from app.web.resources.tasks.formats import (
+    COLUMNAR_MEDIA_TYPE,
+    DECODERS,
+    ENCODERS,
+    MEDIA_TYPES,
+    LineTooLongError,
+    accepts_columnar,
+)
 from app.web.resources.tasks.schemas import (
+    AffectedTasksResponse,
+    BulkCreateError,
+    BulkCreateTasksResponse,
+    ColumnarTasks,
+    ColumnarTasksResponse,
     DeleteTaskResponse,
     GetTasksResponse,
+    ImportTasksResponse,
+    Pagination,
+    RejectedLine,
 )
 
 
+T = TypeVar("T")
+
+TASK_ADAPTER = TypeAdapter(Task)
+"""Serialiser of the tasks, compiled once."""
+
+GET_TASKS_RESPONSE_ADAPTER = TypeAdapter(GetTasksResponse)
+"""Serialiser of the pages of tasks, compiled once."""
+
+PAGINATION_ADAPTER = TypeAdapter(Pagination)
+"""Serialiser of the pagination metadata, compiled once."""
+
+COLUMNAR_TASKS_RESPONSE_ADAPTER = TypeAdapter(ColumnarTasksResponse)
+"""Serialiser of the pages of tasks in the columnar format, compiled once."""
+
+
+def _json_response(
+    adapter: TypeAdapter[T],
+    value: T,
+    headers: dict[str, str] | None = None,
+    include: IncEx | None = None,
+    media_type: str = "application/json",
+) -> Response:
+    """Serialise a value straight to JSON bytes in a response.
+
+    FastAPI would validate the value against the response model again and
+    encode it through ``jsonable_encoder``, the value is already valid so
+    it is dumped to bytes by its adapter instead. With ``include`` only
+    these fields are serialised, the sparse representation then does not
+    match the response model at all.
+    """
+    return Response(
+        content=adapter.dump_json(value, include=include),
+        media_type=media_type,
+        headers=headers,
+    )
+
+
 async def create_task(
     create_task_request: CreateTaskRequest,
     task_controller: Annotated[TaskController, Depends(get_task_controller)],
-) -> Task:
+) -> Response:
     """Create a new task."""
-    return task_controller.create(create_task_request)
+    return _json_response(
+        TASK_ADAPTER, await task_controller.create(create_task_request)
+    )
 
 
-async def query(
-    query: Annotated[TaskQueryParams, Query()],
+async def create_tasks(
+    items: Annotated[list[Any], Body()],
     task_controller: Annotated[TaskController, Depends(get_task_controller)],
-    request: Request,
-) -> GetTasksResponse:
-    """Query tasks with query parameters.
+    tasks_config: Annotated[TasksConfig, Depends(get_tasks_config)],
+    allow_partial: bool = False,
+) -> BulkCreateTasksResponse:
+    """Create several tasks in a single transaction.
 
-    It returns a list of tasks and pagination metadata.
+    Every item is validated as a task creation request, whatever its type,
+    so that with ``allow_partial`` even an item which is not an object is
+    only reported. By default an invalid item rejects the whole request,
+    with ``allow_partial`` the valid items are created and the errors of
+    the others are reported.
     """
-    tasks, total = task_controller.get(query)
+    if len(items) > tasks_config.max_bulk_size:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {tasks_config.max_bulk_size} tasks "
+            "can be created at once",
+        )
+
+    create_task_requests: dict[int, CreateTaskRequest] = {}
+    errors = []
+    for index, item in enumerate(items):
+        try:
+            create_task_requests[index] = CreateTaskRequest.model_validate(
+                item
+            )
+        except ValidationError as exc:
+            errors.append(
+                BulkCreateError(
+                    index=index,
+                    errors=exc.errors(
+                        include_url=False, include_context=False
+                    ),
+                )
+            )
+
+    if errors and not allow_partial:
+        raise RequestValidationError(
+            [
+                {**error, "loc": ("body", item_error.index, *error["loc"])}
+                for item_error in errors
+                for error in item_error.errors
+            ]
+        )
+
+    created_ids = iter(
+        await task_controller.create_many(list(create_task_requests.values()))
+    )
+    ids = [
+        next(created_ids) if index in create_task_requests else None
+        for index in range(len(items))
+    ]
+    return BulkCreateTasksResponse(ids=ids, errors=errors)
+
+
+def _decode_after_id(cursor_codec: CursorCodec, cursor: str) -> int | None:
+    """Decode the ID of the last seen task from a cursor."""
+    if not cursor:
+        return None
+    try:
+        key = cursor_codec.decode(cursor)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if len(key) != 1 or type(key[0]) is not int:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return key[0]
 
-    pagination = PaginationBuilder.create(
+
+def _numbered_pagination(
+    query: TaskQueryParams, total: int, request: Request
+) -> Pagination:
+    """Build the pagination metadata of a numbered page."""
+    return PaginationBuilder.create(
         page_size=query.page_size,
         count=total,
         page_number=query.page_number,
         url=str(request.url),
     )
-    return GetTasksResponse(tasks=tasks, pagination=pagination)
+
+
+def _cursor_pagination(
+    query: TaskQueryParams,
+    cursor_codec: CursorCodec,
+    last_id: int | None,
+    request: Request,
+) -> Pagination:
+    """Build the pagination metadata of a page sought by cursor.
+
+    The next cursor points past ``last_id``, None on the last page.
+    """
+    return PaginationBuilder.create_from_cursor(
+        page_size=query.page_size,
+        next_cursor=None
+        if last_id is None
+        else cursor_codec.encode([last_id]),
+        url=str(request.url),
+    )
+
+
+async def _query_columns(
+    query: TaskQueryParams,
+    task_controller: TaskController,
+    cursor_codec: CursorCodec,
+    request: Request,
+    headers: dict[str, str],
+) -> Response:
+    """Query a page of tasks in the columnar format."""
+    if query.cursor is not None:
+        after_id = _decode_after_id(cursor_codec, query.cursor)
+        columns, has_more = await task_controller.get_columns_after(
+            query, after_id
+        )
+        pagination = _cursor_pagination(
+            query,
+            cursor_codec,
+            columns["id"][-1] if has_more else None,
+            request,
+        )
+    else:
+        columns, total = await task_controller.get_columns(query)
+        pagination = _numbered_pagination(query, total, request)
+    return _json_response(
+        COLUMNAR_TASKS_RESPONSE_ADAPTER,
+        ColumnarTasksResponse.model_construct(
+            tasks=ColumnarTasks.model_construct(None, **columns),
+            pagination=pagination,
+        ),
+        headers,
+        {"tasks": set(columns), "pagination": True},
+        COLUMNAR_MEDIA_TYPE,
+    )
+
+
+async def query(
+    query: Annotated[TaskQueryParams, Query()],
+    task_controller: Annotated[TaskController, Depends(get_task_controller)],
+    cursor_codec: Annotated[CursorCodec, Depends(get_cursor_codec)],
+    tasks_config: Annotated[TasksConfig, Depends(get_tasks_config)],
+    request: Request,
+    accept: Annotated[str | None, Header()] = None,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """Query tasks with query parameters.
+
+    It returns a list of tasks and pagination metadata. With a ``cursor``
+    the pages are sought by the last seen task instead of skipped over by
+    page number, the first page is requested with an empty cursor. With
+    ``fields`` the tasks only hold these fields, which are the only ones
+    read from the database. With ``sqlite_json`` configured, the numbered
+    pages of tasks are encoded by the database.
+
+    A request accepting ``application/vnd.tasks.columnar+json`` gets the
+    tasks column by column instead, an array per field, with the due dates
+    in milliseconds since the Unix epoch and the completion flags as 0 or
+    1.
+
+    The ETag combines the version of the tasks data with the parsed query
+    and the format, a request whose ``If-None-Match`` lists it gets an
+    empty 304 response without querying the tasks.
+    """
+    columnar = accepts_columnar(accept)
+    representation = query.model_dump_json()
+    if columnar:
+        representation += COLUMNAR_MEDIA_TYPE
+    # The data version is read before the tasks, so a write racing the
+    # query can only make the ETag older than the page, never newer.
+    etag = make_etag(
+        await task_controller.get_data_version(),
+        digest(representation),
+        weak=True,
+    )
+    headers = {"ETag": etag, "Vary": "Accept"}
+    if etag_matches(if_none_match, etag):
+        raise HTTPException(status_code=304, headers=headers)
+
+    if columnar:
+        return await _query_columns(
+            query, task_controller, cursor_codec, request, headers
+        )
+    if query.cursor is not None:
+        after_id = _decode_after_id(cursor_codec, query.cursor)
+        tasks, has_more = await task_controller.get_after(query, after_id)
+        pagination = _cursor_pagination(
+            query, cursor_codec, tasks[-1].id if has_more else None, request
+        )
+    elif tasks_config.sqlite_json:
+        json_page = await task_controller.get_json(query)
+        pagination = _numbered_pagination(query, json_page.total, request)
+        # The envelope is spliced around the JSON array of the tasks, in
+        # the same format GetTasksResponse is serialised to.
+        return Response(
+            content=b'{"tasks":'
+            + json_page.tasks.encode()
+            + b',"pagination":'
+            + PAGINATION_ADAPTER.dump_json(pagination)
+            + b"}",
+            media_type="application/json",
+            headers=headers,
+        )
+    else:
+        tasks, total = await task_controller.get(query)
+        pagination = _numbered_pagination(query, total, request)
+
+    fields = query.field_names()
+    return _json_response(
+        GET_TASKS_RESPONSE_ADAPTER,
+        GetTasksResponse(tasks=tasks, pagination=pagination),
+        headers,
+        None
+        if fields is None
+        else {"tasks": {"__all__": set(fields)}, "pagination": True},
+    )
+
+
+async def export_tasks(
+    params: Annotated[TaskExportParams, Query()],
+    task_controller: Annotated[TaskController, Depends(get_task_controller)],
+    tasks_config: Annotated[TasksConfig, Depends(get_tasks_config)],
+) -> StreamingResponse:
+    """Export all the tasks matching the filters as NDJSON or CSV.
+
+    The tasks are streamed from the database in batches and encoded as
+    they come, so the memory use does not grow with the number of tasks.
+    """
+    batches = task_controller.export(params, tasks_config.export_batch_size)
+    return StreamingResponse(
+        ENCODERS[params.format](batches),
+        media_type=MEDIA_TYPES[params.format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="tasks.{params.format.value}"'
+            )
+        },
+    )
+
+
+async def get_task_stats(
+    task_controller: Annotated[TaskController, Depends(get_task_controller)],
+) -> TaskStats:
+    """Count the tasks per priority, completion state and overdue.
+
+    The totals come from a summary table kept up to date by the database
+    and the overdue tasks are counted on the due date index, so the cost
+    grows with the number of overdue tasks only.
+    """
+    return await task_controller.stats()
+
+
+async def import_tasks(
+    request: Request,
+    task_controller: Annotated[TaskController, Depends(get_task_controller)],
+    tasks_config: Annotated[TasksConfig, Depends(get_tasks_config)],
+    format: FileFormat = FileFormat.NDJSON,
+) -> ImportTasksResponse:
+    """Import the tasks of an NDJSON or CSV file sent as the request body.
+
+    The body is parsed as it is received and the valid tasks are inserted
+    in chunks of ``import_chunk_size``, each in its own transaction. The
+    invalid lines are skipped and reported by line number.
+    """
+    inserted = rejected = 0
+    errors: list[RejectedLine] = []
+    chunk: list[CreateTaskRequest] = []
+    try:
+        async for line, decoded in DECODERS[format](request.stream()):
+            if isinstance(decoded, ValidationError):
+                rejected += 1
+                if len(errors) < tasks_config.import_max_errors:
+                    errors.append(
+                        RejectedLine(
+                            line=line,
+                            errors=decoded.errors(
+                                include_url=False, include_context=False
+                            ),
+                        )
+                    )
+                continue
+            chunk.append(decoded)
+            if len(chunk) == tasks_config.import_chunk_size:
+                inserted += len(await task_controller.create_many(chunk))
+                chunk = []
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"The body is not valid UTF-8, {inserted} tasks were "
+            "imported before the error",
+        )
+    except csv.Error as exc:
+        raise HTTPException(
+            status_code=400,
+            detail=f"The body is not valid CSV, {exc}, {inserted} tasks "
+            "were imported before the error",
+        )
+    except LineTooLongError as exc:
+        raise HTTPException(
+            status_code=400,
+            detail=f"The body cannot be imported, {exc}, {inserted} tasks "
+            "were imported before the error",
+        )
+    if chunk:
+        inserted += len(await task_controller.create_many(chunk))
+    return ImportTasksResponse(
+        inserted=inserted, rejected=rejected, errors=errors
+    )
+
+
+def _task_headers(
+    id: int, version: int, fields: str | None, compressed: bool
+) -> dict[str, str]:
+    """Build the validator headers of a task, partial when fields are selected.
+
+    When the responses may be compressed the entity tag is weak, so it is
+    the same for the gzip and identity encodings, and a 304 carries the
+    validator of whichever encoding the client holds.
+    """
+    parts: tuple[object, ...] = (id, version)
+    if fields is not None:
+        parts = (*parts, digest(fields))
+    if not compressed:
+        return {"ETag": make_etag(*parts)}
+    return {"ETag": make_etag(*parts, weak=True), "Vary": "Accept-Encoding"}
 
 
 async def get_task_by_id(
     id: int,
+    params: Annotated[TaskFieldsParams, Query()],
     task_controller: Annotated[TaskController, Depends(get_task_controller)],
-) -> Task:
-    """Get a task by its ID."""
+    compression_config: Annotated[
+        CompressionConfig, Depends(get_compression_config)
+    ],
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """Get a task by its ID.
+
+    The ETag is derived from the version of the task, a request whose
+    ``If-None-Match`` lists it gets an empty 304 response without the task
+    being read. With ``fields`` the task only holds these fields.
+    """
+    if if_none_match is not None:
+        version = await task_controller.get_version(id)
+        if version is not None:
+            headers = _task_headers(
+                id, version, params.fields, compression_config.enabled
+            )
+            if etag_matches(if_none_match, headers["ETag"]):
+                raise HTTPException(status_code=304, headers=headers)
+    fields = params.field_names()
     try:
-        return task_controller.get_by_id(id)
+        task, version = await task_controller.get_versioned_by_id(id, fields)
     except NotFoundError as exc:
         raise HTTPException(
             status_code=404, detail=f"Task with ID {exc.id} not found"
         )
+    return _json_response(
+        TASK_ADAPTER,
+        task,
+        _task_headers(id, version, params.fields, compression_config.enabled),
+        None if fields is None else set(fields),
+    )
 
 
 async def update_task(
     id: int,
     update_task_request: UpdateTaskRequest,
     task_controller: Annotated[TaskController, Depends(get_task_controller)],
-) -> Task:
+) -> Response:
     """Update a task."""
     try:
-        return task_controller.update(
+        task = await task_controller.update(
             id=id, update_task_request=update_task_request
         )
     except NotFoundError as exc:
         raise HTTPException(
             status_code=404, detail=f"Task with ID {exc.id} not found"
         )
+    return _json_response(TASK_ADAPTER, task)
 
 
 async def delete_task(
@@ -84,9 +489,54 @@ async def delete_task(
 ) -> DeleteTaskResponse:
     """Delete a task."""
     try:
-        task_controller.delete(id)
+        await task_controller.delete(id)
         return DeleteTaskResponse(message="Task deleted successfully")
     except NotFoundError as exc:
         raise HTTPException(
             status_code=404, detail=f"Task with ID {exc.id} not found"
         )
+
+
+def _require_filter(task_filter_params: TaskFilterParams) -> None:
+    """Refuse to apply a change to all the tasks by accident."""
+    filters = task_filter_params.model_dump(
+        include=set(TaskFilterParams.model_fields), exclude_none=True
+    )
+    if not filters:
+        raise HTTPException(
+            status_code=400, detail="At least one filter is required"
+        )
+
+
+async def update_tasks(
+    params: Annotated[TaskChangeParams, Query()],
+    update_task_request: UpdateTaskRequest,
+    task_controller: Annotated[TaskController, Depends(get_task_controller)],
+) -> AffectedTasksResponse:
+    """Update all the tasks matching the filters in a single statement.
+
+    With ``dry_run`` only the number of matching tasks is returned. A body
+    changing no field is refused, it would not update any task.
+    """
+    _require_filter(params)
+    if not update_task_request.model_fields_set:
+        raise HTTPException(
+            status_code=400, detail="At least one field to change is required"
+        )
+    count = await task_controller.update_where(
+        params, update_task_request, dry_run=params.dry_run
+    )
+    return AffectedTasksResponse(count=count, dry_run=params.dry_run)
+
+
+async def delete_tasks(
+    params: Annotated[TaskChangeParams, Query()],
+    task_controller: Annotated[TaskController, Depends(get_task_controller)],
+) -> AffectedTasksResponse:
+    """Delete all the tasks matching the filters in a single statement.
+
+    With ``dry_run`` only the number of matching tasks is returned.
+    """
+    _require_filter(params)
+    count = await task_controller.delete_where(params, dry_run=params.dry_run)
+    return AffectedTasksResponse(count=count, dry_run=params.dry_run)
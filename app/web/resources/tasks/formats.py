@@ -0,0 +1,231 @@
+"""Encoding and decoding of the file formats of the tasks API."""
+
+import codecs
+import csv
+import io
+from collections.abc import AsyncIterator
+
+from pydantic import ValidationError
+
+from app.schemas import CreateTaskRequest, FileFormat, Task
+from app.web.negotiation import header_qualities
+
+
+CSV_FIELDS = tuple(Task.model_fields)
+"""Columns of a CSV file of tasks, in order."""
+
+MEDIA_TYPES = {
+    FileFormat.NDJSON: "application/x-ndjson",
+    FileFormat.CSV: "text/csv",
+}
+"""Media type of every file format."""
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.tasks.columnar+json"
+"""Media type of the pages of tasks returned column by column."""
+
+MAX_LINE_SIZE = 128 * 1024
+"""Longest line, in characters, buffered while decoding an import."""
+
+MAX_CSV_RECORD_SIZE = 128 * 1024
+"""Longest CSV record, in characters, buffered while decoding an import."""
+
+JSON_MEDIA_RANGES = ("application/json", "application/*", "*/*")
+"""Media ranges matching JSON, from the most specific."""
+
+DecodedLine = tuple[int, CreateTaskRequest | ValidationError]
+"""Line number of a decoded task and the task or its validation errors."""
+
+
+class LineTooLongError(ValueError):
+    """Exception raised when an imported line is longer than the limit."""
+
+    def __init__(self, line_number: int) -> None:
+        """Initialize the exception with the number of the line."""
+        super().__init__(
+            f"line {line_number} is longer than {MAX_LINE_SIZE} characters"
+        )
+
+
+def accepts_columnar(accept: str | None) -> bool:
+    """Check whether an ``Accept`` header asks for the columnar format.
+
+    The columnar format must be listed by name, with a quality at least
+    that of the most specific range matching JSON.
+    """
+    if accept is None:
+        return False
+    qualities = header_qualities(accept)
+    columnar = qualities.get(COLUMNAR_MEDIA_TYPE, 0.0)
+    json = next(
+        (
+            qualities[media_range]
+            for media_range in JSON_MEDIA_RANGES
+            if media_range in qualities
+        ),
+        0.0,
+    )
+    return columnar > 0 and columnar >= json
+
+
+def _csv_row(task: Task) -> dict:
+    """Convert a task to a CSV row, spelling booleans as in JSON."""
+    row = task.model_dump(mode="json")
+    row["completed"] = "true" if task.completed else "false"
+    return row
+
+
+async def encode_ndjson(
+    batches: AsyncIterator[list[Task]],
+) -> AsyncIterator[str]:
+    """Encode batches of tasks as newline-delimited JSON, one per line."""
+    async for tasks in batches:
+        yield "".join(f"{task.model_dump_json()}\n" for task in tasks)
+
+
+async def encode_csv(batches: AsyncIterator[list[Task]]) -> AsyncIterator[str]:
+    """Encode batches of tasks as CSV rows following a header row."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    yield buffer.getvalue()
+    async for tasks in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(_csv_row(task) for task in tasks)
+        yield buffer.getvalue()
+
+
+ENCODERS = {
+    FileFormat.NDJSON: encode_ndjson,
+    FileFormat.CSV: encode_csv,
+}
+"""Encoder of every export format."""
+
+
+async def _read_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a stream of UTF-8 bytes into lines, keeping the line ends.
+
+    Only the pieces of the incomplete last line of a chunk are kept between
+    chunks, and only the new chunk is searched for line ends.
+
+    :raises UnicodeDecodeError: If the stream is not valid UTF-8.
+    :raises LineTooLongError: As soon as a line is longer than
+        ``MAX_LINE_SIZE``.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending: list[str] = []
+    size = 0
+    line_number = 1
+
+    def keep(piece: str) -> None:
+        nonlocal size
+        size += len(piece)
+        if size > MAX_LINE_SIZE:
+            raise LineTooLongError(line_number)
+        pending.append(piece)
+
+    async for chunk in chunks:
+        text = decoder.decode(chunk)
+        start = 0
+        while (end := text.find("\n", start)) != -1:
+            keep(text[start : end + 1])
+            yield "".join(pending)
+            pending.clear()
+            size = 0
+            line_number += 1
+            start = end + 1
+        if start < len(text):
+            keep(text[start:])
+    keep(decoder.decode(b"", final=True))
+    if size:
+        yield "".join(pending)
+
+
+def _validate(line_number: int, data: str | dict) -> DecodedLine:
+    """Validate the data of a line as a task creation request."""
+    try:
+        if isinstance(data, str):
+            return line_number, CreateTaskRequest.model_validate_json(data)
+        return line_number, CreateTaskRequest.model_validate(data)
+    except ValidationError as exc:
+        return line_number, exc
+
+
+async def decode_ndjson(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[DecodedLine]:
+    """Decode newline-delimited JSON into tasks, skipping blank lines."""
+    line_number = 0
+    async for line in _read_lines(chunks):
+        line_number += 1
+        if line.strip():
+            yield _validate(line_number, line)
+
+
+def _csv_values(row: dict[str, str]) -> dict[str, str | int | None]:
+    """Convert the text of a CSV row to the values of a task."""
+    values: dict[str, str | int | None] = dict(row)
+    if row.get("priority", "").isdigit():
+        values["priority"] = int(row["priority"])
+    if row.get("description") == "":
+        values["description"] = None
+    return values
+
+
+async def _read_records(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[tuple[int, list[str]]]:
+    """Split a CSV stream into records and the line they start on.
+
+    :raises csv.Error: If a record is longer than ``MAX_CSV_RECORD_SIZE``,
+        such as after an unbalanced quote, or cannot be parsed.
+    """
+    lines: list[str] = []
+    size = 0
+    quoted = False
+    line_number = record_line_number = 0
+    async for line in _read_lines(chunks):
+        line_number += 1
+        if not lines:
+            record_line_number = line_number
+        lines.append(line)
+        size += len(line)
+        if size > MAX_CSV_RECORD_SIZE:
+            raise csv.Error(
+                f"the record starting on line {record_line_number} is "
+                f"longer than {MAX_CSV_RECORD_SIZE} characters"
+            )
+        # Quotes are escaped by doubling, while the record holds an odd
+        # number of quotes a quoted field continues on the next line.
+        quoted ^= line.count('"') % 2 == 1
+        if not quoted:
+            yield record_line_number, next(csv.reader(["".join(lines)]))
+            lines = []
+            size = 0
+    if lines:
+        yield record_line_number, next(csv.reader(["".join(lines)]))
+
+
+async def decode_csv(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[DecodedLine]:
+    """Decode CSV rows following a header row into tasks.
+
+    The columns of a task which are not part of a creation request, such
+    as the ``id`` of an export, are ignored.
+    """
+    header: list[str] | None = None
+    async for line_number, values in _read_records(chunks):
+        if not values:
+            continue
+        if header is None:
+            header = values
+            continue
+        yield _validate(line_number, _csv_values(dict(zip(header, values))))
+
+
+DECODERS = {
+    FileFormat.NDJSON: decode_ndjson,
+    FileFormat.CSV: decode_csv,
+}
+"""Decoder of every import format."""
@@ -1,5 +1,7 @@
 """Schemas for the tasks API."""
 
+from typing import Any
+
 from pydantic import BaseModel
 
 from app.schemas import Task
@@ -11,13 +13,24 @@ class DeleteTaskResponse(BaseModel):
     message: str
 
 
+class AffectedTasksResponse(BaseModel):
+    """Response schema for the updates and deletions by filter."""
+
+    count: int
+    """Number of tasks affected, or that would be affected in a dry run."""
+
+    dry_run: bool
+    """Whether the tasks were left untouched."""
+
+
 class Pagination(BaseModel):
     """Pagination schema for metadata in response."""
 
-    count: int
-    total_pages: int
+    count: int | None
+    total_pages: int | None
     next_page_url: str | None = None
     previous_page_url: str | None = None
+    next_cursor: str | None = None
 
 
 class GetTasksResponse(BaseModel):
@@ -25,3 +38,70 @@ class GetTasksResponse(BaseModel):
 
     tasks: list[Task]
     pagination: Pagination
+
+
+class ColumnarTasks(BaseModel):
+    """The fields of the tasks of a page, column by column.
+
+    The columns of the fields which were not selected are left out.
+    """
+
+    id: list[int]
+    title: list[str] = []
+    priority: list[int] = []
+    due_date: list[int] = []
+    """Due dates in milliseconds since the Unix epoch, in UTC."""
+
+    description: list[str | None] = []
+    completed: list[int] = []
+    """1 for the completed tasks, else 0."""
+
+
+class ColumnarTasksResponse(BaseModel):
+    """Response schema for a page of tasks in the columnar format."""
+
+    tasks: ColumnarTasks
+    pagination: Pagination
+
+
+class BulkCreateError(BaseModel):
+    """Validation errors of an item of a bulk request."""
+
+    index: int
+    """Position of the item in the request."""
+
+    errors: list[dict[str, Any]]
+    """Validation errors of the item."""
+
+
+class BulkCreateTasksResponse(BaseModel):
+    """Response schema for creating tasks in bulk."""
+
+    ids: list[int | None]
+    """IDs of the created tasks in request order, None for invalid items."""
+
+    errors: list[BulkCreateError] = []
+    """Validation errors of the items that were not created."""
+
+
+class RejectedLine(BaseModel):
+    """Validation errors of a line of an imported file."""
+
+    line: int
+    """Number of the line, starting at 1."""
+
+    errors: list[dict[str, Any]]
+    """Validation errors of the line."""
+
+
+class ImportTasksResponse(BaseModel):
+    """Response schema for importing tasks."""
+
+    inserted: int
+    """Number of tasks created."""
+
+    rejected: int
+    """Number of lines which did not hold a valid task."""
+
+    errors: list[RejectedLine]
+    """Validation errors of the first rejected lines."""
@@ -2,19 +2,81 @@
 
 from fastapi import APIRouter
 
+from app.schemas import Task
 from app.web.resources.tasks.api import (
     create_task,
+    create_tasks,
     delete_task,
+    delete_tasks,
+    export_tasks,
     get_task_by_id,
+    get_task_stats,
+    import_tasks,
     query,
     update_task,
+    update_tasks,
 )
+from app.web.resources.tasks.formats import COLUMNAR_MEDIA_TYPE
+from app.web.resources.tasks.schemas import GetTasksResponse
 
 
+BULK_CREATE_OPENAPI = {
+    "requestBody": {
+        "content": {
+            "application/json": {
+                "schema": {
+                    "type": "array",
+                    "items": {
+                        "$ref": "#/components/schemas/CreateTaskRequest"
+                    },
+                }
+            }
+        }
+    }
+}
+"""Body of the bulk creation, whose items are validated one by one."""
+
 router = APIRouter(prefix="/tasks")
 
-router.add_api_route("/", create_task, methods=["POST"], tags=["Tasks"])
-router.add_api_route("/", query, methods=["GET"], tags=["Tasks"])
-router.add_api_route("/{id}", get_task_by_id, methods=["GET"], tags=["Tasks"])
-router.add_api_route("/{id}", update_task, methods=["PUT"], tags=["Tasks"])
+router.add_api_route(
+    "/",
+    create_task,
+    methods=["POST"],
+    tags=["Tasks"],
+    response_model=Task,
+)
+router.add_api_route(
+    "/bulk",
+    create_tasks,
+    methods=["POST"],
+    tags=["Tasks"],
+    openapi_extra=BULK_CREATE_OPENAPI,
+)
+router.add_api_route("/import", import_tasks, methods=["POST"], tags=["Tasks"])
+router.add_api_route(
+    "/",
+    query,
+    methods=["GET"],
+    tags=["Tasks"],
+    response_model=GetTasksResponse,
+    responses={200: {"content": {COLUMNAR_MEDIA_TYPE: {}}}},
+)
+router.add_api_route("/", update_tasks, methods=["PATCH"], tags=["Tasks"])
+router.add_api_route("/", delete_tasks, methods=["DELETE"], tags=["Tasks"])
+router.add_api_route("/export", export_tasks, methods=["GET"], tags=["Tasks"])
+router.add_api_route("/stats", get_task_stats, methods=["GET"], tags=["Tasks"])
+router.add_api_route(
+    "/{id}",
+    get_task_by_id,
+    methods=["GET"],
+    tags=["Tasks"],
+    response_model=Task,
+)
+router.add_api_route(
+    "/{id}",
+    update_task,
+    methods=["PUT"],
+    tags=["Tasks"],
+    response_model=Task,
+)
 router.add_api_route("/{id}", delete_task, methods=["DELETE"], tags=["Tasks"])
@@ -1,5 +1,7 @@
 """Fixtures for integration tests in the web module."""
 
+from typing import Generator
+
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
@@ -21,9 +23,13 @@ def test_app(config: WebConfig) -> FastAPI:
 
 
 @pytest.fixture
-def test_client(test_app: FastAPI) -> TestClient:
-    """Fixture for the application client."""
-    return TestClient(test_app)
+def test_client(test_app: FastAPI) -> Generator[TestClient, None, None]:
+    """Fixture for the application client.
+
+    The client is used as a context manager so the lifespan runs.
+    """
+    with TestClient(test_app) as client:
+        yield client
 
 
 @pytest.fixture(scope="session")
@@ -38,12 +44,42 @@ def create_task_url(test_app: FastAPI) -> str:
     return test_app.url_path_for("create_task")
 
 
+@pytest.fixture(scope="session")
+def create_tasks_url(test_app: FastAPI) -> str:
+    """Fixture for the bulk create tasks url."""
+    return test_app.url_path_for("create_tasks")
+
+
 @pytest.fixture(scope="session")
 def query_tasks_url(test_app: FastAPI) -> str:
     """Fixture for the query tasks url."""
     return test_app.url_path_for("query")
 
 
+@pytest.fixture(scope="session")
+def export_tasks_url(test_app: FastAPI) -> str:
+    """Fixture for the export tasks url."""
+    return test_app.url_path_for("export_tasks")
+
+
+@pytest.fixture(scope="session")
+def import_tasks_url(test_app: FastAPI) -> str:
+    """Fixture for the import tasks url."""
+    return test_app.url_path_for("import_tasks")
+
+
+@pytest.fixture(scope="session")
+def update_tasks_url(test_app: FastAPI) -> str:
+    """Fixture for the update tasks by filter url."""
+    return test_app.url_path_for("update_tasks")
+
+
+@pytest.fixture(scope="session")
+def delete_tasks_url(test_app: FastAPI) -> str:
+    """Fixture for the delete tasks by filter url."""
+    return test_app.url_path_for("delete_tasks")
+
+
 @pytest.fixture(scope="session")
 def update_task_url(test_app: FastAPI) -> str:
     """Fixture for the update task url."""
@@ -54,3 +90,9 @@ def update_task_url(test_app: FastAPI) -> str:
 def delete_task_url(test_app: FastAPI) -> str:
     """Fixture for the delete task url."""
     return test_app.url_path_for("delete_task", id=1)
+
+
+@pytest.fixture(scope="session")
+def task_stats_url(test_app: FastAPI) -> str:
+    """Fixture for the task stats url."""
+    return test_app.url_path_for("get_task_stats")
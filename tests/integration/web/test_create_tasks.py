@@ -0,0 +1,118 @@
+"""Integration tests for the bulk create tasks API endpoint."""
+
+from typing import Generator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+class TestCreateTasksApi:
+    """Tests for the bulk create tasks API endpoint."""
+
+    @pytest.fixture(autouse=True)
+    def cleanup(
+        self, test_app: FastAPI, test_client: TestClient
+    ) -> Generator[None, None, None]:
+        """Cleanup tasks after each test."""
+        yield
+        task_repository = test_app.state.task_repository
+        with task_repository._write_connection() as conn:
+            conn.execute("DELETE FROM tasks")
+            conn.commit()
+
+    @pytest.fixture
+    def create_task_dicts(self) -> list[dict]:
+        """Fixture for the tasks of a bulk request."""
+        return [
+            {
+                "title": f"Task {number}",
+                "priority": 1,
+                "due_date": "2000-02-01T15:00:00",
+            }
+            for number in range(3)
+        ]
+
+    def test_return_ids_in_order(
+        self,
+        test_client: TestClient,
+        create_tasks_url: str,
+        query_tasks_url: str,
+        create_task_dicts: list[dict],
+    ) -> None:
+        """Test that the tasks are created with ids in request order."""
+        response = test_client.post(create_tasks_url, json=create_task_dicts)
+        assert response.status_code == 200
+        ids = response.json()["ids"]
+
+        response = test_client.get(f"{query_tasks_url}?page_size=100")
+        tasks = response.json()["tasks"]
+        assert [
+            (task["id"], task["title"]) for task in tasks if task["id"] in ids
+        ] == [
+            (ids[0], "Task 0"),
+            (ids[1], "Task 1"),
+            (ids[2], "Task 2"),
+        ]
+
+    def test_return_422_with_invalid_item(
+        self,
+        test_client: TestClient,
+        create_tasks_url: str,
+        query_tasks_url: str,
+        create_task_dicts: list[dict],
+    ) -> None:
+        """Test that an invalid item rejects the whole request."""
+        create_task_dicts[1]["priority"] = "urgent"
+        response = test_client.post(create_tasks_url, json=create_task_dicts)
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", 1, "priority"]
+        response = test_client.get(f"{query_tasks_url}?title=Task 0")
+        assert response.json()["tasks"] == []
+
+    def test_create_valid_items_when_partial(
+        self,
+        test_client: TestClient,
+        create_tasks_url: str,
+        create_task_dicts: list[dict],
+    ) -> None:
+        """Test that allow_partial reports the invalid items."""
+        del create_task_dicts[1]["due_date"]
+        response = test_client.post(
+            f"{create_tasks_url}?allow_partial=true", json=create_task_dicts
+        )
+        assert response.status_code == 200
+        response_dict = response.json()
+        assert response_dict["ids"][1] is None
+        assert response_dict["errors"][0]["index"] == 1
+        assert response_dict["errors"][0]["errors"][0]["loc"] == ["due_date"]
+
+    def test_report_non_object_item_when_partial(
+        self,
+        test_client: TestClient,
+        create_tasks_url: str,
+        create_task_dicts: list[dict],
+    ) -> None:
+        """Test that an item which is not an object is only reported."""
+        response = test_client.post(
+            f"{create_tasks_url}?allow_partial=true",
+            json=[create_task_dicts[0], 5],
+        )
+        assert response.status_code == 200
+        response_dict = response.json()
+        assert response_dict["ids"][0] is not None
+        assert response_dict["ids"][1] is None
+        assert response_dict["errors"][0]["index"] == 1
+        assert response_dict["errors"][0]["errors"][0]["type"] == "model_type"
+
+    def test_document_items_as_create_task_requests(
+        self, test_app: FastAPI, create_tasks_url: str
+    ) -> None:
+        """Test that the OpenAPI body lists task creation requests."""
+        body = test_app.openapi()["paths"][create_tasks_url]["post"][
+            "requestBody"
+        ]
+        schema = body["content"]["application/json"]["schema"]
+        assert schema["items"] == {
+            "$ref": "#/components/schemas/CreateTaskRequest"
+        }
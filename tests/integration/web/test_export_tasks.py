@@ -0,0 +1,103 @@
+"""Integration tests for the export tasks API endpoint."""
+
+import csv
+import io
+import json
+from typing import Generator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+class TestExportTasksApi:
+    """Tests for the export tasks API endpoint."""
+
+    @pytest.fixture(autouse=True)
+    def ids(
+        self,
+        test_app: FastAPI,
+        test_client: TestClient,
+        create_tasks_url: str,
+    ) -> Generator[list[int], None, None]:
+        """Create tasks to export, clean them up after each test."""
+        response = test_client.post(
+            create_tasks_url,
+            json=[
+                {
+                    "title": f"Exported {number}",
+                    "priority": 3 if number % 2 else 1,
+                    "due_date": "2000-02-01T15:00:00",
+                    "description": f"Line {number}, with a comma",
+                }
+                for number in range(3)
+            ],
+        )
+        yield response.json()["ids"]
+        task_repository = test_app.state.task_repository
+        with task_repository._write_connection() as conn:
+            conn.execute("DELETE FROM tasks")
+            conn.commit()
+
+    def test_export_ndjson(
+        self,
+        test_client: TestClient,
+        export_tasks_url: str,
+        ids: list[int],
+    ) -> None:
+        """Test exporting the matching tasks as NDJSON."""
+        response = test_client.get(f"{export_tasks_url}?title=Exported")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        tasks = [json.loads(line) for line in response.text.splitlines()]
+        assert [task["id"] for task in tasks] == ids
+        assert tasks[1] == {
+            "id": ids[1],
+            "title": "Exported 1",
+            "priority": 3,
+            "due_date": "2000-02-01T15:00:00",
+            "description": "Line 1, with a comma",
+            "completed": False,
+        }
+
+    def test_export_csv(
+        self,
+        test_client: TestClient,
+        export_tasks_url: str,
+        ids: list[int],
+    ) -> None:
+        """Test exporting the matching tasks as CSV."""
+        response = test_client.get(
+            f"{export_tasks_url}?format=csv&priority=1&title=Exported"
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["id"] for row in rows] == [str(ids[0]), str(ids[2])]
+        assert rows[0]["description"] == "Line 0, with a comma"
+        assert rows[0]["completed"] == "false"
+
+    def test_export_compressed(
+        self,
+        test_client: TestClient,
+        export_tasks_url: str,
+        ids: list[int],
+    ) -> None:
+        """Test that the export is compressed for clients accepting gzip."""
+        url = f"{export_tasks_url}?title=Exported"
+        compressed = test_client.get(url, headers={"Accept-Encoding": "gzip"})
+        plain = test_client.get(
+            url, headers={"Accept-Encoding": "gzip;q=0, identity"}
+        )
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.headers["vary"] == "Accept-Encoding"
+        assert "content-encoding" not in plain.headers
+        assert compressed.text == plain.text
+        assert len(plain.text.splitlines()) == len(ids)
+
+    def test_return_422_with_unknown_format(
+        self, test_client: TestClient, export_tasks_url: str
+    ) -> None:
+        """Test that only the supported formats are accepted."""
+        response = test_client.get(f"{export_tasks_url}?format=xml")
+        assert response.status_code == 422
@@ -6,18 +6,18 @@ import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
-from app.dependencies import get_task_repository
-
 
 class TestGetTaskByIDApi:
     """Tests for the get task by id API endpoint."""
 
     @pytest.fixture(autouse=True)
-    def cleanup(self) -> Generator[None, None, None]:
+    def cleanup(
+        self, test_app: FastAPI, test_client: TestClient
+    ) -> Generator[None, None, None]:
         """Cleanup tasks after each test."""
         yield
-        task_repository = get_task_repository()
-        with task_repository._get_connection() as conn:
+        task_repository = test_app.state.task_repository
+        with task_repository._write_connection() as conn:
             conn.execute("DELETE FROM tasks")
             conn.commit()
 
@@ -62,3 +62,102 @@ class TestGetTaskByIDApi:
         }
         assert response.status_code == 200
         assert response.json() == expected
+
+    def test_return_304_while_task_unchanged(
+        self, test_client: TestClient, create_task_url: str, test_app: FastAPI
+    ) -> None:
+        """Test that the ETag of a task is valid until it is updated."""
+        response = test_client.post(
+            create_task_url,
+            json={
+                "title": "Test Task",
+                "priority": 3,
+                "due_date": "2000-02-01T15:00:00",
+            },
+        )
+        task_id = response.json()["id"]
+        url = test_app.url_path_for("get_task_by_id", id=task_id)
+        etag = test_client.get(url).headers["ETag"]
+
+        response = test_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+        test_client.put(url, json={"title": "Renamed"})
+        response = test_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["title"] == "Renamed"
+        assert response.headers["ETag"] != etag
+
+    def test_return_304_for_compressed_task(
+        self, test_client: TestClient, create_task_url: str, test_app: FastAPI
+    ) -> None:
+        """Test that a task has the same ETag for every encoding...
+
+        and that the 304 carries the validator of the compressed 200.
+        """
+        response = test_client.post(
+            create_task_url,
+            json={
+                "title": "Test Task",
+                "priority": 3,
+                "due_date": "2000-02-01T15:00:00",
+                "description": "Long " * 500,
+            },
+        )
+        url = test_app.url_path_for("get_task_by_id", id=response.json()["id"])
+        gzip = {"Accept-Encoding": "gzip"}
+        compressed = test_client.get(url, headers=gzip)
+        identity = test_client.get(
+            url, headers={"Accept-Encoding": "identity"}
+        )
+        assert compressed.headers["Content-Encoding"] == "gzip"
+        etag = compressed.headers["ETag"]
+        assert etag.startswith("W/")
+        assert etag == identity.headers["ETag"]
+        assert compressed.headers["Vary"] == "Accept-Encoding"
+
+        response = test_client.get(
+            url, headers={**gzip, "If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.headers["Vary"] == "Accept-Encoding"
+
+    def test_return_task_with_selected_fields(
+        self, test_client: TestClient, create_task_url: str, test_app: FastAPI
+    ) -> None:
+        """Test that only the selected fields of the task are returned...
+
+        under an ETag of their own.
+        """
+        response = test_client.post(
+            create_task_url,
+            json={
+                "title": "Test Task",
+                "priority": 3,
+                "due_date": "2000-02-01T15:00:00",
+            },
+        )
+        task_id = response.json()["id"]
+        url = test_app.url_path_for("get_task_by_id", id=task_id)
+        full_etag = test_client.get(url).headers["ETag"]
+
+        response = test_client.get(url, params={"fields": "due_date"})
+        assert response.status_code == 200
+        assert response.json() == {
+            "id": task_id,
+            "due_date": "2000-02-01T15:00:00",
+        }
+        etag = response.headers["ETag"]
+        assert etag != full_etag
+
+        response = test_client.get(
+            url,
+            params={"fields": "due_date"},
+            headers={"If-None-Match": etag},
+        )
+        assert response.status_code == 304
+        response = test_client.get(url, params={"fields": "secret"})
+        assert response.status_code == 422
@@ -0,0 +1,97 @@
+"""Integration tests for the import tasks API endpoint."""
+
+from collections.abc import Iterator
+from typing import Generator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+class TestImportTasksApi:
+    """Tests for the import tasks API endpoint."""
+
+    @pytest.fixture(autouse=True)
+    def cleanup(
+        self, test_app: FastAPI, test_client: TestClient
+    ) -> Generator[None, None, None]:
+        """Cleanup tasks after each test."""
+        yield
+        task_repository = test_app.state.task_repository
+        with task_repository._write_connection() as conn:
+            conn.execute("DELETE FROM tasks")
+            conn.commit()
+
+    def test_import_streamed_ndjson(
+        self,
+        test_client: TestClient,
+        import_tasks_url: str,
+        export_tasks_url: str,
+    ) -> None:
+        """Test importing an NDJSON body sent in chunks."""
+
+        def body() -> Iterator[bytes]:
+            for number in range(3):
+                yield (
+                    f'{{"title":"Imported {number}","priority":2,'
+                    '"due_date":"2000-02-01T15:00:00"}\n'
+                ).encode()
+            yield b'{"title":"Rejected"}\n'
+
+        response = test_client.post(import_tasks_url, content=body())
+
+        assert response.status_code == 200
+        response_dict = response.json()
+        assert response_dict["inserted"] == 3
+        assert response_dict["rejected"] == 1
+        assert response_dict["errors"][0]["line"] == 4
+        response = test_client.get(f"{export_tasks_url}?title=Imported")
+        assert len(response.text.splitlines()) == 3
+
+    def test_import_exported_csv(
+        self,
+        test_client: TestClient,
+        create_tasks_url: str,
+        import_tasks_url: str,
+        export_tasks_url: str,
+    ) -> None:
+        """Test that an exported CSV file is imported back."""
+        test_client.post(
+            create_tasks_url,
+            json=[
+                {
+                    "title": "Round trip",
+                    "priority": 3,
+                    "due_date": "2000-02-01T15:00:00",
+                    "description": "Two\nlines",
+                }
+            ],
+        )
+        exported = test_client.get(
+            f"{export_tasks_url}?format=csv&title=Round trip"
+        ).content
+
+        response = test_client.post(
+            f"{import_tasks_url}?format=csv", content=exported
+        )
+
+        assert response.json() == {"inserted": 1, "rejected": 0, "errors": []}
+        response = test_client.get(f"{export_tasks_url}?title=Round trip")
+        lines = response.text.splitlines()
+        assert len(lines) == 2
+        assert '"description":"Two\\nlines"' in lines[1]
+
+    def test_return_400_with_unbalanced_quote(
+        self, test_client: TestClient, import_tasks_url: str
+    ) -> None:
+        """Test that an unbalanced quote is reported, not buffered."""
+        line = b"Task,1,2000-01-01T00:00:00\n"
+        body = b"title,priority,due_date\n" + line + b'"' + line * 10_000
+
+        response = test_client.post(
+            f"{import_tasks_url}?format=csv", content=body
+        )
+
+        assert response.status_code == 400
+        assert "line 3" in response.json()["detail"]
+        assert "0 tasks were imported" in response.json()["detail"]
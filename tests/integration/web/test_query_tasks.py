@@ -3,20 +3,23 @@
 from typing import Generator
 
 import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
-from app.dependencies import get_task_repository
+from app.web.config import WebConfig
 
 
 class TestQueryTasksApi:
     """Tests for the query tasks API endpoint."""
 
     @pytest.fixture(autouse=True)
-    def cleanup(self) -> Generator[None, None, None]:
+    def cleanup(
+        self, test_app: FastAPI, test_client: TestClient
+    ) -> Generator[None, None, None]:
         """Cleanup tasks after each test."""
         yield
-        task_repository = get_task_repository()
-        with task_repository._get_connection() as conn:
+        task_repository = test_app.state.task_repository
+        with task_repository._write_connection() as conn:
             conn.execute("DELETE FROM tasks")
             conn.commit()
 
@@ -83,6 +86,7 @@ class TestQueryTasksApi:
             "total_pages": 1,
             "next_page_url": None,
             "previous_page_url": None,
+            "next_cursor": None,
         }
         assert response_dict["pagination"] == expected_pagination
 
@@ -136,3 +140,280 @@ class TestQueryTasksApi:
         assert len(response_tasks_dict) == 1
         assert response_tasks_dict[0]["title"] == "Test Task2"
         assert response_tasks_dict[0]["description"] == "Test description2"
+
+    def test_return_tasks_ordered_by_relevance(
+        self,
+        test_client: TestClient,
+        create_task_url: str,
+        query_tasks_url: str,
+    ) -> None:
+        """Test return the text matches ranked by relevance."""
+        for description in ("one mention of review", "review review"):
+            test_client.post(
+                create_task_url,
+                json={
+                    "title": "Task",
+                    "priority": 1,
+                    "due_date": "2000-02-01T15:00:00",
+                    "description": description,
+                },
+            )
+
+        url = f"{query_tasks_url}?description=review&order_by_relevance=true"
+        response = test_client.get(url)
+
+        assert response.status_code == 200
+        descriptions = [
+            task["description"] for task in response.json()["tasks"]
+        ]
+        assert descriptions == ["review review", "one mention of review"]
+
+    def test_return_tasks_sorted_in_due_date_range(
+        self,
+        test_client: TestClient,
+        create_task_url: str,
+        query_tasks_url: str,
+    ) -> None:
+        """Test return the tasks due in a range sorted by the server."""
+        for title, priority, due_date in (
+            ("A", 3, "2000-02-01T15:00:00"),
+            ("B", 1, "2000-02-03T15:00:00"),
+            ("C", 3, "2000-02-02T15:00:00"),
+            ("D", 2, "2000-03-01T15:00:00"),
+        ):
+            test_client.post(
+                create_task_url,
+                json={
+                    "title": title,
+                    "priority": priority,
+                    "due_date": due_date,
+                },
+            )
+
+        response = test_client.get(
+            query_tasks_url,
+            params={
+                "sort": "-priority,due_date",
+                "due_after": "2000-02-01T00:00:00",
+                "due_before": "2000-03-01T00:00:00",
+            },
+        )
+
+        assert response.status_code == 200
+        titles = [task["title"] for task in response.json()["tasks"]]
+        assert titles == ["A", "C", "B"]
+
+    @pytest.mark.parametrize("cursor", [None, ""])
+    def test_return_tasks_with_selected_fields(
+        self,
+        test_client: TestClient,
+        create_task_url: str,
+        query_tasks_url: str,
+        cursor: str | None,
+    ) -> None:
+        """Test that only the selected fields of the tasks are returned."""
+        response = test_client.post(
+            create_task_url,
+            json={
+                "title": "Test Task",
+                "priority": 3,
+                "due_date": "2000-02-01T15:00:00",
+                "description": "A long description",
+            },
+        )
+        task_id = response.json()["id"]
+
+        response = test_client.get(
+            query_tasks_url,
+            params={"fields": "due_date,title", "cursor": cursor},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["ETag"]
+        assert response.json()["tasks"] == [
+            {
+                "id": task_id,
+                "title": "Test Task",
+                "due_date": "2000-02-01T15:00:00",
+            }
+        ]
+        assert "pagination" in response.json()
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {},
+            {"page_size": 2, "page_number": 2, "sort": "-due_date"},
+            {"fields": "title,completed", "completed": "false"},
+            {"page_number": 9},
+        ],
+    )
+    def test_sqlite_json_pages_identical(
+        self,
+        test_client: TestClient,
+        create_task_url: str,
+        query_tasks_url: str,
+        config: WebConfig,
+        monkeypatch: pytest.MonkeyPatch,
+        params: dict,
+    ) -> None:
+        """Test that the pages encoded by SQLite are byte-identical."""
+        for title, due_date in (
+            ('Quote " and \\ and \t', "2000-02-01T15:00:00Z"),
+            ("Ünïcödé ✓", "2000-02-02T15:00:00.250+02:00"),
+            ("Plain", "2000-02-03T15:00:00"),
+        ):
+            response = test_client.post(
+                create_task_url,
+                json={
+                    "title": title,
+                    "priority": 2,
+                    "due_date": due_date,
+                },
+            )
+            assert response.status_code == 200
+
+        expected = test_client.get(query_tasks_url, params=params)
+        monkeypatch.setattr(config.tasks, "sqlite_json", True)
+        actual = test_client.get(query_tasks_url, params=params)
+
+        assert actual.status_code == 200
+        assert actual.content == expected.content
+        assert actual.headers["ETag"] == expected.headers["ETag"]
+
+    def test_return_tasks_column_by_column(
+        self,
+        test_client: TestClient,
+        create_task_url: str,
+        query_tasks_url: str,
+    ) -> None:
+        """Test that the columnar format is negotiated with Accept."""
+        ids = [
+            test_client.post(
+                create_task_url,
+                json={"title": title, "priority": 1, "due_date": due_date},
+            ).json()["id"]
+            for title, due_date in (
+                ("First", "1970-01-01T00:00:01Z"),
+                ("Second", "1970-01-01T02:00:00+02:00"),
+            )
+        ]
+        headers = {"Accept": "application/vnd.tasks.columnar+json"}
+
+        response = test_client.get(query_tasks_url, headers=headers)
+
+        assert response.status_code == 200
+        assert response.headers["Content-Type"] == headers["Accept"]
+        assert response.json()["tasks"] == {
+            "id": ids,
+            "title": ["First", "Second"],
+            "priority": [1, 1],
+            "due_date": [1000, 0],
+            "description": [None, None],
+            "completed": [0, 0],
+        }
+        etag = response.headers["ETag"]
+        response = test_client.get(
+            query_tasks_url, headers={**headers, "If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        response = test_client.get(
+            query_tasks_url, headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert isinstance(response.json()["tasks"], list)
+
+    def test_return_422_with_unknown_field(
+        self, test_client: TestClient, query_tasks_url: str
+    ) -> None:
+        """Test that a 422 error is returned with an unknown field."""
+        response = test_client.get(f"{query_tasks_url}?fields=title,secret")
+        assert response.status_code == 422
+
+    @pytest.mark.parametrize(
+        "params",
+        [{"sort": "secret"}, {"sort": "title", "cursor": ""}],
+    )
+    def test_return_422_with_invalid_sort(
+        self,
+        test_client: TestClient,
+        query_tasks_url: str,
+        params: dict,
+    ) -> None:
+        """Test that a 422 error is returned with an invalid sort."""
+        response = test_client.get(query_tasks_url, params=params)
+        assert response.status_code == 422
+
+    def test_page_through_tasks_with_cursor(
+        self,
+        test_client: TestClient,
+        create_task_url: str,
+        query_tasks_url: str,
+    ) -> None:
+        """Test following the cursors through every page."""
+        for number in range(5):
+            test_client.post(
+                create_task_url,
+                json={
+                    "title": f"Task {number}",
+                    "priority": 1,
+                    "due_date": "2000-02-01T15:00:00",
+                },
+            )
+
+        titles = []
+        url: str | None = f"{query_tasks_url}?page_size=2&cursor="
+        while url:
+            response = test_client.get(url)
+            assert response.status_code == 200
+            response_dict = response.json()
+            titles += [task["title"] for task in response_dict["tasks"]]
+            assert response_dict["pagination"]["count"] is None
+            url = response_dict["pagination"]["next_page_url"]
+
+        assert titles == [f"Task {number}" for number in range(5)]
+
+    def test_return_400_with_tampered_cursor(
+        self, test_client: TestClient, query_tasks_url: str
+    ) -> None:
+        """Test that a cursor which was not issued is rejected."""
+        response = test_client.get(f"{query_tasks_url}?cursor=WzFd")
+        assert response.status_code == 400
+        assert response.json() == {"detail": "Invalid cursor"}
+
+    def test_return_422_with_cursor_and_relevance(
+        self, test_client: TestClient, query_tasks_url: str
+    ) -> None:
+        """Test that the relevance ordering cannot be paged by cursor."""
+        url = f"{query_tasks_url}?cursor=&order_by_relevance=true"
+        response = test_client.get(url)
+        assert response.status_code == 422
+
+    def test_return_304_while_tasks_unchanged(
+        self,
+        test_client: TestClient,
+        create_task_url: str,
+        query_tasks_url: str,
+    ) -> None:
+        """Test that the ETag of a query is valid until a task changes."""
+        url = f"{query_tasks_url}?completed=false&page_size=5"
+        etag = test_client.get(url).headers["ETag"]
+
+        response = test_client.get(
+            f"{query_tasks_url}?page_size=5&completed=false",
+            headers={"If-None-Match": etag},
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+
+        test_client.post(
+            create_task_url,
+            json={
+                "title": "Test Task",
+                "priority": 3,
+                "due_date": "2000-02-01T15:00:00",
+            },
+        )
+        response = test_client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
@@ -0,0 +1,49 @@
+"""Integration tests for the task stats API endpoint."""
+
+from fastapi.testclient import TestClient
+
+
+class TestTaskStatsApi:
+    """Tests for the task stats API endpoint."""
+
+    def test_count_created_tasks(
+        self,
+        test_client: TestClient,
+        create_tasks_url: str,
+        task_stats_url: str,
+    ) -> None:
+        """Test that the created tasks are counted per priority."""
+        before = test_client.get(task_stats_url).json()
+        response = test_client.post(
+            create_tasks_url,
+            json=[
+                {
+                    "title": "Overdue",
+                    "priority": 1,
+                    "due_date": "2000-01-01T00:00:00",
+                },
+                {
+                    "title": "Upcoming",
+                    "priority": 1,
+                    "due_date": "2999-01-01T00:00:00+02:00",
+                },
+            ],
+        )
+        assert response.status_code == 200
+
+        response = test_client.get(task_stats_url)
+
+        assert response.status_code == 200
+        after = response.json()
+        assert after["total"] - before["total"] == 2
+        assert after["overdue"] - before["overdue"] == 1
+        assert after["completed"] == before["completed"]
+        assert [counts["priority"] for counts in after["priorities"]] == [
+            1,
+            2,
+            3,
+        ]
+        high_before, high_after = (
+            stats["priorities"][0] for stats in (before, after)
+        )
+        assert high_after["total"] - high_before["total"] == 2
@@ -0,0 +1,91 @@
+"""Integration tests for the update and delete tasks by filter APIs."""
+
+from typing import Generator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+class TestUpdateDeleteTasksApi:
+    """Tests for the update and delete tasks by filter API endpoints."""
+
+    @pytest.fixture(autouse=True)
+    def tasks(
+        self,
+        test_app: FastAPI,
+        test_client: TestClient,
+        create_tasks_url: str,
+    ) -> Generator[list[int], None, None]:
+        """Create tasks to filter, clean them up after each test."""
+        response = test_client.post(
+            create_tasks_url,
+            json=[
+                {
+                    "title": f"Filtered {number}",
+                    "priority": 3 if number % 2 else 1,
+                    "due_date": "2000-02-01T15:00:00",
+                }
+                for number in range(4)
+            ],
+        )
+        yield response.json()["ids"]
+        task_repository = test_app.state.task_repository
+        with task_repository._write_connection() as conn:
+            conn.execute("DELETE FROM tasks")
+            conn.commit()
+
+    def test_update_matching_tasks(
+        self,
+        test_client: TestClient,
+        update_tasks_url: str,
+        query_tasks_url: str,
+    ) -> None:
+        """Test that the tasks matching the filters are updated."""
+        response = test_client.patch(
+            f"{update_tasks_url}?priority=3&title=Filtered",
+            json={"completed": True},
+        )
+        assert response.status_code == 200
+        assert response.json() == {"count": 2, "dry_run": False}
+
+        response = test_client.get(f"{query_tasks_url}?completed=true")
+        titles = [task["title"] for task in response.json()["tasks"]]
+        assert titles == ["Filtered 1", "Filtered 3"]
+
+    def test_delete_matching_tasks(
+        self,
+        test_client: TestClient,
+        delete_tasks_url: str,
+        query_tasks_url: str,
+    ) -> None:
+        """Test that the tasks matching the filters are deleted."""
+        response = test_client.delete(f"{delete_tasks_url}?priority=1")
+        assert response.status_code == 200
+        assert response.json() == {"count": 2, "dry_run": False}
+
+        response = test_client.get(f"{query_tasks_url}?title=Filtered")
+        titles = [task["title"] for task in response.json()["tasks"]]
+        assert titles == ["Filtered 1", "Filtered 3"]
+
+    def test_dry_run_leaves_tasks(
+        self,
+        test_client: TestClient,
+        delete_tasks_url: str,
+        query_tasks_url: str,
+    ) -> None:
+        """Test that a dry run only reports the number of tasks."""
+        response = test_client.delete(
+            f"{delete_tasks_url}?title=Filtered&dry_run=true"
+        )
+        assert response.json() == {"count": 4, "dry_run": True}
+
+        response = test_client.get(f"{query_tasks_url}?title=Filtered")
+        assert len(response.json()["tasks"]) == 4
+
+    def test_return_400_without_filter(
+        self, test_client: TestClient, delete_tasks_url: str
+    ) -> None:
+        """Test that a change to all the tasks must be filtered."""
+        response = test_client.delete(delete_tasks_url)
+        assert response.status_code == 400
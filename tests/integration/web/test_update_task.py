@@ -6,18 +6,18 @@ import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
-from app.dependencies import get_task_repository
-
 
 class TestUpdateTaskApi:
     """Tests for the update task API endpoint."""
 
     @pytest.fixture(autouse=True)
-    def cleanup(self) -> Generator[None, None, None]:
+    def cleanup(
+        self, test_app: FastAPI, test_client: TestClient
+    ) -> Generator[None, None, None]:
         """Cleanup tasks after each test."""
         yield
-        task_repository = get_task_repository()
-        with task_repository._get_connection() as conn:
+        task_repository = test_app.state.task_repository
+        with task_repository._write_connection() as conn:
             conn.execute("DELETE FROM tasks")
             conn.commit()
 
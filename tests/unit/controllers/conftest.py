@@ -4,10 +4,10 @@ from unittest.mock import MagicMock, create_autospec
 
 import pytest
 
-from app.persistence.task_repository import TaskRepository
+from app.persistence.async_task_repository import AsyncTaskRepository
 
 
 @pytest.fixture
 def task_repository() -> MagicMock:
-    """Fixture to provide a mock TaskRepository."""
-    return create_autospec(TaskRepository)
+    """Fixture to provide a mock AsyncTaskRepository."""
+    return create_autospec(AsyncTaskRepository)
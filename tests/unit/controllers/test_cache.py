@@ -0,0 +1,94 @@
+"""Unit tests for the LRUCache class."""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.controllers.cache import LRUCache
+
+
+class TestLRUCache:
+    """Tests for the LRUCache class."""
+
+    def test_return_cached_value(self) -> None:
+        """Test that a cached value is returned and counted as a hit."""
+        cache: LRUCache[int, str] = LRUCache(2)
+        cache.put(1, "one")
+        assert cache[1] == "one"
+        with pytest.raises(KeyError):
+            cache[2]
+        stats = cache.stats()
+        assert (stats.size, stats.hits, stats.misses) == (1, 1, 1)
+
+    def test_evict_least_recently_used(self) -> None:
+        """Test that the least recently used entry makes room."""
+        cache: LRUCache[int, str] = LRUCache(2)
+        cache.put(1, "one")
+        cache.put(2, "two")
+        assert cache[1] == "one"
+        cache.put(3, "three")
+        with pytest.raises(KeyError):
+            cache[2]
+        assert cache[1] == "one"
+        assert cache[3] == "three"
+        assert cache.stats().evictions == 1
+
+    def test_expire_entries(self) -> None:
+        """Test that the entries expire after their TTL."""
+        cache: LRUCache[int, str | None] = LRUCache(2, ttl=10)
+        with patch("app.controllers.cache.time.monotonic", return_value=0):
+            cache.put(1, "one")
+            cache.put(2, None, ttl=1)
+        with patch("app.controllers.cache.time.monotonic", return_value=5):
+            assert cache[1] == "one"
+            with pytest.raises(KeyError):
+                cache[2]
+        with patch("app.controllers.cache.time.monotonic", return_value=10):
+            with pytest.raises(KeyError):
+                cache[1]
+        assert len(cache) == 0
+
+    def test_keep_entries_without_ttl(self) -> None:
+        """Test that the entries without TTL only leave when evicted."""
+        cache: LRUCache[int, str] = LRUCache(1)
+        cache.put(1, "one")
+        with patch("app.controllers.cache.time.monotonic", return_value=1e12):
+            assert cache[1] == "one"
+
+    def test_discard_and_clear(self) -> None:
+        """Test removing the entries."""
+        cache: LRUCache[int, str] = LRUCache(3)
+        cache.put(1, "one")
+        cache.put(2, "two")
+        cache.discard(1)
+        cache.discard(1)
+        assert len(cache) == 1
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.stats().weight == 0
+
+    def test_evict_by_weight(self) -> None:
+        """Test that a weighed cache is bounded by the sum of the weights."""
+        cache: LRUCache[int, str] = LRUCache(5, weigher=len)
+        cache.put(1, "ab")
+        cache.put(2, "cd")
+        cache.put(1, "abc")
+        assert cache.stats().weight == 5
+        cache.put(3, "e")
+        with pytest.raises(KeyError):
+            cache[2]
+        stats = cache.stats()
+        assert (stats.size, stats.weight, stats.evictions) == (2, 4, 1)
+
+    def test_skip_value_heavier_than_cache(self) -> None:
+        """Test that a value heavier than the cache is not cached."""
+        cache: LRUCache[int, str] = LRUCache(2, weigher=len)
+        cache.put(1, "abc")
+        assert len(cache) == 0
+
+    def test_disabled_cache_stores_nothing(self) -> None:
+        """Test that a cache without room stores nothing."""
+        cache: LRUCache[int, str] = LRUCache(0)
+        cache.put(1, "one")
+        assert len(cache) == 0
+        assert cache.stats().evictions == 0
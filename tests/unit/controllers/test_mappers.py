@@ -76,6 +76,24 @@ class TestPersistenceToTaskMapper:
         )
         assert actual == expected
 
+    def test_convert_with_fields(self) -> None:
+        """Test that only the given fields are set on the task."""
+        persistence_task = PersistenceTask(
+            id=1,
+            title="Test Task",
+            priority=Priority.MEDIUM,
+            due_date=date(2023, 12, 31),
+            description="Test description",
+            completed=False,
+        )
+        actual = PersistenceToTaskMapper.convert(
+            persistence_task, ("id", "title")
+        )
+        assert actual.model_dump(exclude_unset=True) == {
+            "id": 1,
+            "title": "Test Task",
+        }
+
 
 class TestCreateRequestToPersistenceMapper:
     """Tests for CreateRequestToPersistenceMapper."""
@@ -1,19 +1,25 @@
 """Unit tests for the TaskController class."""
 
+from collections.abc import AsyncIterator
 from datetime import datetime
 from unittest.mock import MagicMock
 
 import pytest
 
+from app.controllers.config import CacheConfig
 from app.controllers.exception import NotFoundError
-from app.controllers.task import TaskController
-from app.persistence.schemas import QueryParams
+from app.controllers.task import JsonTaskPage, TaskController
+from app.persistence.schemas import QueryParams, SortKey, TaskGroupStats
 from app.persistence.schemas import Task as PersistenceTask
 from app.schemas import (
     CreateTaskRequest,
     Priority,
+    PriorityCounts,
+    SortField,
     Task,
+    TaskFilterParams,
     TaskQueryParams,
+    TaskStats,
     UpdateTaskRequest,
 )
 
@@ -26,7 +32,8 @@ class TestTaskController:
         """Fixture to provide a TaskController instance."""
         return TaskController(task_repository)
 
-    def test_return_on_create(
+    @pytest.mark.anyio
+    async def test_return_on_create(
         self,
         controller: TaskController,
         create_task_request: CreateTaskRequest,
@@ -36,7 +43,7 @@ class TestTaskController:
     ) -> None:
         """Test that create_task returns a Task object."""
         task_repository.add.return_value = mock_saved_task
-        actual = controller.create(create_task_request)
+        actual = await controller.create(create_task_request)
         expected = Task(
             id=1,
             title="Test Task",
@@ -47,7 +54,24 @@ class TestTaskController:
         )
         assert expected == actual
 
-    def test_return_on_get_without_params(
+    @pytest.mark.anyio
+    async def test_return_ids_on_create_many(
+        self,
+        controller: TaskController,
+        create_task_request: CreateTaskRequest,
+        task_repository: MagicMock,
+    ) -> None:
+        """Test that create_many returns the IDs of the tasks."""
+        task_repository.add_many.return_value = [1, 2]
+        actual = await controller.create_many([create_task_request] * 2)
+        (data_models,) = task_repository.add_many.call_args.args
+        assert len(data_models) == 2
+        assert data_models[0].title == create_task_request.title
+        assert data_models[0].completed is False
+        assert actual == [1, 2]
+
+    @pytest.mark.anyio
+    async def test_return_on_get_without_params(
         self,
         controller: TaskController,
         task_repository: MagicMock,
@@ -56,11 +80,8 @@ class TestTaskController:
         mock_task_response: Task,
     ) -> None:
         """Test that get returns a list of Task objects."""
-        task_repository.query.side_effect = [
-            [mock_saved_task],
-            [mock_saved_task],
-        ]
-        actual_tasks, actual_total = controller.get(TaskQueryParams())
+        task_repository.query_page.return_value = ([mock_saved_task], 1)
+        actual_tasks, actual_total = await controller.get(TaskQueryParams())
         task = Task(
             id=1,
             title="Test Task",
@@ -70,11 +91,12 @@ class TestTaskController:
             completed=False,
         )
         expected_tasks = [task]
-        task_repository.query.assert_called()
+        task_repository.query_page.assert_called_once()
         assert expected_tasks == actual_tasks
         assert actual_total == 1
 
-    def test_return_on_get_with_params(
+    @pytest.mark.anyio
+    async def test_return_on_get_with_params(
         self,
         controller: TaskController,
         task_repository: MagicMock,
@@ -82,11 +104,8 @@ class TestTaskController:
         mock_saved_task: PersistenceTask,
     ) -> None:
         """Test that get returns a list of Task objects."""
-        task_repository.query.side_effect = [
-            [mock_saved_task],
-            [mock_saved_task],
-        ]
-        actual_tasks, actual_total = controller.get(
+        task_repository.query_page.return_value = ([mock_saved_task], 1)
+        actual_tasks, actual_total = await controller.get(
             TaskQueryParams(
                 priority=Priority.MEDIUM.value,
                 completed=False,
@@ -103,11 +122,122 @@ class TestTaskController:
             completed=False,
         )
         expected_tasks = [task]
-        task_repository.query.assert_called()
+        task_repository.query_page.assert_called_once()
         assert expected_tasks == actual_tasks
         assert actual_total == 1
 
-    def test_return_on_get_by_id(
+    @pytest.mark.anyio
+    async def test_get_sorted_in_date_range(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        mock_due_date: datetime,
+    ) -> None:
+        """Test that the sort and due date range reach the repository."""
+        task_repository.query_page.return_value = ([], 0)
+        await controller.get(
+            TaskQueryParams(sort="-due_date,title", due_before=mock_due_date)
+        )
+        kwargs = task_repository.query_page.call_args.kwargs
+        assert kwargs["query_params"].due_before == mock_due_date
+        assert kwargs["sort"] == [
+            SortKey(field=SortField.DUE_DATE, descending=True),
+            SortKey(field=SortField.TITLE),
+        ]
+
+    @pytest.mark.anyio
+    async def test_return_on_get_after(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        mock_saved_task: PersistenceTask,
+        mock_task_response: Task,
+    ) -> None:
+        """Test that get_after fetches one task past the page size."""
+        task_repository.query_after.return_value = [mock_saved_task] * 2
+        actual_tasks, has_more = await controller.get_after(
+            TaskQueryParams(page_size=1), after_id=7
+        )
+        task_repository.query_after.assert_called_once_with(
+            query_params=QueryParams(),
+            limit=2,
+            after_id=7,
+            fields=None,
+        )
+        assert actual_tasks == [mock_task_response]
+        assert has_more
+
+    @pytest.mark.anyio
+    async def test_return_on_get_columns(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+    ) -> None:
+        """Test that get_columns returns the columns of the repository."""
+        task_repository.query_page_columns.return_value = ({"id": [1]}, 1)
+        actual = await controller.get_columns(
+            TaskQueryParams(page_number=2, fields="id")
+        )
+        task_repository.query_page_columns.assert_called_once_with(
+            query_params=QueryParams(),
+            limit=15,
+            offset=15,
+            order_by_relevance=False,
+            sort=[],
+            fields=("id",),
+        )
+        assert actual == ({"id": [1]}, 1)
+
+    @pytest.mark.parametrize(
+        ("ids", "expected_ids", "expected_has_more"),
+        [([3, 4, 5], [3, 4], True), ([3], [3], False)],
+    )
+    @pytest.mark.anyio
+    async def test_return_on_get_columns_after(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        ids: list[int],
+        expected_ids: list[int],
+        expected_has_more: bool,
+    ) -> None:
+        """Test that get_columns_after cuts the columns to the page size."""
+        task_repository.query_after_columns.return_value = {
+            "id": ids,
+            "title": [str(id) for id in ids],
+        }
+        columns, has_more = await controller.get_columns_after(
+            TaskQueryParams(page_size=2, fields="title"), after_id=2
+        )
+        task_repository.query_after_columns.assert_called_once_with(
+            query_params=QueryParams(),
+            limit=3,
+            after_id=2,
+            fields=("id", "title"),
+        )
+        assert columns == {
+            "id": expected_ids,
+            "title": [str(id) for id in expected_ids],
+        }
+        assert has_more is expected_has_more
+
+    @pytest.mark.anyio
+    async def test_return_last_page_on_get_after(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        mock_saved_task: PersistenceTask,
+    ) -> None:
+        """Test that a short page is reported as the last one."""
+        task_repository.query_after.return_value = [mock_saved_task]
+        actual_tasks, has_more = await controller.get_after(
+            TaskQueryParams(page_size=1), after_id=None
+        )
+        assert len(actual_tasks) == 1
+        assert not has_more
+
+    @pytest.mark.anyio
+    async def test_return_on_get_by_id(
         self,
         controller: TaskController,
         task_repository: MagicMock,
@@ -116,7 +246,7 @@ class TestTaskController:
     ) -> None:
         """Test that get_by_id returns a Task object."""
         task_repository.query.return_value = [mock_saved_task]
-        actual = controller.get_by_id(1)
+        actual = await controller.get_by_id(1)
         expected = Task(
             id=1,
             title="Test Task",
@@ -125,10 +255,13 @@ class TestTaskController:
             description="Test description",
             completed=False,
         )
-        task_repository.query.assert_called_once_with(QueryParams(id=1))
+        task_repository.query.assert_called_once_with(
+            QueryParams(id=1), fields=None
+        )
         assert expected == actual
 
-    def test_raise_not_found_error_on_get_by_id(
+    @pytest.mark.anyio
+    async def test_raise_not_found_error_on_get_by_id(
         self,
         controller: TaskController,
         task_repository: MagicMock,
@@ -136,20 +269,22 @@ class TestTaskController:
         """Test that get_by_id raises Not Found Error when no task is found."""
         task_repository.query.return_value = []
         with pytest.raises(NotFoundError):
-            controller.get_by_id(1)
+            await controller.get_by_id(1)
 
-    def test_raise_not_found_error_on_update(
+    @pytest.mark.anyio
+    async def test_raise_not_found_error_on_update(
         self,
         controller: TaskController,
         task_repository: MagicMock,
         update_task_request: UpdateTaskRequest,
     ) -> None:
         """Test that update raises Not Found Error when no task is found."""
-        task_repository.query.return_value = []
+        task_repository.update.return_value = None
         with pytest.raises(NotFoundError):
-            controller.update(1, update_task_request)
+            await controller.update(1, update_task_request)
 
-    def test_return_on_update(
+    @pytest.mark.anyio
+    async def test_return_on_update(
         self,
         controller: TaskController,
         task_repository: MagicMock,
@@ -157,33 +292,508 @@ class TestTaskController:
         mock_saved_task: PersistenceTask,
         updated_task: Task,
     ) -> None:
-        """Test that update returns an updated Task object."""
-        task_repository.query.side_effect = [[mock_saved_task], [updated_task]]
-        task_repository.update.return_value = None
+        """Test that update returns the task read back by the update."""
+        task_repository.update.return_value = PersistenceTask.model_validate(
+            updated_task.model_dump()
+        )
 
-        actual = controller.update(1, update_task_request)
+        actual = await controller.update(1, update_task_request)
 
         assert actual == updated_task
         task_repository.update.assert_called_once()
+        task_repository.query.assert_not_called()
 
-    def test_raise_not_found_error_on_delete(
+    @pytest.mark.anyio
+    async def test_raise_not_found_error_on_delete(
         self,
         controller: TaskController,
         task_repository: MagicMock,
     ) -> None:
         """Test that delete raises Not Found Error when no task is found."""
-        task_repository.query.return_value = []
+        task_repository.delete.return_value = None
         with pytest.raises(NotFoundError):
-            controller.delete(1)
+            await controller.delete(1)
 
-    def test_repo_delete_called_on_delete(
+    @pytest.mark.anyio
+    async def test_repo_delete_called_on_delete(
         self,
         controller: TaskController,
         task_repository: MagicMock,
         mock_saved_task: PersistenceTask,
     ) -> None:
         """Test that delete calls the repository's delete method."""
-        task_repository.query.return_value = [mock_saved_task]
-        task_repository.delete.return_value = None
-        controller.delete(1)
+        task_repository.delete.return_value = mock_saved_task
+        await controller.delete(1)
         task_repository.delete.assert_called_once_with(id=1)
+        task_repository.query.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_return_count_on_update_where(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        update_task_request: UpdateTaskRequest,
+    ) -> None:
+        """Test that update_where updates the tasks matching the filters."""
+        task_repository.update_where.return_value = 3
+        actual = await controller.update_where(
+            TaskFilterParams(completed=False), update_task_request
+        )
+        query_params, persistence_request = (
+            task_repository.update_where.call_args.args
+        )
+        assert query_params == QueryParams(completed=False)
+        assert persistence_request.title == update_task_request.title
+        assert actual == 3
+
+    @pytest.mark.anyio
+    async def test_return_count_on_delete_where(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+    ) -> None:
+        """Test that delete_where deletes the tasks matching the filters."""
+        task_repository.delete_where.return_value = 2
+        actual = await controller.delete_where(TaskFilterParams(title="Old"))
+        task_repository.delete_where.assert_called_once_with(
+            QueryParams(title="Old")
+        )
+        assert actual == 2
+
+    @pytest.mark.parametrize("method", ["update_where", "delete_where"])
+    @pytest.mark.anyio
+    async def test_only_count_on_dry_run(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        update_task_request: UpdateTaskRequest,
+        method: str,
+    ) -> None:
+        """Test that a dry run counts the tasks without changing them."""
+        task_repository.count.return_value = 4
+        filters = TaskFilterParams(completed=True)
+        if method == "update_where":
+            actual = await controller.update_where(
+                filters, update_task_request, dry_run=True
+            )
+        else:
+            actual = await controller.delete_where(filters, dry_run=True)
+        task_repository.count.assert_called_once_with(
+            QueryParams(completed=True)
+        )
+        task_repository.update_where.assert_not_called()
+        task_repository.delete_where.assert_not_called()
+        assert actual == 4
+
+    @pytest.mark.anyio
+    async def test_return_batches_on_export(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        mock_saved_task: PersistenceTask,
+        mock_task_response: Task,
+    ) -> None:
+        """Test that export converts every batch of tasks."""
+
+        async def iterate(
+            query_params: QueryParams, batch_size: int
+        ) -> AsyncIterator[list[PersistenceTask]]:
+            yield [mock_saved_task] * batch_size
+            yield [mock_saved_task]
+
+        task_repository.iterate.side_effect = iterate
+        batches = [
+            batch
+            async for batch in controller.export(
+                TaskFilterParams(completed=False), 2
+            )
+        ]
+        assert batches == [[mock_task_response] * 2, [mock_task_response]]
+        task_repository.iterate.assert_called_once_with(
+            QueryParams(completed=False), 2
+        )
+
+    @pytest.mark.anyio
+    async def test_stats_per_priority(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+    ) -> None:
+        """Test that the groups are summed overall and per priority."""
+        task_repository.stats.return_value = [
+            TaskGroupStats(
+                priority=Priority.HIGH, completed=False, count=3, overdue=2
+            ),
+            TaskGroupStats(
+                priority=Priority.HIGH, completed=True, count=1, overdue=0
+            ),
+            TaskGroupStats(
+                priority=Priority.LOW, completed=True, count=4, overdue=0
+            ),
+        ]
+        actual = await controller.stats()
+        assert actual == TaskStats(
+            total=8,
+            completed=5,
+            overdue=2,
+            priorities=[
+                PriorityCounts(
+                    priority=Priority.HIGH, total=4, completed=1, overdue=2
+                ),
+                PriorityCounts(
+                    priority=Priority.MEDIUM, total=0, completed=0, overdue=0
+                ),
+                PriorityCounts(
+                    priority=Priority.LOW, total=4, completed=4, overdue=0
+                ),
+            ],
+        )
+        (now,) = task_repository.stats.call_args.args
+        assert now.tzinfo is not None
+
+
+class TestTaskControllerCache:
+    """Test suite for the task cache of the TaskController class."""
+
+    @pytest.fixture
+    def controller(self, task_repository: MagicMock) -> TaskController:
+        """Fixture to provide a TaskController caching tasks."""
+        return TaskController(task_repository, CacheConfig(task_cache_size=8))
+
+    @pytest.mark.anyio
+    async def test_get_by_id_served_from_cache(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        mock_saved_task: PersistenceTask,
+        mock_task_response: Task,
+    ) -> None:
+        """Test that a task read twice is only queried once."""
+        task_repository.query.return_value = [mock_saved_task]
+        assert await controller.get_by_id(1) == mock_task_response
+        assert await controller.get_by_id(1) == mock_task_response
+        task_repository.query.assert_called_once()
+        stats = controller.task_cache.stats()
+        assert (stats.hits, stats.misses) == (1, 1)
+
+    @pytest.mark.anyio
+    async def test_partial_read_not_cached(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        mock_saved_task: PersistenceTask,
+        mock_task_response: Task,
+    ) -> None:
+        """Test that a partial task is read with its version...
+
+        and not cached, while a cached full task serves partial reads.
+        """
+        task_repository.query.return_value = [mock_saved_task]
+        partial, version = await controller.get_versioned_by_id(
+            1, ("id", "title")
+        )
+        task_repository.query.assert_called_once_with(
+            QueryParams(id=1), fields=("id", "title", "version")
+        )
+        assert partial.model_fields_set == {"id", "title"}
+        assert version == mock_saved_task.version
+        assert len(controller.task_cache) == 0
+
+        await controller.get_by_id(1)
+        cached, _ = await controller.get_versioned_by_id(1, ("id", "title"))
+        assert cached == mock_task_response
+        assert task_repository.query.call_count == 2
+
+    @pytest.mark.anyio
+    async def test_not_found_cached(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+    ) -> None:
+        """Test that a missing task is cached as missing."""
+        task_repository.query.return_value = []
+        for _ in range(2):
+            with pytest.raises(NotFoundError):
+                await controller.get_by_id(1)
+        task_repository.query.assert_called_once()
+
+    @pytest.mark.anyio
+    async def test_create_replaces_cached_not_found(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        create_task_request: CreateTaskRequest,
+        mock_saved_task: PersistenceTask,
+        mock_task_response: Task,
+    ) -> None:
+        """Test that a created task is cached in place of a missing ID."""
+        task_repository.query.return_value = []
+        with pytest.raises(NotFoundError):
+            await controller.get_by_id(1)
+        task_repository.add.return_value = mock_saved_task
+        await controller.create(create_task_request)
+        assert await controller.get_by_id(1) == mock_task_response
+        task_repository.query.assert_called_once()
+
+    @pytest.mark.anyio
+    async def test_create_many_discards_cached_ids(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that the IDs created in bulk are no longer cached."""
+        task_repository.query.return_value = []
+        with pytest.raises(NotFoundError):
+            await controller.get_by_id(1)
+        task_repository.add_many.return_value = [1]
+        await controller.create_many([create_task_request])
+        assert len(controller.task_cache) == 0
+
+    @pytest.mark.anyio
+    async def test_update_refreshes_cache(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        update_task_request: UpdateTaskRequest,
+        mock_saved_task: PersistenceTask,
+        updated_task: Task,
+    ) -> None:
+        """Test that the updated task replaces the cached one."""
+        task_repository.query.return_value = [mock_saved_task]
+        await controller.get_by_id(1)
+        task_repository.update.return_value = PersistenceTask.model_validate(
+            updated_task.model_dump()
+        )
+        await controller.update(1, update_task_request)
+        assert await controller.get_by_id(1) == updated_task
+        task_repository.query.assert_called_once()
+
+    @pytest.mark.anyio
+    async def test_delete_caches_not_found(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        mock_saved_task: PersistenceTask,
+    ) -> None:
+        """Test that a deleted task is cached as missing."""
+        task_repository.query.return_value = [mock_saved_task]
+        await controller.get_by_id(1)
+        task_repository.delete.return_value = mock_saved_task
+        await controller.delete(1)
+        with pytest.raises(NotFoundError):
+            await controller.get_by_id(1)
+        task_repository.query.assert_called_once()
+
+    @pytest.mark.parametrize("method", ["update_where", "delete_where"])
+    @pytest.mark.anyio
+    async def test_bulk_change_clears_cache(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        update_task_request: UpdateTaskRequest,
+        mock_saved_task: PersistenceTask,
+        method: str,
+    ) -> None:
+        """Test that a change by filter empties the cache."""
+        task_repository.query.return_value = [mock_saved_task]
+        await controller.get_by_id(1)
+        if method == "update_where":
+            await controller.update_where(
+                TaskFilterParams(completed=False), update_task_request
+            )
+        else:
+            await controller.delete_where(TaskFilterParams(completed=False))
+        assert len(controller.task_cache) == 0
+
+    @pytest.mark.anyio
+    async def test_read_overlapping_write_not_cached(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        mock_saved_task: PersistenceTask,
+    ) -> None:
+        """Test that a read racing a write does not cache stale data."""
+
+        async def query_during_delete(
+            query_params: QueryParams, fields: None
+        ) -> list[PersistenceTask]:
+            task_repository.delete.return_value = mock_saved_task
+            await controller.delete(2)
+            return [mock_saved_task]
+
+        task_repository.query.side_effect = query_during_delete
+        await controller.get_by_id(1)
+        assert 1 not in controller.task_cache._entries
+
+    @pytest.mark.anyio
+    async def test_version_served_from_cache(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        mock_saved_task: PersistenceTask,
+    ) -> None:
+        """Test that the version of a cached task is not queried."""
+        task_repository.task_version.return_value = 1
+        assert await controller.get_version(1) == 1
+        task_repository.task_version.assert_called_once_with(1)
+
+        task_repository.query.return_value = [
+            mock_saved_task.model_copy(update={"version": 4})
+        ]
+        await controller.get_versioned_by_id(1)
+        assert await controller.get_version(1) == 4
+        task_repository.delete.return_value = mock_saved_task
+        await controller.delete(1)
+        assert await controller.get_version(1) is None
+        task_repository.task_version.assert_called_once()
+
+    @pytest.mark.anyio
+    async def test_data_version(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+    ) -> None:
+        """Test that the data version comes from the repository."""
+        task_repository.data_version.return_value = "epoch.1"
+        assert await controller.get_data_version() == "epoch.1"
+
+    @pytest.mark.anyio
+    async def test_data_version_cached_between_writes(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        mock_saved_task: PersistenceTask,
+        create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that the data version is only read again after a write."""
+        task_repository.data_version.side_effect = ["epoch.1", "epoch.2"]
+        task_repository.add.return_value = mock_saved_task
+        assert await controller.get_data_version() == "epoch.1"
+        assert await controller.get_data_version() == "epoch.1"
+        await controller.create(create_task_request)
+        assert await controller.get_data_version() == "epoch.2"
+        assert task_repository.data_version.call_count == 2
+
+    @pytest.mark.anyio
+    async def test_data_version_read_during_write_not_cached(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        mock_saved_task: PersistenceTask,
+    ) -> None:
+        """Test that a data version racing a write is not cached."""
+
+        async def data_version_during_delete() -> str:
+            task_repository.delete.return_value = mock_saved_task
+            await controller.delete(1)
+            return "epoch.1"
+
+        task_repository.data_version.side_effect = data_version_during_delete
+        await controller.get_data_version()
+        await controller.get_data_version()
+        assert task_repository.data_version.call_count == 2
+
+    @pytest.mark.anyio
+    async def test_page_served_from_cache(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        mock_saved_task: PersistenceTask,
+        mock_task_response: Task,
+    ) -> None:
+        """Test that equal queries are only run once between writes."""
+        task_repository.query_page.return_value = ([mock_saved_task], 1)
+        first = await controller.get(TaskQueryParams(completed=False))
+        second = await controller.get(
+            TaskQueryParams.model_validate(
+                {"completed": "false", "page_size": "15"}
+            )
+        )
+        assert first == second == ([mock_task_response], 1)
+        task_repository.query_page.assert_called_once()
+        await controller.get(TaskQueryParams(completed=False, page_number=2))
+        assert task_repository.query_page.call_count == 2
+
+    @pytest.mark.parametrize(
+        ("page_number", "total", "size"), [(1, 12, 10), (2, 12, 2), (3, 12, 0)]
+    )
+    @pytest.mark.anyio
+    async def test_json_page_served_from_cache(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        page_number: int,
+        total: int,
+        size: int,
+    ) -> None:
+        """Test that the JSON pages are cached and weighed by their size."""
+        task_repository.query_page_json.return_value = ("[]", total)
+        params = TaskQueryParams(
+            page_size=10, page_number=page_number, fields="title"
+        )
+        first = await controller.get_json(params)
+        second = await controller.get_json(params)
+        assert first == second == JsonTaskPage("[]", size, total)
+        task_repository.query_page_json.assert_called_once_with(
+            query_params=QueryParams(),
+            limit=10,
+            offset=10 * (page_number - 1),
+            order_by_relevance=False,
+            sort=[],
+            fields=("id", "title"),
+        )
+        assert controller.json_page_cache.stats().weight == size + 1
+
+    @pytest.mark.anyio
+    async def test_write_invalidates_pages(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        mock_saved_task: PersistenceTask,
+    ) -> None:
+        """Test that a write makes the cached pages stale."""
+        task_repository.query_page.return_value = ([mock_saved_task], 1)
+        await controller.get(TaskQueryParams())
+        task_repository.delete.return_value = mock_saved_task
+        await controller.delete(1)
+        task_repository.query_page.return_value = ([], 0)
+        assert await controller.get(TaskQueryParams()) == ([], 0)
+        assert task_repository.query_page.call_count == 2
+
+    @pytest.mark.anyio
+    async def test_page_read_overlapping_write_not_served(
+        self,
+        controller: TaskController,
+        task_repository: MagicMock,
+        mock_saved_task: PersistenceTask,
+    ) -> None:
+        """Test that a page read while a write happens is not served."""
+
+        async def query_during_delete(
+            **kwargs: object,
+        ) -> tuple[list[PersistenceTask], int]:
+            task_repository.delete.return_value = mock_saved_task
+            await controller.delete(1)
+            return [mock_saved_task], 1
+
+        task_repository.query_page.side_effect = query_during_delete
+        await controller.get(TaskQueryParams())
+        await controller.get(TaskQueryParams())
+        assert task_repository.query_page.call_count == 2
+
+    @pytest.mark.anyio
+    async def test_pages_bounded_by_number_of_tasks(
+        self,
+        task_repository: MagicMock,
+        mock_saved_task: PersistenceTask,
+    ) -> None:
+        """Test that the cached pages hold at most query_cache_size tasks."""
+        controller = TaskController(
+            task_repository, CacheConfig(query_cache_size=4)
+        )
+        task_repository.query_page.return_value = ([mock_saved_task] * 2, 9)
+        await controller.get(TaskQueryParams(page_number=1))
+        await controller.get(TaskQueryParams(page_number=2))
+        stats = controller.query_cache.stats()
+        assert (stats.size, stats.weight, stats.evictions) == (1, 3, 1)
@@ -1,18 +1,36 @@
 """Fixtures for persistent unit tests."""
 
 from datetime import datetime
+from typing import Generator
 
 import pytest
 
+from app.persistence.config import DatabaseConfig
 from app.persistence.schemas import CreateTaskRequest
 from app.persistence.task_repository import TaskRepository
 from app.schemas import Priority
 
 
 @pytest.fixture
-def repository() -> TaskRepository:
+def anyio_backend() -> str:
+    """Fixture pinning async tests to asyncio, which runs the executor."""
+    return "asyncio"
+
+
+@pytest.fixture
+def database_config() -> DatabaseConfig:
+    """Fixture for the database config."""
+    return DatabaseConfig(db_name="tasks.db")
+
+
+@pytest.fixture
+def repository(
+    database_config: DatabaseConfig,
+) -> Generator[TaskRepository, None, None]:
     """Fixture to create a TaskRepository instance."""
-    return TaskRepository("tasks.db")
+    repository = TaskRepository(database_config)
+    yield repository
+    repository.close()
 
 
 @pytest.fixture
@@ -0,0 +1,130 @@
+"""Unit tests for the AsyncTaskRepository class."""
+
+import threading
+from typing import Generator
+from unittest.mock import patch
+
+import pytest
+
+from app.persistence.async_task_repository import AsyncTaskRepository
+from app.persistence.schemas import (
+    CreateTaskRequest,
+    QueryParams,
+    UpdateTaskRequest,
+)
+from app.persistence.task_repository import TaskRepository
+
+
+class TestAsyncTaskRepository:
+    """Tests for the AsyncTaskRepository class."""
+
+    @pytest.fixture
+    def async_repository(
+        self, repository: TaskRepository
+    ) -> Generator[AsyncTaskRepository, None, None]:
+        """Fixture for the async repository, cleans up after each test."""
+        async_repository = AsyncTaskRepository(repository, max_workers=2)
+        yield async_repository
+        with repository._write_connection() as conn:
+            conn.execute("DELETE FROM tasks")
+        async_repository.close()
+
+    @pytest.mark.anyio
+    async def test_crud_round_trip(
+        self,
+        async_repository: AsyncTaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that the awaitable methods reach the database."""
+        task = await async_repository.add(mock_create_task_request)
+        await async_repository.update(
+            task.id, UpdateTaskRequest(title="Updated Title")
+        )
+        actual = await async_repository.query(QueryParams(id=task.id))
+        assert actual[0].title == "Updated Title"
+
+        after = await async_repository.query_after(QueryParams(), limit=1)
+        assert after == actual
+        page, total = await async_repository.query_page_json(
+            QueryParams(), limit=1, fields=("id",)
+        )
+        assert (page, total) == (f'[{{"id":{task.id}}}]', 1)
+        columns, total = await async_repository.query_page_columns(
+            QueryParams(), limit=1, fields=("id",)
+        )
+        assert (columns, total) == ({"id": [task.id]}, 1)
+        after_columns = await async_repository.query_after_columns(
+            QueryParams(), limit=1, fields=("id",)
+        )
+        assert after_columns == columns
+
+        ids = await async_repository.add_many([mock_create_task_request])
+        assert ids == [task.id + 1]
+        assert await async_repository.count(QueryParams()) == 2
+        assert await async_repository.task_version(task.id) == 2
+        assert await async_repository.data_version()
+        groups = await async_repository.stats(task.due_date)
+        assert [(group.count, group.overdue) for group in groups] == [(2, 0)]
+        assert (
+            await async_repository.update_where(
+                QueryParams(id=ids[0]), UpdateTaskRequest(completed=True)
+            )
+            == 1
+        )
+        assert await async_repository.delete_where(QueryParams(id=ids[0])) == 1
+
+        await async_repository.delete(task.id)
+        assert await async_repository.query(QueryParams(), limit=1) == []
+
+    @pytest.mark.anyio
+    async def test_runs_on_database_executor(
+        self,
+        async_repository: AsyncTaskRepository,
+        repository: TaskRepository,
+    ) -> None:
+        """Test that the database work leaves the event loop thread."""
+        thread_names = []
+
+        def record_thread(*args: object, **kwargs: object) -> list:
+            thread_names.append(threading.current_thread().name)
+            return []
+
+        with patch.object(repository, "query", side_effect=record_thread):
+            await async_repository.query(QueryParams())
+        assert thread_names[0].startswith("db")
+
+    @pytest.mark.anyio
+    async def test_iterate_batches(
+        self,
+        async_repository: AsyncTaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that the batches are fetched through the executor."""
+        ids = await async_repository.add_many([mock_create_task_request] * 3)
+        batches = [
+            [task.id for task in batch]
+            async for batch in async_repository.iterate(QueryParams(), 2)
+        ]
+        assert batches == [ids[:2], ids[2:]]
+
+    @pytest.mark.anyio
+    async def test_iterate_closed_early_releases_connection(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that a consumer stopping early closes the iterator."""
+        async_repository = AsyncTaskRepository(repository, max_workers=1)
+        await async_repository.add_many([mock_create_task_request] * 3)
+
+        batches = async_repository.iterate(QueryParams(), 1)
+        async for _ in batches:
+            break
+        await batches.aclose()
+        # The close is queued once the batch read ahead is fetched.
+        for _ in range(2):
+            await async_repository._run(lambda: None)
+
+        assert repository.pool_stats().in_use == 0
+        await async_repository.delete_where(QueryParams())
+        async_repository.close()
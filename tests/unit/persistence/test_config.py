@@ -0,0 +1,15 @@
+"""Unit tests for the persistence config."""
+
+import pytest
+from pydantic import ValidationError
+
+from app.persistence.config import DatabaseConfig
+
+
+class TestDatabaseConfig:
+    """Tests for the DatabaseConfig class."""
+
+    def test_raise_when_pool_smaller_than_executor(self) -> None:
+        """Test that every executor thread must fit in the pool."""
+        with pytest.raises(ValidationError, match="pool_size"):
+            DatabaseConfig(pool_size=1, executor_threads=2)
@@ -0,0 +1,81 @@
+"""Unit tests for the MigrationRunner class."""
+
+import sqlite3
+from typing import Generator
+
+import pytest
+
+from app.persistence.migrations import Migration, MigrationRunner
+
+
+class TestMigrationRunner:
+    """Tests for the MigrationRunner class."""
+
+    @pytest.fixture
+    def conn(self) -> Generator[sqlite3.Connection, None, None]:
+        """Fixture for an in-memory database connection."""
+        conn = sqlite3.connect(":memory:")
+        yield conn
+        conn.close()
+
+    @pytest.fixture
+    def migrations(self) -> list[Migration]:
+        """Fixture for two migrations."""
+        return [
+            Migration(
+                version=1,
+                description="Create table.",
+                statements=("CREATE TABLE t (x INTEGER)",),
+            ),
+            Migration(
+                version=2,
+                description="Create index.",
+                statements=("CREATE INDEX ix_t_x ON t (x)",),
+            ),
+        ]
+
+    def test_apply_pending_migrations(
+        self, conn: sqlite3.Connection, migrations: list[Migration]
+    ) -> None:
+        """Test that the migrations are applied and the version tracked."""
+        assert MigrationRunner(migrations).run(conn) == 2
+        indexes = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        ).fetchall()
+        assert indexes == [("ix_t_x",)]
+
+    def test_skip_applied_migrations(
+        self, conn: sqlite3.Connection, migrations: list[Migration]
+    ) -> None:
+        """Test that only the migrations above the version are applied."""
+        MigrationRunner(migrations[:1]).run(conn)
+        assert MigrationRunner.current_version(conn) == 1
+        assert MigrationRunner(migrations).run(conn) == 2
+        assert MigrationRunner(migrations).run(conn) == 2
+
+    def test_roll_back_failed_migration(
+        self, conn: sqlite3.Connection, migrations: list[Migration]
+    ) -> None:
+        """Test that a failed migration leaves the version untouched."""
+        broken = Migration(
+            version=3,
+            description="Broken.",
+            statements=("CREATE TABLE u (x INTEGER)", "NOT SQL"),
+        )
+        with pytest.raises(sqlite3.OperationalError):
+            MigrationRunner([*migrations, broken]).run(conn)
+        assert MigrationRunner.current_version(conn) == 2
+        tables = conn.execute(
+            "SELECT name FROM sqlite_master WHERE name = 'u'"
+        ).fetchall()
+        assert tables == []
+
+    @pytest.mark.parametrize("versions", [[2, 1], [1, 1], [0, 1]])
+    def test_raise_on_invalid_versions(self, versions: list[int]) -> None:
+        """Test that the versions must be positive, unique and ordered."""
+        migrations = [
+            Migration(version=version, description="", statements=())
+            for version in versions
+        ]
+        with pytest.raises(ValueError, match="Migration versions"):
+            MigrationRunner(migrations)
@@ -0,0 +1,174 @@
+"""Unit tests for the ConnectionPool class."""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Generator
+from unittest.mock import patch
+
+import pytest
+
+from app.persistence.config import DatabaseConfig
+from app.persistence.exception import PoolClosedError, PoolTimeoutError
+from app.persistence.pool import ConnectionPool
+
+
+class TestConnectionPool:
+    """Tests for the ConnectionPool class."""
+
+    @pytest.fixture
+    def config(self, tmp_path: Path) -> DatabaseConfig:
+        """Fixture for a database config with a small pool."""
+        return DatabaseConfig(
+            db_name=str(tmp_path / "pool.db"),
+            pool_size=2,
+            executor_threads=1,
+            pool_timeout=0.05,
+        )
+
+    @pytest.fixture
+    def pool(
+        self, config: DatabaseConfig
+    ) -> Generator[ConnectionPool, None, None]:
+        """Fixture for a connection pool."""
+        pool = ConnectionPool(config)
+        yield pool
+        pool.close()
+
+    def test_pragmas_applied_to_connection(
+        self, pool: ConnectionPool, config: DatabaseConfig
+    ) -> None:
+        """Test that the configured pragmas are applied."""
+        with pool.connection() as conn:
+            journal_mode = conn.execute("PRAGMA journal_mode").fetchone()
+            synchronous = conn.execute("PRAGMA synchronous").fetchone()
+            busy_timeout = conn.execute("PRAGMA busy_timeout").fetchone()
+            cache_size = conn.execute("PRAGMA cache_size").fetchone()
+        assert journal_mode == ("wal",)
+        assert synchronous == (1,)
+        assert busy_timeout == (config.busy_timeout,)
+        assert cache_size == (config.cache_size,)
+
+    def test_connection_reused_after_checkin(
+        self, pool: ConnectionPool
+    ) -> None:
+        """Test that a returned connection is handed out again."""
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+        assert first is second
+        stats = pool.stats()
+        assert stats.created == 1
+        assert stats.checkouts == 2
+        assert stats.idle == 1
+        assert stats.in_use == 0
+
+    def test_raise_timeout_when_exhausted(self, pool: ConnectionPool) -> None:
+        """Test that checkout times out when all connections are in use."""
+        with pool.connection(), pool.connection():
+            assert pool.stats().in_use == 2
+            with pytest.raises(PoolTimeoutError):
+                pool.checkout()
+        stats = pool.stats()
+        assert stats.waits == 1
+        assert stats.timeouts == 1
+
+    def test_waiting_checkout_gets_returned_connection(
+        self, pool: ConnectionPool
+    ) -> None:
+        """Test that a waiting checkout is served by a checkin."""
+        first = pool.checkout()
+        second = pool.checkout()
+        timer = threading.Timer(0.01, pool.checkin, args=(first,))
+        timer.start()
+        actual = pool.checkout(timeout=5)
+        timer.join()
+        assert actual is first
+        pool.checkin(actual)
+        pool.checkin(second)
+
+    def test_uncommitted_transaction_rolled_back_on_checkin(
+        self, pool: ConnectionPool
+    ) -> None:
+        """Test that a connection is returned without open transaction."""
+        conn = pool.checkout()
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.execute("INSERT INTO t VALUES (1)")
+        assert conn.in_transaction
+        pool.checkin(conn)
+        with pool.connection() as conn:
+            assert not conn.in_transaction
+            assert conn.execute("SELECT COUNT(*) FROM t").fetchone() == (0,)
+
+    def test_release_slot_when_connect_fails(
+        self, pool: ConnectionPool
+    ) -> None:
+        """Test that a failed connect does not leak a pool slot."""
+        with (
+            patch.object(
+                pool,
+                "_connect",
+                side_effect=sqlite3.OperationalError("unable to open"),
+            ),
+            pytest.raises(sqlite3.OperationalError, match="unable to open"),
+        ):
+            pool.checkout()
+        assert pool.stats().open == 0
+
+    def test_reap_idle_connections(self, config: DatabaseConfig) -> None:
+        """Test that connections idle for too long are closed."""
+        pool = ConnectionPool(
+            config.model_copy(update={"pool_idle_timeout": -1})
+        )
+        conn = pool.checkout()
+        pool.checkin(conn)
+        assert pool.stats().reaped == 1
+        assert pool.stats().open == 0
+        pool.close()
+
+    def test_reap_idle_returns_number_closed(
+        self, pool: ConnectionPool
+    ) -> None:
+        """Test that reap_idle only closes expired connections."""
+        with pool.connection():
+            pass
+        assert pool.reap_idle() == 0
+        pool._config = pool._config.model_copy(
+            update={"pool_idle_timeout": -1}
+        )
+        assert pool.reap_idle() == 1
+        assert pool.stats().idle == 0
+
+    def test_raise_on_checkout_after_close(self, pool: ConnectionPool) -> None:
+        """Test that a closed pool refuses checkouts."""
+        with pool.connection():
+            pass
+        pool.close()
+        assert pool.stats().open == 0
+        with pytest.raises(PoolClosedError):
+            pool.checkout()
+
+    def test_connection_closed_on_checkin_after_close(
+        self, pool: ConnectionPool
+    ) -> None:
+        """Test that a connection returned to a closed pool is closed."""
+        conn = pool.checkout()
+        pool.close()
+        pool.checkin(conn)
+        assert pool.stats().open == 0
+
+    def test_read_only_connection_refuses_writes(
+        self, pool: ConnectionPool, config: DatabaseConfig
+    ) -> None:
+        """Test that a read-only pool cannot change the database."""
+        with pool.connection() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.commit()
+        read_only_pool = ConnectionPool(config, read_only=True)
+        with read_only_pool.connection() as conn:
+            assert conn.execute("PRAGMA query_only").fetchone() == (1,)
+            assert conn.execute("SELECT COUNT(*) FROM t").fetchone() == (0,)
+            with pytest.raises(sqlite3.OperationalError, match="readonly"):
+                conn.execute("INSERT INTO t VALUES (1)")
+        read_only_pool.close()
@@ -1,18 +1,26 @@
 """Unit tests for the TaskRepository class."""
 
-from datetime import datetime
+import json
+import sqlite3
+import threading
+from datetime import UTC, datetime
 from typing import Generator
+from unittest.mock import patch
 
 import pytest
+from pydantic import ValidationError
 
+from app.persistence.config import DatabaseConfig
 from app.persistence.schemas import (
     CreateTaskRequest,
     Priority,
     QueryParams,
+    SortKey,
     Task,
     UpdateTaskRequest,
 )
 from app.persistence.task_repository import TaskRepository
+from app.schemas import SortField
 
 
 class TestTaskRepository:
@@ -24,7 +32,7 @@ class TestTaskRepository:
     ) -> Generator[None, None, None]:
         """Cleanup the database before each test."""
         yield
-        with repository._get_connection() as conn:
+        with repository._write_connection() as conn:
             conn.execute("DELETE FROM tasks")
             conn.commit()
 
@@ -74,8 +82,8 @@ class TestTaskRepository:
         repository.add(mock_create_task_request)
         tasks = repository.query(QueryParams(priority=Priority.MEDIUM))
         assert len(tasks) == 2
-        task_1_data_dict = tasks[0].model_dump()
-        task_2_data_dict = tasks[1].model_dump()
+        task_1_data_dict = tasks[0].model_dump(exclude={"version"})
+        task_2_data_dict = tasks[1].model_dump(exclude={"version"})
         del task_1_data_dict["id"]
         del task_2_data_dict["id"]
         assert task_1_data_dict == mock_create_task_request.model_dump()
@@ -91,8 +99,8 @@ class TestTaskRepository:
         repository.add(mock_create_task_request)
         tasks = repository.query(QueryParams(completed=False))
         assert len(tasks) == 2
-        task_1_data_dict = tasks[0].model_dump()
-        task_2_data_dict = tasks[1].model_dump()
+        task_1_data_dict = tasks[0].model_dump(exclude={"version"})
+        task_2_data_dict = tasks[1].model_dump(exclude={"version"})
         del task_1_data_dict["id"]
         del task_2_data_dict["id"]
         assert task_1_data_dict == mock_create_task_request.model_dump()
@@ -108,7 +116,7 @@ class TestTaskRepository:
         actual = repository.query(QueryParams(id=task.id))
         assert isinstance(actual[0], Task)
         assert actual[0].id == task.id
-        task_1_data_dict = actual[0].model_dump()
+        task_1_data_dict = actual[0].model_dump(exclude={"version"})
         del task_1_data_dict["id"]
         assert task_1_data_dict == mock_create_task_request.model_dump()
 
@@ -122,7 +130,7 @@ class TestTaskRepository:
         actual = repository.query(QueryParams(title="Task"))
         assert isinstance(actual[0], Task)
         assert actual[0].id == task.id
-        task_1_data_dict = actual[0].model_dump()
+        task_1_data_dict = actual[0].model_dump(exclude={"version"})
         del task_1_data_dict["id"]
         assert task_1_data_dict == mock_create_task_request.model_dump()
 
@@ -136,7 +144,7 @@ class TestTaskRepository:
         actual = repository.query(QueryParams(description="description"))
         assert isinstance(actual[0], Task)
         assert actual[0].id == task.id
-        task_1_data_dict = actual[0].model_dump()
+        task_1_data_dict = actual[0].model_dump(exclude={"version"})
         del task_1_data_dict["id"]
         assert task_1_data_dict == mock_create_task_request.model_dump()
 
@@ -220,3 +228,812 @@ class TestTaskRepository:
 
         assert actual[0].title == "Task 2"
         assert actual[1].title == "Task 3"
+
+    def test_pool_stats(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that the repository reuses pooled connections."""
+        repository.add(mock_create_task_request)
+        repository.query(QueryParams())
+        stats = repository.pool_stats()
+        assert stats.created == 1
+        assert stats.in_use == 0
+
+    def test_update_without_fields(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that an empty update returns the unchanged task."""
+        task = repository.add(mock_create_task_request)
+        assert repository.update(task.id, UpdateTaskRequest()) == task
+        assert repository.update(task.id + 1, UpdateTaskRequest()) is None
+
+    def test_return_changed_task(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that update and delete return the task they changed."""
+        task = repository.add(mock_create_task_request)
+        update_request = UpdateTaskRequest(title="Updated Title")
+        updated_task = repository.update(task.id, update_request)
+        assert updated_task == task.model_copy(
+            update={"title": "Updated Title", "version": 2}
+        )
+        assert repository.delete(task.id) == updated_task
+        assert repository.delete(task.id) is None
+        assert repository.update(task.id, update_request) is None
+
+    @pytest.mark.parametrize(
+        ("condition", "index"),
+        [
+            ("priority = 1", "ix_tasks_priority"),
+            ("completed = 0", "ix_tasks_completed"),
+            ("priority = 1 AND completed = 0", "ix_tasks_priority_completed"),
+        ],
+    )
+    def test_filters_use_index_in_id_order(
+        self, repository: TaskRepository, condition: str, index: str
+    ) -> None:
+        """Test that the filters are served by an index without sorting."""
+        with repository._get_connection() as conn:
+            plan = " ".join(
+                row[3]
+                for row in conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT * FROM tasks "  # noqa: S608
+                    f"WHERE {condition} ORDER BY id"
+                )
+            )
+        assert f"USING INDEX {index}" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def _add_titled(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+        title: str,
+        description: str | None = None,
+    ) -> Task:
+        """Add a copy of the mock task with another title."""
+        return repository.add(
+            mock_create_task_request.model_copy(
+                update={"title": title, "description": description}
+            )
+        )
+
+    def test_text_filter_matches_substring_case_insensitively(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that the FTS search keeps the LIKE semantics."""
+        task = self._add_titled(
+            repository, mock_create_task_request, 'Buy "organic" milk'
+        )
+        self._add_titled(repository, mock_create_task_request, "Walk dog")
+
+        for title in ("ORGANIC", 'y "organic" m', "uy"):
+            actual = repository.query(QueryParams(title=title))
+            assert [found.id for found in actual] == [task.id]
+        assert repository.query(QueryParams(title="ilk Walk")) == []
+
+    def test_text_filter_follows_updates_and_deletes(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that the FTS index is kept in sync by the triggers."""
+        task = self._add_titled(repository, mock_create_task_request, "Alpha")
+        repository.update(task.id, UpdateTaskRequest(title="Bravo"))
+        assert repository.query(QueryParams(title="Alpha")) == []
+        assert len(repository.query(QueryParams(title="Bravo"))) == 1
+
+        repository.delete(task.id)
+        assert repository.query(QueryParams(title="Bravo")) == []
+
+    def test_order_by_relevance(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that the text matches can be ranked by relevance."""
+        weak = self._add_titled(
+            repository,
+            mock_create_task_request,
+            "report",
+            "a long description that mentions the report only once",
+        )
+        strong = self._add_titled(
+            repository, mock_create_task_request, "report", "report report"
+        )
+        params = QueryParams(description="report")
+
+        by_id = repository.query(params)
+        by_relevance = repository.query(params, order_by_relevance=True)
+
+        assert [task.id for task in by_id] == [weak.id, strong.id]
+        assert [task.id for task in by_relevance] == [strong.id, weak.id]
+
+    def test_count(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test counting the tasks matching the filters."""
+        self._add_titled(repository, mock_create_task_request, "Alpha")
+        self._add_titled(repository, mock_create_task_request, "Bravo")
+        assert repository.count(QueryParams()) == 2
+        assert repository.count(QueryParams(title="alp")) == 1
+        assert repository.count(QueryParams(priority=Priority.HIGH)) == 0
+
+    @pytest.mark.parametrize(
+        ("sort", "expected_titles"),
+        [
+            ([SortKey(field=SortField.DUE_DATE)], ["B", "C", "D", "A"]),
+            (
+                [SortKey(field=SortField.DUE_DATE, descending=True)],
+                ["A", "D", "C", "B"],
+            ),
+            (
+                [
+                    SortKey(field=SortField.PRIORITY, descending=True),
+                    SortKey(field=SortField.TITLE),
+                ],
+                ["C", "D", "A", "B"],
+            ),
+            (
+                [
+                    SortKey(field=SortField.PRIORITY),
+                    SortKey(field=SortField.ID, descending=True),
+                    SortKey(field=SortField.TITLE),
+                ],
+                ["B", "A", "D", "C"],
+            ),
+        ],
+    )
+    def test_query_page_sorted(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+        sort: list[SortKey],
+        expected_titles: list[str],
+    ) -> None:
+        """Test that the pages follow the sort keys, ties broken by id."""
+        for title, priority, due_date in (
+            ("A", Priority.HIGH, "2024-01-03T00:00:00"),
+            ("B", Priority.HIGH, "2024-01-01T12:00:00+02:00"),
+            ("C", Priority.LOW, "2024-01-01T11:00:00"),
+            ("D", Priority.LOW, "2024-01-02T00:00:00"),
+        ):
+            repository.add(
+                mock_create_task_request.model_copy(
+                    update={
+                        "title": title,
+                        "priority": priority,
+                        "due_date": datetime.fromisoformat(due_date),
+                    }
+                )
+            )
+
+        tasks, total = repository.query_page(QueryParams(), 10, sort=sort)
+
+        assert [task.title for task in tasks] == expected_titles
+        assert total == 4
+
+    def test_query_due_date_range(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that the due date range includes its start only."""
+        for due_date in (
+            "2024-01-01T00:00:00",
+            "2024-01-01T12:00:00+02:00",
+            "2024-01-02T00:00:00",
+        ):
+            repository.add(
+                mock_create_task_request.model_copy(
+                    update={
+                        "title": due_date,
+                        "due_date": datetime.fromisoformat(due_date),
+                    }
+                )
+            )
+
+        tasks = repository.query(
+            QueryParams(
+                due_after=datetime.fromisoformat("2024-01-01T10:00:00+00:00"),
+                due_before=datetime.fromisoformat("2024-01-02T00:00:00"),
+            )
+        )
+
+        assert [task.title for task in tasks] == ["2024-01-01T12:00:00+02:00"]
+        assert (
+            repository.count(
+                QueryParams(due_after=datetime.fromisoformat("2024-01-01"))
+            )
+            == 3
+        )
+
+    @pytest.mark.parametrize(
+        ("condition", "sort", "index"),
+        [
+            (
+                "1",
+                [SortKey(field=SortField.DUE_DATE)],
+                "ix_tasks_due_date",
+            ),
+            (
+                "julianday(due_date) >= julianday('2024-01-01')",
+                [SortKey(field=SortField.DUE_DATE, descending=True)],
+                "ix_tasks_due_date",
+            ),
+            (
+                "completed = 0",
+                [SortKey(field=SortField.DUE_DATE)],
+                "ix_tasks_completed_due_date",
+            ),
+            (
+                "1",
+                [SortKey(field=SortField.PRIORITY, descending=True)],
+                "ix_tasks_priority",
+            ),
+            (
+                "1",
+                [SortKey(field=SortField.TITLE, descending=True)],
+                "ix_tasks_title",
+            ),
+            (
+                "1",
+                [
+                    SortKey(field=SortField.PRIORITY),
+                    SortKey(field=SortField.DUE_DATE),
+                ],
+                "ix_tasks_priority_due_date",
+            ),
+            (
+                "priority = 2",
+                [SortKey(field=SortField.DUE_DATE)],
+                "ix_tasks_priority_due_date",
+            ),
+        ],
+    )
+    def test_sort_uses_index(
+        self,
+        repository: TaskRepository,
+        condition: str,
+        sort: list[SortKey],
+        index: str,
+    ) -> None:
+        """Test that the sorts are served by an index without sorting."""
+        with repository._get_connection() as conn:
+            plan = " ".join(
+                row[3]
+                for row in conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT * FROM tasks "  # noqa: S608
+                    f"WHERE {condition} ORDER BY {repository._order(sort)}"
+                )
+            )
+        assert f"USING INDEX {index}" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_versions_follow_writes(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that the task and data versions change with every write."""
+        versions = [repository.data_version()]
+        task = repository.add(mock_create_task_request)
+        versions.append(repository.data_version())
+        assert repository.task_version(task.id) == 1
+
+        repository.update(task.id, UpdateTaskRequest())
+        assert repository.task_version(task.id) == 1
+        assert repository.data_version() == versions[-1]
+        repository.update(task.id, UpdateTaskRequest(title="Renamed"))
+        versions.append(repository.data_version())
+        repository.update_where(
+            QueryParams(id=task.id), UpdateTaskRequest(completed=True)
+        )
+        versions.append(repository.data_version())
+        assert repository.task_version(task.id) == 3
+
+        repository.delete(task.id)
+        versions.append(repository.data_version())
+        assert repository.task_version(task.id) is None
+        assert len(set(versions)) == len(versions)
+        epochs = {version.split(".")[0] for version in versions}
+        assert len(epochs) == 1
+
+    def test_count_enum_filters_from_summary_table(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that enum-only counts do not filter the tasks."""
+        self._add_titled(repository, mock_create_task_request, "Alpha")
+        repository.add(
+            mock_create_task_request.model_copy(update={"completed": True})
+        )
+        with patch.object(repository, "_filter", side_effect=AssertionError):
+            assert repository.count(QueryParams()) == 2
+            assert repository.count(QueryParams(completed=True)) == 1
+            assert (
+                repository.count(
+                    QueryParams(priority=Priority.MEDIUM, completed=False)
+                )
+                == 1
+            )
+            assert repository.count(QueryParams(priority=Priority.LOW)) == 0
+
+    def test_stats_follow_writes(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that the summary table is kept exact by the triggers."""
+        task = repository.add(mock_create_task_request)
+        repository.add_many(
+            [
+                mock_create_task_request.model_copy(
+                    update={"priority": priority}
+                )
+                for priority in Priority
+            ]
+        )
+        repository.update(task.id, UpdateTaskRequest(priority=Priority.HIGH))
+        repository.update(task.id, UpdateTaskRequest(title="Renamed"))
+        repository.update_where(
+            QueryParams(priority=Priority.LOW),
+            UpdateTaskRequest(completed=True),
+        )
+        repository.delete_where(QueryParams(priority=Priority.MEDIUM))
+
+        with repository._get_connection() as conn:
+            expected = conn.execute(
+                "SELECT priority, completed, COUNT(*) FROM tasks "
+                "GROUP BY priority, completed"
+            ).fetchall()
+        actual = repository.stats(datetime(2000, 1, 1))
+        assert [
+            (group.priority.value, group.completed, group.count)
+            for group in actual
+        ] == expected
+        assert expected == [(1, 0, 2), (3, 1, 1)]
+
+    def test_stats_count_overdue_open_tasks(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that the open tasks due before now are overdue."""
+        repository.add_many(
+            [
+                mock_create_task_request.model_copy(
+                    update={"due_date": datetime.fromisoformat(due_date)}
+                )
+                for due_date in (
+                    "2024-01-01T11:00:00+02:00",
+                    "2024-01-01T09:30:00",
+                    "2024-01-01T10:30:00+00:00",
+                )
+            ]
+        )
+        repository.add(
+            mock_create_task_request.model_copy(
+                update={
+                    "completed": True,
+                    "due_date": datetime(2000, 1, 1),
+                }
+            )
+        )
+
+        actual = repository.stats(
+            datetime.fromisoformat("2024-01-01T10:00:00+00:00")
+        )
+
+        assert [(group.count, group.overdue) for group in actual] == [
+            (3, 2),
+            (1, 0),
+        ]
+
+    def test_overdue_count_uses_due_date_index(
+        self, repository: TaskRepository
+    ) -> None:
+        """Test that the overdue tasks are counted on their index."""
+        with repository._get_connection() as conn:
+            plan = " ".join(
+                row[3]
+                for row in conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT priority, COUNT(*) FROM tasks "
+                    "WHERE completed = 0 "
+                    "AND julianday(due_date) < julianday(?) "
+                    "GROUP BY priority",
+                    ("2024-01-01",),
+                )
+            )
+        assert "USING INDEX ix_tasks_completed_due_date" in plan
+
+    @pytest.mark.parametrize(
+        ("limit", "offset", "expected_titles"),
+        [
+            (2, 0, ["Task 0", "Task 1"]),
+            (2, 2, ["Task 2"]),
+            (5, 0, ["Task 0", "Task 1", "Task 2"]),
+            (2, 4, []),
+        ],
+    )
+    def test_query_page_with_total(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+        limit: int,
+        offset: int,
+        expected_titles: list[str],
+    ) -> None:
+        """Test that a page comes with the total number of matches."""
+        for number in range(3):
+            self._add_titled(
+                repository, mock_create_task_request, f"Task {number}"
+            )
+
+        tasks, total = repository.query_page(QueryParams(), limit, offset)
+
+        assert [task.title for task in tasks] == expected_titles
+        assert total == 3
+
+    def test_query_after_seeks_past_last_seen_id(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that the keyset page starts after the given id."""
+        tasks = [
+            self._add_titled(
+                repository, mock_create_task_request, f"Task {number}"
+            )
+            for number in range(4)
+        ]
+
+        first = repository.query_after(QueryParams(), limit=2)
+        second = repository.query_after(
+            QueryParams(), limit=2, after_id=first[-1].id
+        )
+        filtered = repository.query_after(
+            QueryParams(title="Task 3"), limit=2, after_id=tasks[0].id
+        )
+
+        assert first == tasks[:2]
+        assert second == tasks[2:]
+        assert filtered == tasks[3:]
+
+    def test_select_only_requested_fields(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that only the requested columns are read into the tasks."""
+        expected = repository.add(mock_create_task_request)
+
+        (task,) = repository.query(QueryParams(), fields=("id", "due_date"))
+        (page,), _ = repository.query_page(
+            QueryParams(), limit=1, fields=("id", "priority", "completed")
+        )
+        (after,) = repository.query_after(
+            QueryParams(), limit=1, fields=("id",)
+        )
+
+        assert task.model_fields_set == {"id", "due_date"}
+        assert task.due_date == expected.due_date
+        assert (page.priority, page.completed) == (
+            expected.priority,
+            expected.completed,
+        )
+        assert after.model_dump(exclude_unset=True) == {"id": expected.id}
+
+    def test_raise_value_error_on_unknown_field(
+        self, repository: TaskRepository
+    ) -> None:
+        """Test that the fields cannot inject arbitrary columns."""
+        with pytest.raises(ValueError, match="Unknown task fields"):
+            repository.query(QueryParams(), fields=("id", "rowid"))
+
+    def test_query_page_json_in_api_format(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that SQLite encodes the tasks like the API serialises them."""
+        first = repository.add(
+            mock_create_task_request.model_copy(
+                update={
+                    "title": 'Quote " \\ \x01 é',
+                    "due_date": datetime(2000, 2, 1, 15, tzinfo=UTC),
+                    "description": None,
+                    "completed": True,
+                }
+            )
+        )
+        second = self._add_titled(
+            repository, mock_create_task_request, "Second", "Description"
+        )
+
+        tasks, total = repository.query_page_json(QueryParams(), limit=5)
+
+        assert total == 2
+        assert (
+            tasks
+            == "["
+            + ",".join(
+                task.model_dump_json(exclude={"version"})
+                for task in (first, second)
+            )
+            + "]"
+        )
+
+    @pytest.mark.parametrize(
+        ("limit", "offset"), [(2, 0), (2, 2), (2, 4), (5, 0)]
+    )
+    def test_query_page_json_with_total(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+        limit: int,
+        offset: int,
+    ) -> None:
+        """Test that a JSON page holds the requested fields and the total."""
+        ids = repository.add_many([mock_create_task_request] * 3)
+
+        tasks, total = repository.query_page_json(
+            QueryParams(), limit, offset, fields=("id",)
+        )
+
+        assert json.loads(tasks) == [
+            {"id": id} for id in ids[offset : offset + limit]
+        ]
+        assert total == 3
+
+    def test_query_page_columns_in_compact_encodings(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that the tasks are transposed into compact columns."""
+        first = repository.add(
+            mock_create_task_request.model_copy(
+                update={
+                    "due_date": datetime(2000, 1, 1, 2, tzinfo=UTC),
+                    "completed": True,
+                }
+            )
+        )
+        second = repository.add(
+            mock_create_task_request.model_copy(
+                update={
+                    "due_date": datetime(2000, 1, 1, 0, 0, 0, 500000),
+                    "description": None,
+                }
+            )
+        )
+
+        columns, total = repository.query_page_columns(QueryParams(), 5)
+        sparse, _ = repository.query_page_columns(
+            QueryParams(), 1, 1, fields=("id", "due_date")
+        )
+
+        assert columns == {
+            "id": [first.id, second.id],
+            "title": [first.title, second.title],
+            "priority": [first.priority.value, second.priority.value],
+            "due_date": [946692000000, 946684800500],
+            "description": [first.description, None],
+            "completed": [1, 0],
+        }
+        assert total == 2
+        assert sparse == {"id": [second.id], "due_date": [946684800500]}
+
+    @pytest.mark.parametrize(
+        ("limit", "offset", "expected_total"), [(2, 0, 3), (2, 4, 3)]
+    )
+    def test_query_page_columns_with_total(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+        limit: int,
+        offset: int,
+        expected_total: int,
+    ) -> None:
+        """Test that a page of columns comes with the total of matches."""
+        ids = repository.add_many([mock_create_task_request] * 3)
+
+        columns, total = repository.query_page_columns(
+            QueryParams(), limit, offset, fields=("id",)
+        )
+
+        assert columns == {"id": ids[offset : offset + limit]}
+        assert total == expected_total
+
+    def test_query_after_columns_seeks_past_last_seen_id(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that the keyset page of columns starts after the given id."""
+        ids = repository.add_many([mock_create_task_request] * 3)
+
+        columns = repository.query_after_columns(
+            QueryParams(), limit=5, after_id=ids[0], fields=("id", "title")
+        )
+
+        assert columns == {
+            "id": ids[1:],
+            "title": [mock_create_task_request.title] * 2,
+        }
+        with pytest.raises(ValueError, match="Unknown task fields"):
+            repository.query_after_columns(
+                QueryParams(), limit=1, fields=("rowid",)
+            )
+
+    def test_raise_value_error_on_unknown_json_field(
+        self, repository: TaskRepository
+    ) -> None:
+        """Test that only the fields of the API can be encoded."""
+        with pytest.raises(ValueError, match="Unknown task fields"):
+            repository.query_page_json(QueryParams(), 1, fields=("version",))
+
+    def test_rows_hydrated_without_validation(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that the trusted rows skip the pydantic validation."""
+        expected = repository.add(mock_create_task_request)
+        with patch.object(Task, "model_validate") as model_validate:
+            actual = repository.query(QueryParams())
+        model_validate.assert_not_called()
+        assert actual == [expected]
+        assert actual[0].model_dump_json() == expected.model_dump_json()
+
+    def test_rows_validated_when_enabled(
+        self,
+        repository: TaskRepository,
+        database_config: DatabaseConfig,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that validate_rows checks the rows read back."""
+        expected = repository.add(mock_create_task_request)
+        validating = TaskRepository(
+            database_config.model_copy(update={"validate_rows": True})
+        )
+        assert validating.query(QueryParams()) == [expected]
+
+        with repository._write_connection() as conn:
+            conn.execute("UPDATE tasks SET completed = 'maybe'")
+        with pytest.raises(ValidationError):
+            validating.query(QueryParams())
+        validating.close()
+
+    def test_add_many_returns_ids_in_order(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that the tasks are inserted together, in order."""
+        first = self._add_titled(repository, mock_create_task_request, "0")
+        data_models = [
+            mock_create_task_request.model_copy(update={"title": str(number)})
+            for number in range(1, 4)
+        ]
+
+        ids = repository.add_many(data_models)
+
+        assert ids == [first.id + 1, first.id + 2, first.id + 3]
+        tasks = repository.query(QueryParams())
+        assert [(task.id, task.title) for task in tasks[1:]] == [
+            (ids[0], "1"),
+            (ids[1], "2"),
+            (ids[2], "3"),
+        ]
+        assert repository.writer_stats().batches == 2
+        assert repository.add_many([]) == []
+
+    def test_update_where_applies_to_matching_tasks(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that the tasks matching the filters are updated at once."""
+        alpha = self._add_titled(repository, mock_create_task_request, "Alpha")
+        self._add_titled(repository, mock_create_task_request, "Bravo")
+        low = repository.add(
+            mock_create_task_request.model_copy(
+                update={"title": "Alpine", "priority": Priority.LOW}
+            )
+        )
+
+        updated = repository.update_where(
+            QueryParams(title="Alp", priority=Priority.MEDIUM),
+            UpdateTaskRequest(completed=True),
+        )
+
+        assert updated == 1
+        completed = repository.query(QueryParams(completed=True))
+        assert [task.id for task in completed] == [alpha.id]
+        assert repository.update_where(QueryParams(), UpdateTaskRequest()) == 0
+        assert not repository.query(QueryParams(id=low.id))[0].completed
+
+    def test_delete_where_applies_to_matching_tasks(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that the tasks matching the filters are deleted at once."""
+        self._add_titled(repository, mock_create_task_request, "Alpha")
+        self._add_titled(repository, mock_create_task_request, "Alpine")
+        bravo = self._add_titled(repository, mock_create_task_request, "Bravo")
+
+        assert repository.delete_where(QueryParams(title="Alp")) == 2
+        assert repository.query(QueryParams()) == [bravo]
+        assert repository.count(QueryParams(title="Alp")) == 0
+
+    def test_iterate_streams_batches(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that the matching tasks are fetched batch by batch."""
+        tasks = [
+            self._add_titled(repository, mock_create_task_request, title)
+            for title in ("Alpha", "Alpine", "Bravo", "Alpaca")
+        ]
+
+        batches = list(repository.iterate(QueryParams(title="Alp"), 2))
+
+        assert batches == [[tasks[0], tasks[1]], [tasks[3]]]
+        assert repository.pool_stats().in_use == 0
+
+    def test_iterate_returns_connection_between_batches(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that a consumer holds no connection between batches...
+
+        and that the tasks added behind the last batch are read.
+        """
+        first = self._add_titled(repository, mock_create_task_request, "A")
+        second = self._add_titled(repository, mock_create_task_request, "B")
+        batches = repository.iterate(QueryParams(), 1)
+        assert next(batches) == [first]
+        assert repository.pool_stats().in_use == 0
+        repository.delete(second.id)
+        third = self._add_titled(repository, mock_create_task_request, "C")
+        assert list(batches) == [[third]]
+
+    def test_read_during_write_transaction(
+        self,
+        repository: TaskRepository,
+        mock_create_task_request: CreateTaskRequest,
+    ) -> None:
+        """Test that reads do not wait for a write transaction to end."""
+        task = repository.add(mock_create_task_request)
+        deleted = threading.Event()
+        release = threading.Event()
+
+        def long_write(conn: sqlite3.Connection) -> None:
+            conn.execute("DELETE FROM tasks")
+            deleted.set()
+            release.wait(5)
+
+        future = repository._submit_write(long_write)
+        assert deleted.wait(5)
+        try:
+            assert repository.query(QueryParams()) == [task]
+        finally:
+            release.set()
+        future.result(5)
+        assert repository.query(QueryParams()) == []
@@ -0,0 +1,232 @@
+"""Unit tests for the BatchWriter class."""
+
+import sqlite3
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Generator
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.persistence.config import DatabaseConfig
+from app.persistence.exception import WriterClosedError
+from app.persistence.writer import BatchWriter
+
+
+def insert(value: int) -> Callable[[sqlite3.Connection], int | None]:
+    """Build an operation inserting a value, returning the row id."""
+
+    def operation(conn: sqlite3.Connection) -> int | None:
+        return conn.execute("INSERT INTO t VALUES (?)", (value,)).lastrowid
+
+    return operation
+
+
+class TestBatchWriter:
+    """Tests for the BatchWriter class."""
+
+    @pytest.fixture
+    def config(self, tmp_path: Path) -> DatabaseConfig:
+        """Fixture for a database config with a table to write to."""
+        config = DatabaseConfig(
+            db_name=str(tmp_path / "writer.db"),
+            write_batch_size=3,
+            write_retry_delay=0.001,
+        )
+        with sqlite3.connect(config.db_name) as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.close()
+        return config
+
+    @pytest.fixture
+    def writer(
+        self, config: DatabaseConfig
+    ) -> Generator[BatchWriter, None, None]:
+        """Fixture for a batch writer."""
+        writer = BatchWriter(config)
+        yield writer
+        writer.close()
+
+    @pytest.fixture
+    def blocked(
+        self, writer: BatchWriter
+    ) -> Generator[threading.Event, None, None]:
+        """Fixture keeping the writer busy until the event is set."""
+        release = threading.Event()
+        started = threading.Event()
+
+        def block(conn: sqlite3.Connection) -> None:
+            started.set()
+            release.wait(5)
+
+        future = writer.submit(block)
+        started.wait(5)
+        yield release
+        release.set()
+        future.result(5)
+
+    def count_rows(self, config: DatabaseConfig) -> int:
+        """Count the rows committed to the table."""
+        conn = sqlite3.connect(config.db_name)
+        (count,) = conn.execute("SELECT COUNT(*) FROM t").fetchone()
+        conn.close()
+        return count
+
+    def test_resolve_futures_with_results(
+        self, writer: BatchWriter, config: DatabaseConfig
+    ) -> None:
+        """Test that every caller receives its own result."""
+        first = writer.submit(insert(1))
+        second = writer.submit(insert(2))
+        assert first.result(5) == 1
+        assert second.result(5) == 2
+        assert self.count_rows(config) == 2
+
+    def test_group_queued_writes_in_one_transaction(
+        self, writer: BatchWriter, blocked: threading.Event
+    ) -> None:
+        """Test that the queued writes are committed together."""
+        futures = [writer.submit(insert(value)) for value in range(3)]
+        blocked.set()
+        for future in futures:
+            future.result(5)
+        stats = writer.stats()
+        assert stats.batches == 2
+        assert stats.operations == 4
+
+    def test_batch_bounded_by_size(
+        self, writer: BatchWriter, blocked: threading.Event
+    ) -> None:
+        """Test that a batch holds at most write_batch_size operations."""
+        futures = [writer.submit(insert(value)) for value in range(4)]
+        blocked.set()
+        for future in futures:
+            future.result(5)
+        assert writer.stats().batches == 3
+
+    def test_failed_operation_does_not_abort_batch(
+        self,
+        writer: BatchWriter,
+        blocked: threading.Event,
+        config: DatabaseConfig,
+    ) -> None:
+        """Test that a failing operation only fails its own future."""
+
+        def fail(conn: sqlite3.Connection) -> None:
+            conn.execute("INSERT INTO t VALUES (99)")
+            raise ValueError("invalid")
+
+        ok = writer.submit(insert(1))
+        failed = writer.submit(fail)
+        blocked.set()
+        assert ok.result(5) == 1
+        with pytest.raises(ValueError, match="invalid"):
+            failed.result(5)
+        assert self.count_rows(config) == 1
+
+    def test_cancelled_operation_skipped(
+        self,
+        writer: BatchWriter,
+        blocked: threading.Event,
+        config: DatabaseConfig,
+    ) -> None:
+        """Test that a cancelled operation is not executed."""
+        future = writer.submit(insert(1))
+        assert future.cancel()
+        blocked.set()
+        writer.submit(insert(2)).result(5)
+        assert self.count_rows(config) == 1
+
+    def test_retry_when_database_locked(
+        self, writer: BatchWriter, config: DatabaseConfig
+    ) -> None:
+        """Test that a locked database is retried with backoff."""
+        attempts = []
+
+        def locked_once(conn: sqlite3.Connection) -> int:
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise sqlite3.OperationalError("database is locked")
+            conn.execute("INSERT INTO t VALUES (1)")
+            return len(attempts)
+
+        assert writer.submit(locked_once).result(5) == 2
+        assert writer.stats().retries == 1
+        assert self.count_rows(config) == 1
+
+    def test_fail_batch_when_retries_exhausted(
+        self, config: DatabaseConfig
+    ) -> None:
+        """Test that the futures fail once the retries are exhausted."""
+        writer = BatchWriter(config.model_copy(update={"write_retries": 1}))
+
+        def always_locked(conn: sqlite3.Connection) -> None:
+            raise sqlite3.OperationalError("database is locked")
+
+        future = writer.submit(always_locked)
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            future.result(5)
+        assert writer.stats().retries == 1
+        writer.close()
+
+    def test_fail_batch_on_database_error(
+        self, writer: BatchWriter, config: DatabaseConfig
+    ) -> None:
+        """Test that an error other than a locked database fails the batch."""
+        conn = writer._conn
+
+        def execute(sql: str, *args: Any) -> sqlite3.Cursor:  # noqa: ANN401
+            if sql == "COMMIT":
+                raise sqlite3.DatabaseError("file is not a database")
+            return conn.execute(sql, *args)
+
+        writer._conn = MagicMock(wraps=conn, execute=execute)
+        future = writer.submit(insert(1))
+        with pytest.raises(sqlite3.DatabaseError, match="not a database"):
+            future.result(5)
+        writer._conn = conn
+        assert writer.submit(insert(2)).result(5) == 1
+        assert self.count_rows(config) == 1
+
+    @pytest.mark.filterwarnings(
+        "ignore::pytest.PytestUnhandledThreadExceptionWarning"
+    )
+    def test_close_when_thread_dies(
+        self, writer: BatchWriter, blocked: threading.Event
+    ) -> None:
+        """Test that no write waits forever for a dead writer thread."""
+
+        class Fatal(BaseException):
+            pass
+
+        def fatal(conn: sqlite3.Connection) -> None:
+            raise Fatal()
+
+        failed = writer.submit(fatal)
+        queued = [writer.submit(insert(value)) for value in range(5)]
+        blocked.set()
+        with pytest.raises(Fatal):
+            failed.result(5)
+        writer._thread.join(5)
+        for future in queued:
+            with pytest.raises((Fatal, WriterClosedError)):
+                future.result(5)
+        with pytest.raises(WriterClosedError):
+            writer.submit(insert(1))
+
+    def test_commit_pending_writes_on_close(
+        self, writer: BatchWriter, config: DatabaseConfig
+    ) -> None:
+        """Test that close commits the queued writes."""
+        futures = [writer.submit(insert(value)) for value in range(5)]
+        writer.close()
+        assert all(future.done() for future in futures)
+        assert self.count_rows(config) == 5
+
+    def test_raise_on_submit_after_close(self, writer: BatchWriter) -> None:
+        """Test that a closed writer refuses operations."""
+        writer.close()
+        writer.close()
+        with pytest.raises(WriterClosedError):
+            writer.submit(insert(1))
@@ -1,36 +1,61 @@
 """Unit tests for the tasks API endpoint."""
 
+import json
+from collections.abc import AsyncIterator
 from unittest.mock import MagicMock, create_autospec, patch
 
 import pytest
 from fastapi import HTTPException
+from fastapi.exceptions import RequestValidationError
 
 from app.controllers.exception import NotFoundError
-from app.controllers.task import TaskController
+from app.controllers.task import JsonTaskPage, TaskController, VersionedTask
 from app.schemas import (
     CreateTaskRequest,
+    FileFormat,
     Priority,
     Task,
+    TaskChangeParams,
+    TaskExportParams,
+    TaskFieldsParams,
     TaskQueryParams,
     UpdateTaskRequest,
 )
+from app.web.config import CompressionConfig, TasksConfig
+from app.web.resources.cursor import CursorCodec
 from app.web.resources.tasks.api import (
     create_task,
+    create_tasks,
     delete_task,
+    delete_tasks,
+    export_tasks,
     get_task_by_id,
+    import_tasks,
     query,
     update_task,
+    update_tasks,
+)
+from app.web.resources.tasks.formats import (
+    COLUMNAR_MEDIA_TYPE,
+    MAX_CSV_RECORD_SIZE,
+    MAX_LINE_SIZE,
 )
 from app.web.resources.tasks.schemas import GetTasksResponse, Pagination
 
 
+NO_COMPRESSION = CompressionConfig(enabled=False)
+"""Compression config under which the task ETags are strong."""
+
+
 class TestCreateTaskAPI:
     """Tests for the create_task API endpoint."""
 
     @pytest.fixture
     def mock_task_controller(self) -> MagicMock:
         """Fixture to provide a mock task controller."""
-        return create_autospec(TaskController)
+        mock_task_controller = create_autospec(TaskController)
+        mock_task_controller.get_data_version.return_value = "epoch.1"
+        return mock_task_controller
 
     @pytest.mark.anyio
     async def test_create_called_on_create_task(
@@ -46,7 +71,87 @@ class TestCreateTaskAPI:
         mock_task_controller.create.return_value = mock_task_response
         result = await create_task(create_task_request, mock_task_controller)
         mock_task_controller.create.assert_called_once()
-        assert result == mock_task_response
+        assert result.body == mock_task_response.model_dump_json().encode()
+
+    @pytest.mark.anyio
+    async def test_create_many_called_on_create_tasks(
+        self,
+        mock_task_controller: MagicMock,
+        mock_create_task_request_dict: dict,
+    ) -> None:
+        """Test that the valid items are created together."""
+        mock_task_controller.create_many.return_value = [1, 2]
+        result = await create_tasks(
+            [mock_create_task_request_dict] * 2,
+            mock_task_controller,
+            TasksConfig(),
+        )
+        (create_task_requests,) = (
+            mock_task_controller.create_many.call_args.args
+        )
+        assert len(create_task_requests) == 2
+        assert result.ids == [1, 2]
+        assert result.errors == []
+
+    @pytest.mark.anyio
+    async def test_raise_validation_error_on_create_tasks_with_invalid_item(
+        self,
+        mock_task_controller: MagicMock,
+        mock_create_task_request_dict: dict,
+    ) -> None:
+        """Test that an invalid item rejects the whole request...
+
+        with the position of the item in the error location.
+        """
+        with pytest.raises(RequestValidationError) as exc_info:
+            await create_tasks(
+                [mock_create_task_request_dict, {"title": "Missing"}],
+                mock_task_controller,
+                TasksConfig(),
+            )
+        locations = [error["loc"] for error in exc_info.value.errors()]
+        assert ("body", 1, "priority") in locations
+        mock_task_controller.create_many.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_report_invalid_items_on_partial_create_tasks(
+        self,
+        mock_task_controller: MagicMock,
+        mock_create_task_request_dict: dict,
+    ) -> None:
+        """Test that allow_partial creates the valid items only."""
+        mock_task_controller.create_many.return_value = [5, 6]
+        result = await create_tasks(
+            [
+                mock_create_task_request_dict,
+                {"title": "Missing"},
+                mock_create_task_request_dict,
+            ],
+            mock_task_controller,
+            TasksConfig(),
+            allow_partial=True,
+        )
+        assert result.ids == [5, None, 6]
+        assert [error.index for error in result.errors] == [1]
+        assert result.errors[0].errors[0]["loc"] == ("priority",)
+
+    @pytest.mark.anyio
+    async def test_raise_413_on_create_tasks_over_max_size(
+        self,
+        mock_task_controller: MagicMock,
+        mock_create_task_request_dict: dict,
+    ) -> None:
+        """Test that HTTPException is raised with 413 status code...
+
+        when the request holds more tasks than allowed.
+        """
+        with pytest.raises(HTTPException) as exc_info:
+            await create_tasks(
+                [mock_create_task_request_dict] * 3,
+                mock_task_controller,
+                TasksConfig(max_bulk_size=2),
+            )
+        assert exc_info.value.status_code == 413
 
     @pytest.fixture
     def query_params(self) -> TaskQueryParams:
@@ -80,6 +185,8 @@ class TestCreateTaskAPI:
             actual = await query(
                 query=query_params,
                 task_controller=mock_task_controller,
+                cursor_codec=CursorCodec("secret"),
+                tasks_config=TasksConfig(),
                 request=mock_request,
             )
             mock_task_controller.get.assert_called_once_with(query_params)
@@ -87,7 +194,280 @@ class TestCreateTaskAPI:
                 tasks=[mock_task_response],
                 pagination=mock_pagination,
             )
-            assert actual == expected
+            assert actual.body == expected.model_dump_json().encode()
+
+    @pytest.mark.anyio
+    async def test_envelope_spliced_on_query_with_sqlite_json(
+        self,
+        mock_task_controller: MagicMock,
+        mock_task_response: Task,
+    ) -> None:
+        """Test that the JSON page of the database gets the same envelope...
+
+        as the tasks serialised by the API.
+        """
+        query_params = TaskQueryParams()
+        request = MagicMock(url="http://testserver/tasks")
+        mock_task_controller.get.return_value = ([mock_task_response], 1)
+        mock_task_controller.get_json.return_value = JsonTaskPage(
+            f"[{mock_task_response.model_dump_json()}]", 1, 1
+        )
+
+        expected = await query(
+            query=query_params,
+            task_controller=mock_task_controller,
+            cursor_codec=CursorCodec("secret"),
+            tasks_config=TasksConfig(),
+            request=request,
+        )
+        actual = await query(
+            query=query_params,
+            task_controller=mock_task_controller,
+            cursor_codec=CursorCodec("secret"),
+            tasks_config=TasksConfig(sqlite_json=True),
+            request=request,
+        )
+
+        mock_task_controller.get_json.assert_called_once_with(query_params)
+        assert actual.body == expected.body
+        assert actual.headers["ETag"] == expected.headers["ETag"]
+
+    @pytest.mark.anyio
+    async def test_columns_on_query_accepting_columnar(
+        self,
+        mock_task_controller: MagicMock,
+    ) -> None:
+        """Test that the columnar format is returned when accepted...
+
+        under an ETag of its own.
+        """
+        query_params = TaskQueryParams(fields="completed")
+        mock_task_controller.get.return_value = ([], 0)
+        mock_task_controller.get_columns.return_value = (
+            {"id": [1, 2], "completed": [1, 0]},
+            2,
+        )
+
+        json_response = await query(
+            query=query_params,
+            task_controller=mock_task_controller,
+            cursor_codec=CursorCodec("secret"),
+            tasks_config=TasksConfig(),
+            request=MagicMock(url="http://testserver/tasks"),
+        )
+        actual = await query(
+            query=query_params,
+            task_controller=mock_task_controller,
+            cursor_codec=CursorCodec("secret"),
+            tasks_config=TasksConfig(),
+            request=MagicMock(url="http://testserver/tasks"),
+            accept=COLUMNAR_MEDIA_TYPE,
+        )
+
+        mock_task_controller.get_columns.assert_called_once_with(query_params)
+        assert actual.media_type == COLUMNAR_MEDIA_TYPE
+        assert actual.headers["Vary"] == "Accept"
+        assert actual.headers["ETag"] != json_response.headers["ETag"]
+        body = json.loads(bytes(actual.body))
+        assert body["tasks"] == {"id": [1, 2], "completed": [1, 0]}
+        assert body["pagination"]["count"] == 2
+
+    @pytest.mark.parametrize(("ids", "next_id"), [([3, 4], 4), ([3], None)])
+    @pytest.mark.anyio
+    async def test_columns_on_query_with_cursor_accepting_columnar(
+        self,
+        mock_task_controller: MagicMock,
+        ids: list[int],
+        next_id: int | None,
+    ) -> None:
+        """Test that the columnar pages are sought by cursor too."""
+        codec = CursorCodec("secret")
+        query_params = TaskQueryParams(cursor=codec.encode([2]))
+        mock_task_controller.get_columns_after.return_value = (
+            {"id": ids},
+            next_id is not None,
+        )
+
+        actual = await query(
+            query=query_params,
+            task_controller=mock_task_controller,
+            cursor_codec=codec,
+            tasks_config=TasksConfig(),
+            request=MagicMock(url="http://testserver/tasks"),
+            accept=COLUMNAR_MEDIA_TYPE,
+        )
+
+        mock_task_controller.get_columns_after.assert_called_once_with(
+            query_params, 2
+        )
+        pagination = json.loads(bytes(actual.body))["pagination"]
+        assert pagination["next_cursor"] == (
+            None if next_id is None else codec.encode([next_id])
+        )
+
+    @pytest.mark.anyio
+    async def test_raise_304_on_query_when_etag_matches(
+        self,
+        mock_task_controller: MagicMock,
+        query_params: TaskQueryParams,
+        mock_task_response: Task,
+    ) -> None:
+        """Test that HTTPException is raised with 304 status code...
+
+        when the ETag of the page is listed, without querying the tasks.
+        """
+        mock_task_controller.get.return_value = ([mock_task_response], 1)
+        response = await query(
+            query=query_params,
+            task_controller=mock_task_controller,
+            cursor_codec=CursorCodec("secret"),
+            tasks_config=TasksConfig(),
+            request=MagicMock(url="http://testserver/tasks"),
+        )
+        etag = response.headers["ETag"]
+        assert etag.startswith('W/"epoch.1.')
+
+        with pytest.raises(HTTPException) as exc_info:
+            await query(
+                query=query_params,
+                task_controller=mock_task_controller,
+                cursor_codec=CursorCodec("secret"),
+                tasks_config=TasksConfig(),
+                request=MagicMock(url="http://testserver/tasks"),
+                if_none_match=etag,
+            )
+        assert exc_info.value.status_code == 304
+        mock_task_controller.get.assert_called_once()
+
+    @pytest.mark.anyio
+    async def test_sparse_response_on_query_with_fields(
+        self,
+        mock_task_controller: MagicMock,
+        mock_task_response: Task,
+    ) -> None:
+        """Test that only the selected fields of the tasks are returned."""
+        query_params = TaskQueryParams(fields="title")
+        mock_task_controller.get.return_value = ([mock_task_response], 1)
+
+        actual = await query(
+            query=query_params,
+            task_controller=mock_task_controller,
+            cursor_codec=CursorCodec("secret"),
+            tasks_config=TasksConfig(),
+            request=MagicMock(url="http://testserver/tasks?fields=title"),
+        )
+
+        assert actual.headers["ETag"].startswith('W/"epoch.1.')
+        body = json.loads(bytes(actual.body))
+        assert body["tasks"] == [
+            {"id": mock_task_response.id, "title": mock_task_response.title}
+        ]
+        assert body["pagination"]["count"] == 1
+
+    @pytest.mark.anyio
+    async def test_controller_get_after_called_on_query_with_cursor(
+        self,
+        mock_task_controller: MagicMock,
+        mock_task_response: Task,
+    ) -> None:
+        """Test that a cursor is decoded into the last seen task ID...
+
+        and the next cursor points past the last task of the page.
+        """
+        codec = CursorCodec("secret")
+        query_params = TaskQueryParams(cursor=codec.encode([3]), page_size=1)
+        mock_task_controller.get_after.return_value = (
+            [mock_task_response],
+            True,
+        )
+        mock_request = MagicMock(url="http://testserver/tasks")
+
+        actual = await query(
+            query=query_params,
+            task_controller=mock_task_controller,
+            cursor_codec=codec,
+            tasks_config=TasksConfig(),
+            request=mock_request,
+        )
+
+        mock_task_controller.get_after.assert_called_once_with(query_params, 3)
+        pagination = GetTasksResponse.model_validate_json(
+            bytes(actual.body)
+        ).pagination
+        assert pagination.next_cursor == codec.encode([mock_task_response.id])
+        assert pagination.count is None
+
+    @pytest.mark.anyio
+    async def test_first_page_on_query_with_empty_cursor(
+        self,
+        mock_task_controller: MagicMock,
+        mock_task_response: Task,
+    ) -> None:
+        """Test that an empty cursor starts from the first task."""
+        query_params = TaskQueryParams(cursor="")
+        mock_task_controller.get_after.return_value = (
+            [mock_task_response],
+            False,
+        )
+
+        actual = await query(
+            query=query_params,
+            task_controller=mock_task_controller,
+            cursor_codec=CursorCodec("secret"),
+            tasks_config=TasksConfig(),
+            request=MagicMock(url="http://testserver/tasks?cursor="),
+        )
+
+        mock_task_controller.get_after.assert_called_once_with(
+            query_params, None
+        )
+        pagination = GetTasksResponse.model_validate_json(
+            bytes(actual.body)
+        ).pagination
+        assert pagination.next_cursor is None
+
+    @pytest.mark.parametrize("key", [["1"], [1, 2], [True]])
+    @pytest.mark.anyio
+    async def test_raise_400_on_query_with_invalid_cursor(
+        self,
+        mock_task_controller: MagicMock,
+        key: list,
+    ) -> None:
+        """Test that HTTPException is raised with 400 status code...
+
+        when the cursor does not hold a task ID.
+        """
+        codec = CursorCodec("secret")
+        with pytest.raises(HTTPException) as exc_info:
+            await query(
+                query=TaskQueryParams(cursor=codec.encode(key)),
+                task_controller=mock_task_controller,
+                cursor_codec=codec,
+                tasks_config=TasksConfig(),
+                request=MagicMock(url="http://testserver/tasks"),
+            )
+        assert exc_info.value.status_code == 400
+        mock_task_controller.get_after.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_raise_400_on_query_with_tampered_cursor(
+        self,
+        mock_task_controller: MagicMock,
+    ) -> None:
+        """Test that HTTPException is raised with 400 status code...
+
+        when the cursor was not signed with the secret.
+        """
+        cursor = CursorCodec("other").encode([1])
+        with pytest.raises(HTTPException) as exc_info:
+            await query(
+                query=TaskQueryParams(cursor=cursor),
+                task_controller=mock_task_controller,
+                cursor_codec=CursorCodec("secret"),
+                tasks_config=TasksConfig(),
+                request=MagicMock(url="http://testserver/tasks"),
+            )
+        assert exc_info.value.status_code == 400
 
     @pytest.mark.anyio
     async def test_controller_get_by_id_called_on_get_task_by_id(
@@ -99,10 +479,125 @@ class TestCreateTaskAPI:
 
         when retrieving a task.
         """
-        mock_task_controller.get_by_id.return_value = mock_task_response
-        result = await get_task_by_id(1, mock_task_controller)
-        mock_task_controller.get_by_id.assert_called_once_with(1)
-        assert result == mock_task_response
+        mock_task_controller.get_versioned_by_id.return_value = VersionedTask(
+            mock_task_response, 3
+        )
+        result = await get_task_by_id(
+            1, TaskFieldsParams(), mock_task_controller, NO_COMPRESSION
+        )
+        mock_task_controller.get_versioned_by_id.assert_called_once_with(
+            1, None
+        )
+        assert result.body == mock_task_response.model_dump_json().encode()
+        assert result.headers["ETag"] == '"1.3"'
+
+    @pytest.mark.anyio
+    async def test_sparse_response_on_get_task_by_id_with_fields(
+        self,
+        mock_task_controller: MagicMock,
+        mock_task_response: Task,
+    ) -> None:
+        """Test that only the selected fields of the task are returned...
+
+        with an ETag distinct from the one of the full task.
+        """
+        mock_task_controller.get_versioned_by_id.return_value = VersionedTask(
+            mock_task_response, 3
+        )
+        actual = await get_task_by_id(
+            1,
+            TaskFieldsParams(fields="completed"),
+            mock_task_controller,
+            NO_COMPRESSION,
+        )
+        mock_task_controller.get_versioned_by_id.assert_called_once_with(
+            1, ("id", "completed")
+        )
+        assert json.loads(bytes(actual.body)) == {
+            "id": mock_task_response.id,
+            "completed": mock_task_response.completed,
+        }
+        assert actual.headers["ETag"].startswith('"1.3.')
+
+    @pytest.mark.parametrize(
+        ("if_none_match", "version"),
+        [('"1.3"', 3), ('W/"1.2", W/"1.3"', 3), ("*", 3)],
+    )
+    @pytest.mark.anyio
+    async def test_raise_304_on_get_task_by_id_when_version_matches(
+        self,
+        mock_task_controller: MagicMock,
+        if_none_match: str,
+        version: int,
+    ) -> None:
+        """Test that HTTPException is raised with 304 status code...
+
+        when the ETag of the task is listed, without reading the task.
+        """
+        mock_task_controller.get_version.return_value = version
+        with pytest.raises(HTTPException) as exc_info:
+            await get_task_by_id(
+                1,
+                TaskFieldsParams(),
+                mock_task_controller,
+                NO_COMPRESSION,
+                if_none_match,
+            )
+        assert exc_info.value.status_code == 304
+        assert exc_info.value.headers == {"ETag": '"1.3"'}
+        mock_task_controller.get_versioned_by_id.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_weak_etag_on_get_task_by_id_when_compressed(
+        self,
+        mock_task_controller: MagicMock,
+        mock_task_response: Task,
+    ) -> None:
+        """Test that the ETag is the same for every encoding...
+
+        when the responses may be compressed, also on a 304.
+        """
+        mock_task_controller.get_version.return_value = 3
+        mock_task_controller.get_versioned_by_id.return_value = VersionedTask(
+            mock_task_response, 3
+        )
+        result = await get_task_by_id(
+            1, TaskFieldsParams(), mock_task_controller, CompressionConfig()
+        )
+        headers = {"ETag": 'W/"1.3"', "Vary": "Accept-Encoding"}
+        assert {name: result.headers[name] for name in headers} == headers
+        with pytest.raises(HTTPException) as exc_info:
+            await get_task_by_id(
+                1,
+                TaskFieldsParams(),
+                mock_task_controller,
+                CompressionConfig(),
+                'W/"1.3"',
+            )
+        assert exc_info.value.status_code == 304
+        assert exc_info.value.headers == headers
+
+    @pytest.mark.parametrize("version", [2, None])
+    @pytest.mark.anyio
+    async def test_get_task_by_id_when_version_does_not_match(
+        self,
+        mock_task_controller: MagicMock,
+        mock_task_response: Task,
+        version: int | None,
+    ) -> None:
+        """Test that the task is read when its ETag is not listed."""
+        mock_task_controller.get_version.return_value = version
+        mock_task_controller.get_versioned_by_id.return_value = VersionedTask(
+            mock_task_response, 3
+        )
+        result = await get_task_by_id(
+            1,
+            TaskFieldsParams(),
+            mock_task_controller,
+            NO_COMPRESSION,
+            '"1.1"',
+        )
+        assert result.body == mock_task_response.model_dump_json().encode()
 
     @pytest.mark.anyio
     async def test_raise_404_on_get_task_by_id_when_not_found(
@@ -114,9 +609,11 @@ class TestCreateTaskAPI:
 
         when task is not found.
         """
-        mock_task_controller.get_by_id.side_effect = NotFoundError(1)
+        mock_task_controller.get_versioned_by_id.side_effect = NotFoundError(1)
         with pytest.raises(HTTPException) as exc_info:
-            await get_task_by_id(1, mock_task_controller)
+            await get_task_by_id(
+                1, TaskFieldsParams(), mock_task_controller, NO_COMPRESSION
+            )
         assert exc_info.value.status_code == 404
 
     @pytest.mark.anyio
@@ -152,7 +649,7 @@ class TestCreateTaskAPI:
         mock_task_controller.update.assert_called_once_with(
             id=1, update_task_request=update_task_request
         )
-        assert result == updated_task
+        assert result.body == updated_task.model_dump_json().encode()
 
     @pytest.mark.anyio
     async def test_raise_404_on_delete_task_when_not_found(
@@ -181,3 +678,212 @@ class TestCreateTaskAPI:
         result = await delete_task(1, mock_task_controller)
         mock_task_controller.delete.assert_called_once_with(1)
         assert result.message == "Task deleted successfully"
+
+    @pytest.mark.anyio
+    async def test_returns_count_on_update_tasks(
+        self,
+        mock_task_controller: MagicMock,
+        update_task_request: UpdateTaskRequest,
+    ) -> None:
+        """Test that update_where is called on the task controller...
+
+        when updating the tasks matching filters.
+        """
+        filters = TaskChangeParams(priority=Priority.LOW.value, dry_run=True)
+        mock_task_controller.update_where.return_value = 2
+        result = await update_tasks(
+            filters, update_task_request, mock_task_controller
+        )
+        mock_task_controller.update_where.assert_called_once_with(
+            filters, update_task_request, dry_run=True
+        )
+        assert result.count == 2
+        assert result.dry_run
+
+    @pytest.mark.parametrize("dry_run", [True, False])
+    @pytest.mark.anyio
+    async def test_raise_400_on_update_tasks_without_change(
+        self,
+        mock_task_controller: MagicMock,
+        dry_run: bool,
+    ) -> None:
+        """Test that HTTPException is raised with 400 status code...
+
+        when the body changes no field, also for a dry run.
+        """
+        with pytest.raises(HTTPException) as exc_info:
+            await update_tasks(
+                TaskChangeParams(completed=True, dry_run=dry_run),
+                UpdateTaskRequest(),
+                mock_task_controller,
+            )
+        assert exc_info.value.status_code == 400
+        mock_task_controller.update_where.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_returns_count_on_delete_tasks(
+        self,
+        mock_task_controller: MagicMock,
+    ) -> None:
+        """Test that delete_where is called on the task controller...
+
+        when deleting the tasks matching filters.
+        """
+        filters = TaskChangeParams(completed=True)
+        mock_task_controller.delete_where.return_value = 5
+        result = await delete_tasks(filters, mock_task_controller)
+        mock_task_controller.delete_where.assert_called_once_with(
+            filters, dry_run=False
+        )
+        assert result.count == 5
+        assert not result.dry_run
+
+    @pytest.mark.anyio
+    async def test_raise_400_on_delete_tasks_without_filter(
+        self,
+        mock_task_controller: MagicMock,
+    ) -> None:
+        """Test that HTTPException is raised with 400 status code...
+
+        when no filter selects the tasks.
+        """
+        with pytest.raises(HTTPException) as exc_info:
+            await delete_tasks(
+                TaskChangeParams(dry_run=True), mock_task_controller
+            )
+        assert exc_info.value.status_code == 400
+        mock_task_controller.delete_where.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_stream_on_export_tasks(
+        self,
+        mock_task_controller: MagicMock,
+        mock_task_response: Task,
+    ) -> None:
+        """Test that the exported tasks are streamed in the format."""
+
+        async def export(
+            filters: TaskExportParams, batch_size: int
+        ) -> AsyncIterator[list[Task]]:
+            yield [mock_task_response]
+
+        mock_task_controller.export.side_effect = export
+        params = TaskExportParams(completed=True, format=FileFormat.CSV)
+        response = await export_tasks(
+            params, mock_task_controller, TasksConfig(export_batch_size=10)
+        )
+
+        mock_task_controller.export.assert_called_once_with(params, 10)
+        assert response.media_type == "text/csv"
+        assert response.headers["content-disposition"] == (
+            'attachment; filename="tasks.csv"'
+        )
+        chunks = [chunk async for chunk in response.body_iterator]
+        assert len(chunks) == 2
+
+    @pytest.fixture
+    def import_request(self, mock_create_task_request_dict: dict) -> MagicMock:
+        """Fixture for a request streaming an NDJSON file of 5 lines."""
+        valid = json.dumps(mock_create_task_request_dict).encode()
+        lines = [valid, b"{}", valid, b"[]", valid]
+
+        async def stream() -> AsyncIterator[bytes]:
+            for line in lines:
+                yield line + b"\n"
+
+        return MagicMock(stream=stream)
+
+    @pytest.mark.anyio
+    async def test_create_many_called_per_chunk_on_import_tasks(
+        self,
+        mock_task_controller: MagicMock,
+        import_request: MagicMock,
+    ) -> None:
+        """Test that the valid lines are inserted in chunks...
+
+        and the invalid lines are reported.
+        """
+        mock_task_controller.create_many.side_effect = lambda chunk: list(
+            range(len(chunk))
+        )
+
+        result = await import_tasks(
+            import_request,
+            mock_task_controller,
+            TasksConfig(import_chunk_size=2, import_max_errors=1),
+        )
+
+        chunk_sizes = [
+            len(call.args[0])
+            for call in mock_task_controller.create_many.call_args_list
+        ]
+        assert chunk_sizes == [2, 1]
+        assert result.inserted == 3
+        assert result.rejected == 2
+        assert [error.line for error in result.errors] == [2]
+
+    @pytest.mark.anyio
+    async def test_raise_400_on_import_tasks_with_invalid_utf8(
+        self,
+        mock_task_controller: MagicMock,
+    ) -> None:
+        """Test that HTTPException is raised with 400 status code...
+
+        when the body is not valid UTF-8.
+        """
+
+        async def stream() -> AsyncIterator[bytes]:
+            yield b"\xff\n"
+
+        with pytest.raises(HTTPException) as exc_info:
+            await import_tasks(
+                MagicMock(stream=stream),
+                mock_task_controller,
+                TasksConfig(),
+                format=FileFormat.CSV,
+            )
+        assert exc_info.value.status_code == 400
+
+    @pytest.mark.anyio
+    async def test_raise_400_on_import_tasks_with_invalid_csv(
+        self,
+        mock_task_controller: MagicMock,
+    ) -> None:
+        """Test that HTTPException is raised with 400 status code...
+
+        when a CSV record cannot be parsed.
+        """
+
+        async def stream() -> AsyncIterator[bytes]:
+            yield b"title\n"
+            yield b'"Open\n' + b"x\n" * (MAX_CSV_RECORD_SIZE // 2)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await import_tasks(
+                MagicMock(stream=stream),
+                mock_task_controller,
+                TasksConfig(),
+                format=FileFormat.CSV,
+            )
+        assert exc_info.value.status_code == 400
+        assert "not valid CSV" in exc_info.value.detail
+
+    @pytest.mark.anyio
+    async def test_raise_400_on_import_tasks_with_long_line(
+        self,
+        mock_task_controller: MagicMock,
+    ) -> None:
+        """Test that HTTPException is raised with 400 status code...
+
+        when a line is longer than the limit.
+        """
+
+        async def stream() -> AsyncIterator[bytes]:
+            yield b"x" * (MAX_LINE_SIZE + 1)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await import_tasks(
+                MagicMock(stream=stream), mock_task_controller, TasksConfig()
+            )
+        assert exc_info.value.status_code == 400
+        assert "line 1 is longer" in exc_info.value.detail
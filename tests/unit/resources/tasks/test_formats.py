@@ -0,0 +1,219 @@
+"""Unit tests for the file formats of the tasks API."""
+
+import csv
+from collections.abc import AsyncIterator
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas import CreateTaskRequest, Priority, Task
+from app.web.resources.tasks import formats
+from app.web.resources.tasks.formats import (
+    DecodedLine,
+    LineTooLongError,
+    accepts_columnar,
+    decode_csv,
+    decode_ndjson,
+    encode_csv,
+    encode_ndjson,
+)
+
+
+async def batches_of(*batches: list[Task]) -> AsyncIterator[list[Task]]:
+    """Yield the given batches of tasks."""
+    for batch in batches:
+        yield batch
+
+
+async def chunks_of(*chunks: bytes) -> AsyncIterator[bytes]:
+    """Yield the given chunks of bytes."""
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(lines: AsyncIterator[DecodedLine]) -> list[DecodedLine]:
+    """Collect the decoded lines."""
+    return [line async for line in lines]
+
+
+class TestFormats:
+    """Tests for the encoders of the export formats."""
+
+    @pytest.mark.anyio
+    async def test_encode_ndjson(self, mock_task_response: Task) -> None:
+        """Test that every task is encoded on its own line."""
+        chunks = [
+            chunk
+            async for chunk in encode_ndjson(
+                batches_of([mock_task_response] * 2, [mock_task_response])
+            )
+        ]
+        assert len(chunks) == 2
+        lines = "".join(chunks).splitlines()
+        assert len(lines) == 3
+        assert Task.model_validate_json(lines[0]) == mock_task_response
+
+    @pytest.mark.anyio
+    async def test_encode_csv(self, mock_task_response: Task) -> None:
+        """Test that the tasks are encoded as rows following a header."""
+        task = mock_task_response.model_copy(
+            update={"description": 'Say "hi", then leave', "completed": True}
+        )
+        chunks = [
+            chunk async for chunk in encode_csv(batches_of([task], [], [task]))
+        ]
+        assert chunks[0] == (
+            "id,title,priority,due_date,description,completed\r\n"
+        )
+        assert chunks[1] == (
+            f"{task.id},{task.title},{task.priority.value},"
+            f'{task.due_date.isoformat()},"Say ""hi"", then leave",true\r\n'
+        )
+        assert chunks[2] == ""
+        assert chunks[3] == chunks[1]
+
+    @pytest.mark.anyio
+    async def test_decode_ndjson_across_chunks(self) -> None:
+        """Test that lines and characters split across chunks are joined."""
+        due_date = '"due_date":"2000-01-01T00:00:00"'
+        body = (
+            f'{{"title":"Caf\u00e9","priority":1,{due_date}}}\n'
+            "\n"
+            f'{{"title":"Bad","priority":9,{due_date}}}\n'
+            "not json"
+        ).encode()
+        split = body.index(b"\xa9")
+
+        lines = await collect(
+            decode_ndjson(chunks_of(body[:split], body[split:]))
+        )
+
+        assert [line_number for line_number, _ in lines] == [1, 3, 4]
+        assert lines[0][1] == CreateTaskRequest(
+            title="Caf\u00e9",
+            priority=Priority.HIGH,
+            due_date="2000-01-01T00:00:00",
+        )
+        assert isinstance(lines[1][1], ValidationError)
+        assert isinstance(lines[2][1], ValidationError)
+
+    @pytest.mark.anyio
+    async def test_decode_csv_with_multiline_field(self) -> None:
+        """Test that a quoted field may span several lines."""
+        body = (
+            b"id,title,priority,due_date,description\r\n"
+            b'1,First,2,2000-01-01T00:00:00,"Two\r\nlines, ""quoted"""\r\n'
+            b"\r\n"
+            b"2,Second,x,2000-01-01T00:00:00,\r\n"
+            b"3,Third,3,2000-01-01T00:00:00,\r\n"
+        )
+
+        lines = await collect(decode_csv(chunks_of(body[:50], body[50:])))
+
+        assert [line_number for line_number, _ in lines] == [2, 5, 6]
+        first = lines[0][1]
+        assert isinstance(first, CreateTaskRequest)
+        assert first.priority == Priority.MEDIUM
+        assert first.description == 'Two\r\nlines, "quoted"'
+        assert isinstance(lines[1][1], ValidationError)
+        third = lines[2][1]
+        assert isinstance(third, CreateTaskRequest)
+        assert third.description is None
+
+    @pytest.mark.anyio
+    async def test_decode_csv_with_unterminated_quote(self) -> None:
+        """Test that an unterminated quote runs to the end of the file."""
+        body = b'title,priority,due_date\n"Open,1,2000-01-01T00:00:00\n'
+        lines = await collect(decode_csv(chunks_of(body)))
+        assert len(lines) == 1
+        assert isinstance(lines[0][1], ValidationError)
+
+    @pytest.mark.anyio
+    async def test_raise_on_record_longer_than_limit(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that an unbalanced quote does not buffer the whole body."""
+        monkeypatch.setattr(formats, "MAX_CSV_RECORD_SIZE", 100)
+        header = b"title,priority,due_date\n"
+        valid = b"Task,1,2000-01-01T00:00:00\n"
+        lines = decode_csv(chunks_of(header, valid, b'"Open' + valid * 100))
+
+        assert isinstance((await anext(lines))[1], CreateTaskRequest)
+        with pytest.raises(csv.Error, match="starting on line 3"):
+            await anext(lines)
+
+    @pytest.mark.anyio
+    async def test_raise_on_ndjson_line_longer_than_limit(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a long line is rejected before it is complete."""
+        monkeypatch.setattr(formats, "MAX_LINE_SIZE", 100)
+
+        read = []
+
+        async def chunks() -> AsyncIterator[bytes]:
+            for chunk in (b"{}\n" + b" " * 60, b" " * 60, b" " * 60):
+                read.append(chunk)
+                yield chunk
+
+        lines = decode_ndjson(chunks())
+        assert isinstance((await anext(lines))[1], ValidationError)
+        with pytest.raises(LineTooLongError, match="line 2 is longer"):
+            await anext(lines)
+        assert len(read) == 2
+
+    @pytest.mark.anyio
+    async def test_raise_on_csv_line_longer_than_limit(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a single long CSV line is rejected by the line limit."""
+        monkeypatch.setattr(formats, "MAX_LINE_SIZE", 100)
+        body = b"title,priority,due_date\n" + b"x" * 200 + b"\n"
+        with pytest.raises(LineTooLongError, match="line 2 is longer"):
+            await collect(decode_csv(chunks_of(body[:30], body[30:])))
+
+    @pytest.mark.anyio
+    async def test_decode_lines_split_across_chunks(self) -> None:
+        """Test that the lines are rebuilt from the pieces of the chunks."""
+        body = b'{"title": "A"}\n\n{"title": "B"}\n{"title": "C"}'
+        lines = await collect(
+            decode_ndjson(
+                chunks_of(*(body[i : i + 4] for i in range(0, 48, 4)))
+            )
+        )
+        assert [line_number for line_number, _ in lines] == [1, 3, 4]
+
+    @pytest.mark.anyio
+    async def test_raise_on_invalid_utf8(self) -> None:
+        """Test that a body which is not UTF-8 is rejected."""
+        with pytest.raises(UnicodeDecodeError):
+            await collect(decode_ndjson(chunks_of(b"\xff\n")))
+
+    @pytest.mark.parametrize(
+        ("accept", "expected"),
+        [
+            (None, False),
+            ("application/json", False),
+            ("application/vnd.tasks.columnar+json", True),
+            (
+                "application/json;q=0.5, application/vnd.tasks.columnar+json",
+                True,
+            ),
+            ("application/vnd.tasks.columnar+json; q=1", True),
+            (
+                "application/json, application/vnd.tasks.columnar+json;q=0",
+                False,
+            ),
+            (
+                "application/json, application/vnd.tasks.columnar+json;q=0.5",
+                False,
+            ),
+            ("*/*;q=0.1, application/vnd.tasks.columnar+json;q=0.5", True),
+            ("*/*, application/vnd.tasks.columnar+json;q=invalid", False),
+        ],
+    )
+    def test_accepts_columnar(
+        self, accept: str | None, expected: bool
+    ) -> None:
+        """Test that the columnar format is negotiated by media type."""
+        assert accepts_columnar(accept) is expected
@@ -0,0 +1,47 @@
+"""Test cases for the cursor codec."""
+
+import base64
+
+import pytest
+
+from app.web.resources.cursor import CursorCodec, InvalidCursorError
+
+
+class TestCursorCodec:
+    """Test cases for CursorCodec class."""
+
+    @pytest.fixture
+    def codec(self) -> CursorCodec:
+        """Fixture for a cursor codec."""
+        return CursorCodec("secret")
+
+    def test_round_trip(self, codec: CursorCodec) -> None:
+        """Test that a cursor decodes to the key it was encoded from."""
+        cursor = codec.encode([42, "2000-01-01T00:00:00"])
+        assert "=" not in cursor
+        assert codec.decode(cursor) == [42, "2000-01-01T00:00:00"]
+
+    def test_raise_on_cursor_signed_with_other_secret(
+        self, codec: CursorCodec
+    ) -> None:
+        """Test that a cursor from another secret is rejected."""
+        cursor = CursorCodec("other").encode([42])
+        with pytest.raises(InvalidCursorError):
+            codec.decode(cursor)
+
+    @pytest.mark.parametrize("cursor", ["not base64!", "WzFd", "x"])
+    def test_raise_on_malformed_cursor(
+        self, codec: CursorCodec, cursor: str
+    ) -> None:
+        """Test that a malformed cursor is rejected."""
+        with pytest.raises(InvalidCursorError):
+            codec.decode(cursor)
+
+    def test_raise_on_key_which_is_not_a_list(
+        self, codec: CursorCodec
+    ) -> None:
+        """Test that a signed payload must hold a list."""
+        payload = b"42"
+        token = base64.urlsafe_b64encode(payload + codec._sign(payload))
+        with pytest.raises(InvalidCursorError):
+            codec.decode(token.decode())
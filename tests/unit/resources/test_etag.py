@@ -0,0 +1,35 @@
+"""Unit tests for the entity tags."""
+
+import pytest
+
+from app.web.resources.etag import encoded_etag, etag_matches
+
+
+class TestEtag:
+    """Tests for the entity tag functions."""
+
+    @pytest.mark.parametrize(
+        ("etag", "expected"),
+        [('"1.2"', '"1.2-gzip"'), ('W/"1.2"', 'W/"1.2"')],
+    )
+    def test_encoded_etag(self, etag: str, expected: str) -> None:
+        """Test that only the strong tags are told apart by coding."""
+        assert encoded_etag(etag, "gzip") == expected
+
+    @pytest.mark.parametrize(
+        ("if_none_match", "expected"),
+        [
+            (None, False),
+            ("*", True),
+            ('"1.2"', True),
+            ('W/"1.2"', True),
+            ('"1.1", "1.2-gzip"', True),
+            ('W/"1.2-gzip"', True),
+            ('"1.3-gzip"', False),
+        ],
+    )
+    def test_etag_matches(
+        self, if_none_match: str | None, expected: bool
+    ) -> None:
+        """Test that the tags match whatever their weakness and coding."""
+        assert etag_matches(if_none_match, '"1.2"') is expected
@@ -36,3 +36,24 @@ class TestPaginationBuilder:
             == "http://example.com/tasks/?page_size=10&page_number=2"
         )
         assert pagination.previous_page_url is None
+
+    def test_create_pagination_from_cursor(self) -> None:
+        """Test creating keyset pagination metadata."""
+        pagination = PaginationBuilder.create_from_cursor(
+            10, "abc", "http://example.com/tasks/?cursor="
+        )
+        assert pagination.count is None
+        assert pagination.total_pages is None
+        assert pagination.next_cursor == "abc"
+        assert (
+            pagination.next_page_url
+            == "http://example.com/tasks/?cursor=abc&page_size=10"
+        )
+
+    def test_create_pagination_from_cursor_on_last_page(self) -> None:
+        """Test that the last keyset page has no next page."""
+        pagination = PaginationBuilder.create_from_cursor(
+            10, None, "http://example.com/tasks/?cursor="
+        )
+        assert pagination.next_page_url is None
+        assert pagination.next_cursor is None
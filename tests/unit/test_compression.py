@@ -0,0 +1,204 @@
+"""Unit tests for the compression of the responses."""
+
+import asyncio
+import gzip
+import zlib
+from unittest.mock import AsyncMock
+
+import pytest
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.web.compression import GZipMiddleware, accepts_gzip
+from app.web.config import CompressionConfig
+
+
+def respond(
+    *bodies: bytes, headers: list[tuple[bytes, bytes]] | None = None
+) -> ASGIApp:
+    """Build an application sending the bodies as one response."""
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": list(
+                    headers or [(b"content-type", b"application/json")]
+                ),
+            }
+        )
+        for index, body in enumerate(bodies):
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": body,
+                    "more_body": index < len(bodies) - 1,
+                }
+            )
+
+    return app
+
+
+def call(
+    app: ASGIApp,
+    accept_encoding: bytes | None = b"gzip",
+    config: CompressionConfig | None = None,
+    scope_type: str = "http",
+) -> list[Message]:
+    """Call the application through the middleware, return the messages."""
+    messages: list[Message] = []
+    headers = (
+        []
+        if accept_encoding is None
+        else [(b"accept-encoding", accept_encoding)]
+    )
+    scope = {"type": scope_type, "headers": headers}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    middleware = GZipMiddleware(
+        app,
+        config or CompressionConfig(minimum_size=10),
+    )
+    asyncio.run(middleware(scope, AsyncMock(), send))
+    return messages
+
+
+def response_headers(messages: list[Message]) -> dict[bytes, bytes]:
+    """Return the headers of the response start message."""
+    return dict(messages[0]["headers"])
+
+
+class TestAcceptsGzip:
+    """Tests for the accepts_gzip function."""
+
+    @pytest.mark.parametrize(
+        ("accept_encoding", "expected"),
+        [
+            (None, False),
+            ("", False),
+            ("gzip", True),
+            ("deflate, GZIP;q=0.5", True),
+            ("br, deflate", False),
+            ("*", True),
+            ("gzip;q=0", False),
+            ("gzip;q=0, *", False),
+            ("identity, *;q=0", False),
+            ("gzip;q=invalid", False),
+        ],
+    )
+    def test_accepts_gzip(
+        self, accept_encoding: str | None, expected: bool
+    ) -> None:
+        """Test that the qualities of the codings are honoured."""
+        assert accepts_gzip(accept_encoding) is expected
+
+
+class TestGZipMiddleware:
+    """Tests for the GZipMiddleware class."""
+
+    def test_compress_response(self) -> None:
+        """Test that a response larger than the minimum is compressed."""
+        body = b'{"title": "Task"}' * 10
+        messages = call(respond(body))
+        headers = response_headers(messages)
+        assert headers[b"content-encoding"] == b"gzip"
+        assert headers[b"vary"] == b"Accept-Encoding"
+        assert (
+            headers[b"content-length"]
+            == str(len(messages[1]["body"])).encode()
+        )
+        assert gzip.decompress(messages[1]["body"]) == body
+
+    @pytest.mark.parametrize(
+        ("etag", "expected"),
+        [(b'"1.2"', b'"1.2-gzip"'), (b'W/"1.2"', b'W/"1.2"')],
+    )
+    def test_tell_compressed_entity_tag_apart(
+        self, etag: bytes, expected: bytes
+    ) -> None:
+        """Test that a strong entity tag is suffixed with the coding."""
+        headers = [(b"content-type", b"application/json"), (b"etag", etag)]
+        messages = call(respond(b"x" * 100, headers=headers))
+        assert response_headers(messages)[b"etag"] == expected
+
+    def test_keep_single_vary_on_accept_encoding(self) -> None:
+        """Test that Accept-Encoding is not listed twice in Vary."""
+        headers = [(b"vary", b"Accept-Encoding")]
+        messages = call(respond(b"x" * 100, headers=headers))
+        assert response_headers(messages)[b"vary"] == b"Accept-Encoding"
+
+    def test_compress_streamed_response_incrementally(self) -> None:
+        """Test that every streamed chunk is decompressible on arrival."""
+        chunks = [b'{"id": 1}\n', b'{"id": 2}\n', b'{"id": 3}\n']
+        messages = call(respond(*chunks))
+        assert b"content-length" not in response_headers(messages)
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        received = [
+            decompressor.decompress(message["body"])
+            for message in messages[1:]
+        ]
+        assert received == chunks
+        assert decompressor.eof
+        assert [message["more_body"] for message in messages[1:]] == [
+            True,
+            True,
+            False,
+        ]
+
+    def test_keep_small_response(self) -> None:
+        """Test that a response smaller than the minimum is not compressed."""
+        messages = call(respond(b"{}"))
+        assert b"content-encoding" not in response_headers(messages)
+        assert messages[1]["body"] == b"{}"
+
+    @pytest.mark.parametrize(
+        "headers",
+        [
+            [(b"content-type", b"text/event-stream")],
+            [(b"content-type", b"image/png")],
+            [(b"content-encoding", b"br")],
+        ],
+    )
+    def test_keep_excluded_response(
+        self, headers: list[tuple[bytes, bytes]]
+    ) -> None:
+        """Test that excluded or already encoded responses are kept."""
+        messages = call(respond(b"x" * 100, headers=headers))
+        assert response_headers(messages) == dict(headers)
+        assert messages[1]["body"] == b"x" * 100
+
+    @pytest.mark.parametrize("accept_encoding", [None, b"gzip;q=0"])
+    def test_keep_response_when_gzip_not_accepted(
+        self, accept_encoding: bytes | None
+    ) -> None:
+        """Test that clients not accepting gzip get the plain response."""
+        messages = call(respond(b"x" * 100), accept_encoding)
+        assert b"content-encoding" not in response_headers(messages)
+        assert messages[1]["body"] == b"x" * 100
+
+    def test_compress_with_configured_level(self) -> None:
+        """Test that the configured level is used."""
+        body = b"x" * 1000
+        stored = call(respond(body), config=CompressionConfig(level=0))
+        best = call(respond(body), config=CompressionConfig(level=9))
+        assert len(stored[1]["body"]) > len(body) > len(best[1]["body"])
+
+    def test_send_start_before_other_messages(self) -> None:
+        """Test that the held start is sent before a non body message."""
+
+        async def app(scope: Scope, receive: Receive, send: Send) -> None:
+            await send({"type": "http.response.start", "headers": []})
+            await send({"type": "http.response.pathsend", "path": "/"})
+
+        messages = call(app)
+        assert [message["type"] for message in messages] == [
+            "http.response.start",
+            "http.response.pathsend",
+        ]
+
+    def test_pass_through_other_scopes(self) -> None:
+        """Test that non HTTP scopes are passed to the application."""
+        messages = call(respond(b"x" * 100), scope_type="websocket")
+        assert messages[1]["body"] == b"x" * 100
@@ -0,0 +1,46 @@
+"""Unit tests for the dependencies."""
+
+from unittest.mock import MagicMock, patch
+
+from app.dependencies import (
+    get_compression_config,
+    get_task_controller,
+    get_task_repository,
+    get_tasks_config,
+    get_web_config,
+)
+from app.web.config import WebConfig
+
+
+class TestDependencies:
+    """Tests for the dependency functions."""
+
+    def test_get_web_config(self) -> None:
+        """Test that the web config is loaded."""
+        config = WebConfig()
+        with patch.object(WebConfig, "load", return_value=config):
+            assert get_web_config() is config
+
+    def test_get_task_repository_from_app_state(self) -> None:
+        """Test that the shared task repository is returned."""
+        request = MagicMock()
+        actual = get_task_repository(request)
+        assert actual is request.app.state.task_repository
+
+    def test_get_task_controller_from_app_state(self) -> None:
+        """Test that the shared task controller is returned."""
+        request = MagicMock()
+        actual = get_task_controller(request)
+        assert actual is request.app.state.task_controller
+
+    def test_get_tasks_config_from_app_config(self) -> None:
+        """Test that the tasks config of the application is returned."""
+        request = MagicMock()
+        actual = get_tasks_config(request)
+        assert actual is request.app.state.config.tasks
+
+    def test_get_compression_config_from_app_config(self) -> None:
+        """Test that the compression config of the application is returned."""
+        request = MagicMock()
+        actual = get_compression_config(request)
+        assert actual is request.app.state.config.compression
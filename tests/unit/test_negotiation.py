@@ -0,0 +1,25 @@
+"""Unit tests for the content negotiation."""
+
+import pytest
+
+from app.web.negotiation import header_qualities
+
+
+class TestHeaderQualities:
+    """Tests for the header_qualities function."""
+
+    @pytest.mark.parametrize(
+        ("header", "expected"),
+        [
+            ("gzip", {"gzip": 1.0}),
+            ("GZIP;q=0.5, br", {"gzip": 0.5, "br": 1.0}),
+            ("text/html;level=1;q=0.2", {"text/html": 0.2}),
+            ("*/* ; Q=0", {"*/*": 0.0}),
+            ("gzip;q=high", {"gzip": 0.0}),
+        ],
+    )
+    def test_header_qualities(
+        self, header: str, expected: dict[str, float]
+    ) -> None:
+        """Test that every item is weighed by its quality."""
+        assert header_qualities(header) == expected
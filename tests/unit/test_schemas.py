@@ -2,7 +2,13 @@
 
 import pytest
 
-from app.schemas import Priority, TaskQueryParams, UpdateTaskRequest
+from app.schemas import (
+    Priority,
+    SortField,
+    TaskFieldsParams,
+    TaskQueryParams,
+    UpdateTaskRequest,
+)
 
 
 class TestTaskQueryParams:
@@ -18,6 +24,71 @@ class TestTaskQueryParams:
         with pytest.raises(ValueError, match="Priority must be an integer."):
             TaskQueryParams(priority="high")
 
+    def test_priority_none_is_kept(self) -> None:
+        """Test that an unset priority stays None."""
+        assert TaskQueryParams(priority=None).priority is None
+
+    def test_raise_value_error_on_cursor_with_relevance(self) -> None:
+        """Test that the relevance ordering cannot be paged by cursor."""
+        with pytest.raises(ValueError, match="not supported with a cursor"):
+            TaskQueryParams(cursor="", order_by_relevance=True)
+
+    def test_sort_normalised_into_keys(self) -> None:
+        """Test that the sort fields are parsed with their direction."""
+        params = TaskQueryParams(sort=" due_date , -priority")
+        assert params.sort == "due_date,-priority"
+        assert params.sort_keys() == [
+            (SortField.DUE_DATE, False),
+            (SortField.PRIORITY, True),
+        ]
+        assert TaskQueryParams(sort="").sort is None
+        assert TaskQueryParams().sort_keys() == []
+
+    @pytest.mark.parametrize(
+        ("sort", "message"),
+        [
+            ("rowid", "Cannot sort by 'rowid'"),
+            ("priority,-priority", "same field twice"),
+        ],
+    )
+    def test_raise_value_error_on_invalid_sort(
+        self, sort: str, message: str
+    ) -> None:
+        """Test that only the whitelisted fields can be sorted by."""
+        with pytest.raises(ValueError, match=message):
+            TaskQueryParams(sort=sort)
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"sort": "title", "cursor": ""},
+            {"sort": "title", "order_by_relevance": True},
+        ],
+    )
+    def test_raise_value_error_on_sort_with_other_ordering(
+        self, params: dict
+    ) -> None:
+        """Test that the sort cannot be combined with another ordering."""
+        with pytest.raises(ValueError, match="sort"):
+            TaskQueryParams.model_validate(params)
+
+
+class TestTaskFieldsParams:
+    """Test suite for TaskFieldsParams schema."""
+
+    def test_fields_normalised_in_task_order_with_id(self) -> None:
+        """Test that the fields are ordered like the task and keep the id."""
+        params = TaskFieldsParams(fields=" due_date,title ,due_date")
+        assert params.fields == "id,title,due_date"
+        assert params.field_names() == ("id", "title", "due_date")
+        assert TaskFieldsParams(fields="").fields is None
+        assert TaskFieldsParams().field_names() is None
+
+    def test_raise_value_error_on_unknown_field(self) -> None:
+        """Test that only the fields of the task can be selected."""
+        with pytest.raises(ValueError, match="Unknown task fields: rowid"):
+            TaskFieldsParams(fields="title,rowid")
+
 
 class TestUpdateTaskRequest:
     """Tests for the UpdateTaskRequest schema."""